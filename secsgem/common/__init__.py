@@ -17,4 +17,5 @@
 
 from .callbacks import *  # noqa
 from .events import *  # noqa
+from .executor import *  # noqa
 from .helpers import *  # noqa
\ No newline at end of file
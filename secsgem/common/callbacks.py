@@ -28,11 +28,15 @@ class CallbackCallWrapper(object):
 class CallbackHandler(object):
     def __init__(self):
         self._callbacks = {}
+        # incremented on every change, used to invalidate resolved callbacks
+        self._version = 0
         self.target = None
         self._object_intitialized = True
 
     def __setattr__(self, name, value):
         if '_object_intitialized' not in self.__dict__ or name in self.__dict__:
+            if name == "target":
+                self._version += 1
             return dict.__setattr__(self, name, value)
         else:
             if value is None:
@@ -41,6 +45,8 @@ class CallbackHandler(object):
             else:
                 self._callbacks[name] = value
 
+            self._version += 1
+
     def __getattr__(self, name):
         return CallbackCallWrapper(self, name)
 
@@ -74,6 +80,23 @@ class CallbackHandler(object):
 
         return False
 
+    def _resolve(self, callback):
+        """Get the function that handles a callback
+
+        :param callback: name of the callback
+        :type callback: string
+        :returns: registered callback, delegate handler of the target or None
+        :rtype: callable
+        """
+        if callback in self._callbacks:
+            return self._callbacks[callback]
+
+        delegate_handler = getattr(self.target, "_on_" + callback, None)
+        if callable(delegate_handler):
+            return delegate_handler
+
+        return None
+
     def _call(self, callback, *args, **kwargs):
         if callback in self._callbacks:
             return self._callbacks[callback](*args, **kwargs)
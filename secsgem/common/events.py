@@ -15,6 +15,11 @@
 #####################################################################
 """Contains helper functions"""
 
+import functools
+import logging
+import queue
+import threading
+
 from future.utils import implements_iterator
 
 class Event(object):
@@ -53,15 +58,19 @@ class Targets(object):
     def __init__(self):
         """Initialize the target class"""
         self._targets = []
+        # incremented on every change, used to invalidate resolved handlers
+        self._version = 0
 
     def __iadd__(self, other):
         """Add a targets"""
         self._targets.append(other)
+        self._version += 1
         return self
 
     def __isub__(self, other):
         """Remove a target"""
         self._targets.remove(other)
+        self._version += 1
         return self
 
     @implements_iterator
@@ -94,6 +103,19 @@ class EventProducer(object):
         """Initialize the event producer class"""
         self._targets = Targets()
         self._events = {}
+
+        # handlers of the targets resolved per event, cleared when the targets change
+        self._target_handlers = {}
+        self._target_handlers_version = None
+
+        # queue and thread for asynchronous delivery, the lock keeps events from being queued after the stop
+        self._queue = None
+        self._queue_lock = threading.Lock()
+        self._queue_block = True
+        self._delivery_thread = None
+        self._dropped = 0
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
     
     def __getattr__(self, name):
         """Get an event as member of the EventProducer object"""
@@ -115,27 +137,127 @@ class EventProducer(object):
             self._targets += target
         return self
     
+    def _get_target_handlers(self, event):
+        """Get the handlers of the targets for an event
+
+        :param event: name of the event
+        :type event: string
+        :returns: handlers to be called with the event data
+        :rtype: list of callables
+        """
+        version = self._targets._version  # noqa
+        if self._target_handlers_version != version:
+            self._target_handlers = {}
+            self._target_handlers_version = version
+
+        handlers = self._target_handlers.get(event)
+        if handlers is None:
+            handlers = []
+            for target in self._targets:
+                generic_handler = getattr(target, "_on_event", None)
+                if callable(generic_handler):
+                    handlers.append(functools.partial(generic_handler, event))
+
+                specific_handler = getattr(target, "_on_event_" + event, None)
+                if callable(specific_handler):
+                    handlers.append(specific_handler)
+
+            self._target_handlers[event] = handlers
+
+        return handlers
+
     def fire(self, event, data):
         """Fire a event
 
-        calls all the available handlers for a specific event
+        calls all the available handlers for a specific event.
+        If asynchronous delivery is started, the event is queued and the handlers are called from the delivery thread.
+        Otherwise, also while the delivery is stopped, the handlers are called directly.
 
         :param event: name of the event
         :type event: string
         :param data: data connected to this event
         :type data: dict
         """
-        for target in self._targets:
-            generic_handler = getattr(target, "_on_event", None)
-            if callable(generic_handler):
-                generic_handler(event, data)
+        with self._queue_lock:
+            delivery_queue = self._queue
+            if delivery_queue is not None:
+                try:
+                    delivery_queue.put((event, data), self._queue_block)
+                except queue.Full:
+                    self._dropped += 1
+
+        if delivery_queue is None:
+            self._deliver(event, data)
 
-            specific_handler = getattr(target, "_on_event_" + event, None)
-            if callable(specific_handler):
-                specific_handler(data)
+    def _deliver(self, event, data):
+        """Call all the available handlers for a specific event
+
+        :param event: name of the event
+        :type event: string
+        :param data: data connected to this event
+        :type data: dict
+        """
+        for handler in self._get_target_handlers(event):
+            handler(data)
 
         if event in self._events:
             self._events[event](data)
+
+    def start_async_delivery(self, max_queue_size=10000, block=True):
+        """Deliver events from a separate thread through a bounded queue
+
+        :param max_queue_size: maximum number of queued events
+        :type max_queue_size: integer
+        :param block: wait for free space if the queue is full (True) or drop the event (False)
+        :type block: boolean
+        """
+        with self._queue_lock:
+            if self._queue is not None:
+                return
+
+            self._queue = queue.Queue(max_queue_size)
+            self._queue_block = block
+
+        self._delivery_thread = threading.Thread(target=self._delivery_loop, args=(self._queue, ), name="secsgem_eventProducer_delivery")
+        self._delivery_thread.daemon = True  # kill thread automatically on main program termination
+        self._delivery_thread.start()
+
+    def stop_async_delivery(self, wait=True):
+        """Stop asynchronous delivery, queued events are still delivered
+
+        :param wait: wait until the queued events are delivered
+        :type wait: boolean
+        """
+        with self._queue_lock:
+            delivery_queue = self._queue
+            if delivery_queue is None:
+                return
+
+            # events fired from now on are delivered directly, so the stop is the last queued item
+            self._queue = None
+
+        delivery_queue.put(None)
+
+        if wait:
+            self._delivery_thread.join()
+
+        self._delivery_thread = None
+
+    @property
+    def dropped_events(self):
+        """Number of events dropped because the delivery queue was full"""
+        return self._dropped
+
+    def _delivery_loop(self, delivery_queue):
+        while True:
+            item = delivery_queue.get()
+            if item is None:
+                return
+
+            try:
+                self._deliver(*item)
+            except Exception:
+                self._logger.exception("ignoring exception in event handler")
     
     def __repr__(self):
         """Generate representation for an object"""
@@ -0,0 +1,567 @@
+#####################################################################
+# executor.py
+#
+# (c) Copyright 2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Contains worker pool for executing callbacks"""
+
+import collections
+import logging
+import threading
+
+EXECUTOR_POLICY_BLOCK = "block"
+EXECUTOR_POLICY_REJECT = "reject"
+EXECUTOR_POLICY_CALLER_RUNS = "caller_runs"
+
+
+class OrderedWorkerPool(object):
+    """Fixed size worker pool, tasks submitted to the same lane are executed one after another in submission order
+
+    Tasks of different lanes run concurrently on the worker threads.
+    If *max_queue_depth* tasks are pending, new tasks are handled by the *policy*:
+
+    - EXECUTOR_POLICY_BLOCK: wait until a task finished
+    - EXECUTOR_POLICY_REJECT: don't queue the task and return False
+    - EXECUTOR_POLICY_CALLER_RUNS: execute the task in the calling thread
+
+    Callers that must not be delayed, like the thread receiving the messages of a connection, use :func:`offer_ordered`,
+    which rejects tasks for a full queue independent of the policy.
+    Blocking the receiving thread would also hold back the replies a running callback is waiting for.
+
+    :param workers: number of worker threads
+    :type workers: integer
+    :param max_queue_depth: maximum number of pending tasks, None for unlimited
+    :type max_queue_depth: integer
+    :param policy: handling of tasks submitted to a full queue
+    :type policy: string
+    :param name: prefix for the worker thread names
+    :type name: string
+
+    **Example**::
+
+        pool = secsgem.OrderedWorkerPool(8, 5000)
+
+        handler = secsgem.GemHostHandler("10.211.55.33", 5000, False, 0, "test")
+        handler.callback_executor = pool
+    """
+
+    def __init__(self, workers=4, max_queue_depth=1000, policy=EXECUTOR_POLICY_BLOCK, name="secsgem_workerPool"):
+        if policy not in [EXECUTOR_POLICY_BLOCK, EXECUTOR_POLICY_REJECT, EXECUTOR_POLICY_CALLER_RUNS]:
+            raise ValueError("Unknown executor policy {}".format(policy))
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self.policy = policy
+        self.name = name
+
+        self.rejected = 0
+
+        self._condition = threading.Condition()
+        self._lanes = {}
+        self._ready = collections.deque()
+        self._pending = 0
+        self._running = True
+        self._threads = []
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'workers': self.workers, 'queue_depth': self._pending, 'rejected': self.rejected})
+
+    @property
+    def queue_depth(self):
+        """Number of pending tasks, including the running ones
+
+        :returns: pending task count
+        :rtype: integer
+        """
+        return self._pending
+
+    def _start_workers(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name="{}_{}".format(self.name, index))
+            thread.daemon = True  # kill thread automatically on main program termination
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, function, *args, **kwargs):
+        """Execute a function without ordering constraints
+
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued or executed
+        :rtype: boolean
+        """
+        return self.submit_ordered(object(), function, *args, **kwargs)
+
+    def submit_ordered(self, lane, function, *args, **kwargs):
+        """Execute a function after all previously submitted functions of the lane
+
+        :param lane: hashable key of the lane
+        :type lane: various
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued or executed
+        :rtype: boolean
+        """
+        return self._submit(lane, self.policy, function, args, kwargs)
+
+    def offer_ordered(self, lane, function, *args, **kwargs):
+        """Queue a function after all previously submitted functions of the lane, never waits or runs it in the caller
+
+        :param lane: hashable key of the lane
+        :type lane: various
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued, False if the queue is full
+        :rtype: boolean
+        """
+        return self._submit(lane, EXECUTOR_POLICY_REJECT, function, args, kwargs)
+
+    def _submit(self, lane, policy, function, args, kwargs):
+        with self._condition:
+            if not self._running:
+                return False
+
+            if not self._threads:
+                self._start_workers()
+
+            while self.max_queue_depth is not None and self._pending >= self.max_queue_depth:
+                if policy == EXECUTOR_POLICY_REJECT:
+                    self.rejected += 1
+                    return False
+                if policy == EXECUTOR_POLICY_CALLER_RUNS:
+                    break
+
+                self._condition.wait()
+            else:
+                tasks = self._lanes.get(lane)
+                if tasks is None:
+                    tasks = collections.deque()
+                    self._lanes[lane] = tasks
+                    self._ready.append(lane)
+
+                tasks.append((function, args, kwargs))
+                self._pending += 1
+
+                self._condition.notify_all()
+                return True
+
+        self._run(function, args, kwargs)
+        return True
+
+    def _run(self, function, args, kwargs):
+        try:
+            function(*args, **kwargs)
+        except Exception:
+            self.logger.exception("ignoring exception in worker pool task")
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._running and not self._ready:
+                    self._condition.wait()
+
+                if not self._ready:
+                    return
+
+                lane = self._ready.popleft()
+                function, args, kwargs = self._lanes[lane][0]
+
+            self._run(function, args, kwargs)
+
+            with self._condition:
+                tasks = self._lanes[lane]
+                tasks.popleft()
+                self._pending -= 1
+
+                if tasks:
+                    self._ready.append(lane)
+                else:
+                    del self._lanes[lane]
+
+                self._condition.notify_all()
+
+    def shutdown(self, wait=True):
+        """Stop accepting tasks and terminate the workers after the pending tasks are done
+
+        :param wait: wait for the workers to terminate
+        :type wait: boolean
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+#: default priorities per (stream, function), function None matches the whole stream
+DEFAULT_STREAM_FUNCTION_PRIORITIES = {
+    (1, 1): PRIORITY_HIGH,
+    (1, 2): PRIORITY_HIGH,
+    (2, 41): PRIORITY_HIGH,
+    (2, 42): PRIORITY_HIGH,
+    (5, 1): PRIORITY_HIGH,
+    (5, 2): PRIORITY_HIGH,
+    (6, 1): PRIORITY_LOW,
+    (6, 11): PRIORITY_LOW,
+    (6, 12): PRIORITY_LOW,
+    (12, None): PRIORITY_LOW,
+}
+
+
+class _PriorityTask(object):
+    def __init__(self, function, args, kwargs, lane=None):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = lane
+        self.done = None
+        self.result = None
+
+
+class PriorityWorkerPool(object):
+    """Fixed size worker pool, executing tasks with higher priority (lower number) first
+
+    The priority of a message is looked up by (stream, function), then by (stream, None), else *default_priority* is used.
+    To avoid starvation, a waiting lower priority task is executed after it was passed over *starvation_limit* times.
+    Tasks queued with the same lane by :func:`offer_prioritized_ordered` are executed one after another in submission order
+    within their priority, tasks of different priorities are never ordered against each other.
+    Each priority has its own queue with a maximum depth of *max_queue_depth*, full queues are handled by the *policy*
+    (see :class:`secsgem.common.executor.OrderedWorkerPool`), except for tasks queued with :func:`offer_prioritized`.
+
+    :param workers: number of worker threads
+    :type workers: integer
+    :param priorities: priorities by (stream, function)
+    :type priorities: dict
+    :param default_priority: priority for messages not found in priorities
+    :type default_priority: integer
+    :param max_queue_depth: maximum number of pending tasks per priority, None for unlimited
+    :type max_queue_depth: integer
+    :param policy: handling of tasks submitted to a full queue
+    :type policy: string
+    :param starvation_limit: number of times a lower priority task can be passed over
+    :type starvation_limit: integer
+    :param name: prefix for the worker thread names
+    :type name: string
+
+    **Example**::
+
+        pool = secsgem.PriorityWorkerPool(8, priorities={(5, 1): secsgem.PRIORITY_HIGH, (6, 11): secsgem.PRIORITY_LOW})
+
+        handler = secsgem.GemHostHandler("10.211.55.33", 5000, False, 0, "test")
+        handler.callback_executor = pool
+    """
+
+    def __init__(self, workers=4, priorities=None, default_priority=PRIORITY_NORMAL, max_queue_depth=1000, policy=EXECUTOR_POLICY_BLOCK,
+                 starvation_limit=10, name="secsgem_priorityWorkerPool"):
+        if policy not in [EXECUTOR_POLICY_BLOCK, EXECUTOR_POLICY_REJECT, EXECUTOR_POLICY_CALLER_RUNS]:
+            raise ValueError("Unknown executor policy {}".format(policy))
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.workers = workers
+        self.priorities = dict(DEFAULT_STREAM_FUNCTION_PRIORITIES if priorities is None else priorities)
+        self.default_priority = default_priority
+        self.max_queue_depth = max_queue_depth
+        self.policy = policy
+        self.starvation_limit = starvation_limit
+        self.name = name
+
+        self._condition = threading.Condition()
+        # marks the worker threads of this pool
+        self._local = threading.local()
+        self._queues = {}
+        # (priority, lane) of the ordered tasks being executed
+        self._busy_lanes = set()
+        self._skipped = {}
+        self._peak_depths = {}
+        self._rejected = {}
+        self._running = True
+        self._threads = []
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'workers': self.workers, 'queue_depths': self.queue_depths, 'rejected': self.rejected})
+
+    def get_priority(self, stream, function):
+        """Get the priority for a stream and function
+
+        :param stream: stream of the message
+        :type stream: integer
+        :param function: function of the message
+        :type function: integer
+        :returns: priority of the message
+        :rtype: integer
+        """
+        priority = self.priorities.get((stream, function))
+        if priority is None:
+            priority = self.priorities.get((stream, None), self.default_priority)
+
+        return priority
+
+    @property
+    def queue_depths(self):
+        """Number of queued tasks per priority
+
+        :returns: queued tasks by priority
+        :rtype: dict
+        """
+        with self._condition:
+            return dict((priority, len(tasks)) for priority, tasks in self._queues.items())
+
+    @property
+    def peak_queue_depths(self):
+        """Highest number of queued tasks per priority
+
+        :returns: peak queued tasks by priority
+        :rtype: dict
+        """
+        with self._condition:
+            return dict(self._peak_depths)
+
+    @property
+    def rejected(self):
+        """Number of rejected tasks per priority
+
+        :returns: rejected tasks by priority
+        :rtype: dict
+        """
+        with self._condition:
+            return dict(self._rejected)
+
+    def _start_workers(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name="{}_{}".format(self.name, index))
+            thread.daemon = True  # kill thread automatically on main program termination
+            thread.start()
+            self._threads.append(thread)
+
+    def _enqueue(self, priority, task, policy=None):
+        """Queue a task, returns None if the task was rejected, False if it has to run in the caller"""
+        if policy is None:
+            policy = self.policy
+
+        with self._condition:
+            if not self._running:
+                return None
+
+            if not self._threads:
+                self._start_workers()
+
+            if priority not in self._queues:
+                self._queues[priority] = collections.deque()
+                self._skipped[priority] = 0
+                self._peak_depths[priority] = 0
+                self._rejected[priority] = 0
+
+            tasks = self._queues[priority]
+
+            while self.max_queue_depth is not None and len(tasks) >= self.max_queue_depth:
+                if policy == EXECUTOR_POLICY_REJECT:
+                    self._rejected[priority] += 1
+                    return None
+                if policy == EXECUTOR_POLICY_CALLER_RUNS:
+                    return False
+
+                self._condition.wait()
+
+            tasks.append(task)
+            self._peak_depths[priority] = max(self._peak_depths[priority], len(tasks))
+
+            self._condition.notify_all()
+            return True
+
+    def submit_prioritized(self, priority, function, *args, **kwargs):
+        """Queue a function with a priority
+
+        :param priority: priority of the task, lower numbers are executed first
+        :type priority: integer
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued or executed
+        :rtype: boolean
+        """
+        task = _PriorityTask(function, args, kwargs)
+
+        queued = self._enqueue(priority, task)
+        if queued is None:
+            return False
+
+        if not queued:
+            self._run(task)
+
+        return True
+
+    def offer_prioritized(self, priority, function, *args, **kwargs):
+        """Queue a function with a priority, never waits or runs it in the caller
+
+        :param priority: priority of the task, lower numbers are executed first
+        :type priority: integer
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued, False if the queue is full
+        :rtype: boolean
+        """
+        return self._enqueue(priority, _PriorityTask(function, args, kwargs), EXECUTOR_POLICY_REJECT) is not None
+
+    def offer_prioritized_ordered(self, priority, lane, function, *args, **kwargs):
+        """Queue a function with a priority after all previously queued functions of the lane with the same priority
+
+        Never waits or runs the function in the caller.
+
+        :param priority: priority of the task, lower numbers are executed first
+        :type priority: integer
+        :param lane: hashable key of the lane
+        :type lane: various
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued, False if the queue is full
+        :rtype: boolean
+        """
+        task = _PriorityTask(function, args, kwargs, (priority, lane))
+
+        return self._enqueue(priority, task, EXECUTOR_POLICY_REJECT) is not None
+
+    def submit(self, function, *args, **kwargs):
+        """Queue a function with the default priority
+
+        :param function: function to call
+        :type function: callable
+        :returns: True if the function was queued or executed
+        :rtype: boolean
+        """
+        return self.submit_prioritized(self.default_priority, function, *args, **kwargs)
+
+    def call_prioritized(self, priority, function, *args, **kwargs):
+        """Queue a function with a priority and wait for its result
+
+        Called on a worker thread of this pool, the function is executed immediately.
+        Waiting for another worker could deadlock, e.g. if the same pool executes the callbacks and sends the replies.
+
+        :param priority: priority of the task, lower numbers are executed first
+        :type priority: integer
+        :param function: function to call
+        :type function: callable
+        :returns: result of the function, None if the function was rejected
+        :rtype: various
+        """
+        task = _PriorityTask(function, args, kwargs)
+        task.done = threading.Event()
+
+        if getattr(self._local, "worker", False):
+            self._run(task)
+            return task.result
+
+        queued = self._enqueue(priority, task)
+        if queued is None:
+            return None
+
+        if not queued:
+            self._run(task)
+        else:
+            task.done.wait()
+
+        return task.result
+
+    def _run(self, task):
+        try:
+            task.result = task.function(*task.args, **task.kwargs)
+        except Exception:
+            self.logger.exception("ignoring exception in worker pool task")
+        finally:
+            if task.done is not None:
+                task.done.set()
+
+    def _first_runnable(self, tasks):
+        """Get the index of the first task not waiting for a task of its lane, None if all are waiting"""
+        for index, task in enumerate(tasks):
+            if task.lane is None or task.lane not in self._busy_lanes:
+                return index
+
+        return None
+
+    def _next_task(self):
+        runnable = {}
+        for priority, tasks in self._queues.items():
+            index = self._first_runnable(tasks)
+            if index is not None:
+                runnable[priority] = index
+
+        waiting = sorted(runnable)
+        if not waiting:
+            return None
+
+        selected = waiting[0]
+        for priority in waiting[1:]:
+            if self._skipped[priority] >= self.starvation_limit:
+                selected = priority
+                break
+
+        for priority in waiting:
+            if priority == selected:
+                self._skipped[priority] = 0
+            elif priority > selected:
+                self._skipped[priority] += 1
+
+        tasks = self._queues[selected]
+        task = tasks[runnable[selected]]
+        del tasks[runnable[selected]]
+
+        if task.lane is not None:
+            self._busy_lanes.add(task.lane)
+
+        return task
+
+    def _worker(self):
+        self._local.worker = True
+
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None and self._running:
+                    self._condition.wait()
+                    task = self._next_task()
+
+                if task is None:
+                    return
+
+                self._condition.notify_all()
+
+            self._run(task)
+
+            if task.lane is not None:
+                with self._condition:
+                    self._busy_lanes.discard(task.lane)
+                    self._condition.notify_all()
+
+    def shutdown(self, wait=True):
+        """Stop accepting tasks and terminate the workers after the queued tasks are done
+
+        :param wait: wait for the workers to terminate
+        :type wait: boolean
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
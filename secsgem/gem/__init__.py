@@ -21,3 +21,13 @@ from __future__ import absolute_import
 from .handler import *  # noqa
 from .equipmenthandler import *  # noqa
 from .hosthandler import *  # noqa
+from .sharedvariables import *  # noqa
+from .emitter import *  # noqa
+from .spool import *  # noqa
+from .trace import *  # noqa
+from .limits import *  # noqa
+from .alarms import *  # noqa
+from .processprograms import *  # noqa
+from .wafermap import *  # noqa
+from .objectservices import *  # noqa
+from .eventbatches import *  # noqa
@@ -0,0 +1,250 @@
+#####################################################################
+# alarms.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Asynchronous alarm reporting with storm control"""
+
+import collections
+import logging
+import queue
+import threading
+import time
+
+from ..hsms.packets import HsmsPacket
+from ..secs.dataitems import ALCD
+
+_STOP = object()
+
+
+class _AlarmReportState(object):
+    def __init__(self, reported):
+        # state last reported to the host
+        self.reported = reported
+        # state waiting for debounce or rate limit, time of the change
+        self.pending = None
+        self.changed = None
+        # time of the last report
+        self.last_report = None
+
+
+class AlarmReporter(object):
+    """Sends the S5F1 messages and collection events of alarm changes from a separate thread
+
+    A change is reported when the alarm kept its state for the debounce time.
+    After a report, the next report of the same alarm waits for the minimum interval.
+    Changes reverted before they were reported are dropped,
+    so a flapping alarm is reported at most once per minimum interval with its latest state.
+    The debounce time and minimum interval are read from the 'debounce' and 'min_interval' attributes of the alarm,
+    or the *alarmDebounce* and *alarmMinInterval* attributes of the handler if the alarm doesn't set them.
+
+    Up to *window* S5F1 messages are sent before waiting for the first acknowledge.
+    The collection events are triggered with
+    :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.trigger_collection_events_async`.
+
+    :param handler: handler to send the alarms with
+    :type handler: :class:`secsgem.gem.equipmenthandler.GemEquipmentHandler`
+    :param window: maximum number of unacknowledged messages
+    :type window: integer
+    """
+
+    def __init__(self, handler, window=8):
+        self.handler = handler
+        self.window = window
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._statistics_lock = threading.Lock()
+        self._statistics = {"changes": 0, "reported": 0, "suppressed": 0, "acknowledged": 0, "failed": 0, \
+            "pending": 0, "max_pending": 0}
+
+        # alarm changes and responses of the host
+        self._queue = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="secsgem_alarmReporter")
+        self._thread.daemon = True  # kill thread automatically on main program termination
+        self._thread.start()
+
+    @property
+    def statistics(self):
+        """Counters of the reporter
+
+        - changes: alarm changes passed to the reporter
+        - reported: changes reported to the host
+        - suppressed: changes dropped, because they were reverted before they were reported
+        - acknowledged: S5F1 messages acknowledged by the host
+        - failed: S5F1 messages not acknowledged, timed out or spooled
+        - pending: changes currently waiting
+        - max_pending: maximum number of changes waiting at the same time
+
+        :returns: counters by name
+        :rtype: dict
+        """
+        with self._statistics_lock:
+            return dict(self._statistics)
+
+    def report(self, changes, previous):
+        """Queue alarm changes for reporting
+
+        :param changes: new states by alarm id, True if set
+        :type changes: dict
+        :param previous: states before the change by alarm id
+        :type previous: dict
+        """
+        self._count("changes", len(changes))
+        self._queue.put((changes, previous, time.time()))
+
+    def stop(self, wait=True):
+        """Stop the reporter, pending changes are discarded
+
+        :param wait: wait for the thread to finish
+        :type wait: boolean
+        """
+        self._queue.put(_STOP)
+
+        if wait:
+            self._thread.join()
+
+    def _count(self, name, count=1):
+        with self._statistics_lock:
+            self._statistics[name] += count
+
+    def _alarm_setting(self, alid, name, default):
+        alarm = self.handler.alarms.get(alid)
+        value = getattr(alarm, name, None)
+
+        return value if value is not None else default
+
+    def _add_changes(self, states, changes, previous, now):
+        for alid, state in changes.items():
+            if alid not in states:
+                states[alid] = _AlarmReportState(previous[alid])
+
+            report_state = states[alid]
+
+            if report_state.pending is not None and state == report_state.reported:
+                # the pending change and this change are dropped
+                report_state.pending = None
+                self._count("suppressed", 2)
+                continue
+
+            report_state.pending = state
+            report_state.changed = now
+
+    def _debounce(self, alid):
+        return self._alarm_setting(alid, "debounce", self.handler.alarmDebounce)
+
+    def _due_time(self, alid, report_state):
+        due = report_state.changed + self._debounce(alid)
+
+        if report_state.last_report is not None:
+            due = max(due, report_state.last_report + self._alarm_setting(alid, "min_interval", self.handler.alarmMinInterval))
+
+        return due
+
+    def _send(self, alid, state):
+        alarm = self.handler.alarms.get(alid)
+        if alarm is None:
+            return None
+
+        if alarm.enabled:
+            function = self.handler.stream_function(5, 1)({"ALCD": alarm.code | (ALCD.ALARM_SET if state else 0), \
+                "ALID": alid, "ALTX": alarm.text})
+
+            system_id = self.handler.send_stream_function_async(function, self._queue)
+            if system_id is None:
+                self.handler._spool_failed_message(function)  # noqa
+                self._count("failed")
+        else:
+            system_id = None
+
+        self.handler.trigger_collection_events_async([alarm.ce_on if state else alarm.ce_off])
+
+        return system_id
+
+    def _run(self):
+        states = {}
+        outstanding = collections.OrderedDict()
+
+        while True:
+            now = time.time()
+
+            # report the changes that are due, oldest first
+            due = sorted(((self._due_time(alid, report_state), alid) for alid, report_state in states.items() \
+                if report_state.pending is not None), key=lambda item: item[0])
+
+            next_due = None
+            for due_time, alid in due:
+                if due_time > now:
+                    next_due = due_time
+                    break
+
+                if len(outstanding) >= max(1, self.window):
+                    break
+
+                report_state = states[alid]
+                report_state.reported = report_state.pending
+                report_state.pending = None
+                report_state.last_report = now
+
+                self._count("reported")
+
+                system_id = self._send(alid, report_state.reported)
+                if system_id is not None:
+                    outstanding[system_id] = now + self.handler.connection.T3
+
+            pending = sum(1 for report_state in states.values() if report_state.pending is not None)
+            with self._statistics_lock:
+                self._statistics["pending"] = pending
+                self._statistics["max_pending"] = max(self._statistics["max_pending"], pending)
+
+            timeouts = []
+            if next_due is not None:
+                timeouts.append(next_due)
+            if outstanding:
+                timeouts.append(next(iter(outstanding.values())))
+
+            timeout = max(0, min(timeouts) - time.time()) if timeouts else None
+
+            try:
+                item = self._queue.get(True, timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+
+            if isinstance(item, HsmsPacket):
+                if item.header.system in outstanding:
+                    del outstanding[item.header.system]
+                    self.handler._remove_queue(item.header.system)  # noqa
+
+                    if item.header.stream == 5 and item.header.function == 2:
+                        self._count("acknowledged")
+                    else:
+                        self._count("failed")
+            elif item is not None:
+                self._add_changes(states, item[0], item[1], item[2])
+
+            now = time.time()
+            for system_id, deadline in list(outstanding.items()):
+                if deadline > now:
+                    break
+
+                self.logger.warning("alarm report not answered by host")
+                del outstanding[system_id]
+                self.handler._remove_queue(system_id)  # noqa
+                self._count("failed")
+
+        for system_id in outstanding:
+            self.handler._remove_queue(system_id)  # noqa
@@ -0,0 +1,192 @@
+#####################################################################
+# emitter.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Asynchronous sending of collection events"""
+
+import collections
+import logging
+import queue
+import threading
+import time
+
+from ..hsms.packets import HsmsPacket
+from ..secs.dataitems import ACKC6
+
+_STOP = object()
+
+
+class CollectionEventEmission(object):
+    """Collection event queued for sending
+
+    :param ceid: ID of the collection event
+    :type ceid: various
+    :param reports: reports of the collection event, built when the event was triggered
+    :type reports: list of dicts
+    :param callback: function called with this object when the event was acknowledged or failed
+    :type callback: function
+    """
+
+    def __init__(self, ceid, reports, callback=None):
+        self.ceid = ceid
+        self.reports = reports
+        self.callback = callback
+
+        self.ack = None
+        self.error = None
+
+        self._done = threading.Event()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'ceid': self.ceid, 'ack': self.ack, 'error': self.error})
+
+    @property
+    def done(self):
+        """Collection event was acknowledged or failed"""
+        return self._done.is_set()
+
+    @property
+    def acknowledged(self):
+        """Collection event was accepted by the host"""
+        return self.ack == ACKC6.ACCEPTED
+
+    def wait(self, timeout=None):
+        """Wait until the collection event was acknowledged or failed
+
+        :param timeout: seconds to wait
+        :type timeout: float
+        :returns: True if the collection event is done, False if timed out
+        :rtype: boolean
+        """
+        return self._done.wait(timeout)
+
+    def _finish(self, ack, error=None):
+        self.ack = ack
+        self.error = error
+        self._done.set()
+
+        if self.callback is not None:
+            self.callback(self)
+
+
+class CollectionEventEmitter(object):
+    """Sends S6F11 messages from a separate thread with a window of unacknowledged messages
+
+    The messages are sent in the order they were queued.
+    Up to *window* messages are sent before waiting for the first acknowledge.
+
+    :param handler: handler to send the collection events with
+    :type handler: :class:`secsgem.gem.equipmenthandler.GemEquipmentHandler`
+    :param window: maximum number of unacknowledged messages
+    :type window: integer
+    """
+
+    def __init__(self, handler, window=8):
+        self.handler = handler
+        self.window = window
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        # queued emissions and responses of the host
+        self._queue = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="secsgem_collectionEventEmitter")
+        self._thread.daemon = True  # kill thread automatically on main program termination
+        self._thread.start()
+
+    def emit(self, emission):
+        """Queue a collection event for sending
+
+        :param emission: collection event to send
+        :type emission: :class:`secsgem.gem.emitter.CollectionEventEmission`
+        """
+        self._queue.put(emission)
+
+    def stop(self, wait=True):
+        """Stop the emitter after the queued collection events were sent
+
+        :param wait: wait for the thread to finish
+        :type wait: boolean
+        """
+        self._queue.put(_STOP)
+
+        if wait:
+            self._thread.join()
+
+    def _send(self, emission):
+        function = self.handler.stream_function(6, 11)({"DATAID": 1, "CEID": emission.ceid, "RPT": emission.reports})
+
+        system_id = self.handler.send_stream_function_async(function, self._queue)
+        if system_id is None:
+            if self.handler._spool_failed_message(function):  # noqa
+                self._complete(emission, None, "spooled")
+            else:
+                self._complete(emission, None, "sending failed")
+
+        return system_id
+
+    def _complete(self, emission, ack, error=None):
+        try:
+            emission._finish(ack, error)  # noqa
+        except Exception:
+            self.logger.exception("ignoring exception in collection event callback")
+
+    def _run(self):
+        pending = collections.deque()
+        outstanding = collections.OrderedDict()
+        running = True
+
+        while running or pending or outstanding:
+            while pending and len(outstanding) < max(1, self.window):
+                emission = pending.popleft()
+                system_id = self._send(emission)
+                if system_id is not None:
+                    outstanding[system_id] = (emission, time.time() + self.handler.connection.T3)
+
+            if outstanding:
+                # messages are sent in order with the same timeout, so the first one expires first
+                timeout = max(0, next(iter(outstanding.values()))[1] - time.time())
+            elif running:
+                timeout = None
+            else:
+                break
+
+            try:
+                item = self._queue.get(True, timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                running = False
+            elif isinstance(item, HsmsPacket):
+                if item.header.system in outstanding:
+                    emission, _ = outstanding.pop(item.header.system)
+                    self.handler._remove_queue(item.header.system)  # noqa
+
+                    if item.header.stream == 6 and item.header.function == 12:
+                        self._complete(emission, self.handler.secs_decode(item).get())
+                    else:
+                        self._complete(emission, None, "unexpected response S{}F{}".format(item.header.stream, item.header.function))
+            elif item is not None:
+                pending.append(item)
+
+            now = time.time()
+            for system_id, (emission, deadline) in list(outstanding.items()):
+                if deadline > now:
+                    break
+
+                del outstanding[system_id]
+                self.handler._remove_queue(system_id)  # noqa
+                self._complete(emission, None, "timeout")
@@ -15,11 +15,30 @@
 #####################################################################
 """Handler for GEM equipment."""
 
+import collections
+import copy
+import queue
+import threading
+import time
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # pragma: no cover
+    from collections import MutableMapping
+
 from ..common.fysom import Fysom
 from ..gem.handler import GemHandler
+from .emitter import CollectionEventEmission, CollectionEventEmitter
+from .trace import Trace, TraceScheduler, parse_sample_period
+from .limits import VariableLimit, LimitMonitor
+from .alarms import AlarmReporter
+from ..hsms.packets import HsmsPacket
 from ..secs.variables import SecsVarString, SecsVarU4, SecsVarArray, SecsVarI2, \
-    SecsVarI4, SecsVarBinary
-from ..secs.dataitems import SV, ECV, ACKC5, ALED, ALCD, HCACK
+    SecsVarI4, SecsVarBinary, SecsVarU1, SecsVar
+from ..secs.dataitems import SV, ECV, ACKC5, ALED, ALCD, HCACK, RSPACK, STRACK, RSDC, RSDA, TIAACK, VLAACK, LVACK, LIMITACK, \
+    ACKC7, OBJACK, ERRCODE, ATTRDATA
+from ..secs.functions import secsStreamsFunctions
+from ..secs.functionbase import SecsEncodedStreamFunction
 
 from datetime import datetime
 from dateutil.tz import tzlocal
@@ -32,10 +51,27 @@ SVID_CONTROL_STATE = 1002
 SVID_EVENTS_ENABLED = 1003
 SVID_ALARMS_ENABLED = 1004
 SVID_ALARMS_SET = 1005
+SVID_SPOOL_COUNT_ACTUAL = 1006
+SVID_SPOOL_COUNT_TOTAL = 1007
+SVID_SPOOL_FULL_TIME = 1008
+SVID_SPOOL_START_TIME = 1009
+
+_INTERNAL_SVIDS = (SVID_CLOCK, SVID_CONTROL_STATE, SVID_EVENTS_ENABLED, SVID_ALARMS_ENABLED, SVID_ALARMS_SET, \
+    SVID_SPOOL_COUNT_ACTUAL, SVID_SPOOL_COUNT_TOTAL, SVID_SPOOL_FULL_TIME, SVID_SPOOL_START_TIME)
+
+DVID_LIMIT_VARIABLE = 2001
+DVID_EVENT_LIMIT = 2002
+DVID_TRANSITION_TYPE = 2003
+
+_INTERNAL_DVIDS = (DVID_LIMIT_VARIABLE, DVID_EVENT_LIMIT, DVID_TRANSITION_TYPE)
+
+# values encoded as they are in a S1F4 response
+_SV_TYPES = tuple(SV.__allowedtypes__)
 
 CEID_EQUIPMENT_OFFLINE = 1
 CEID_CONTROL_STATE_LOCAL = 2
 CEID_CONTROL_STATE_REMOTE = 3
+CEID_LIMIT_ZONE_TRANSITION = 4
 
 CEID_CMD_START_DONE = 20
 CEID_CMD_STOP_DONE = 21
@@ -62,6 +98,12 @@ class DataValue(object):
     :type value_type: type of class inherited from :class:`secsgem.secs.variables.SecsVar`
     :param use_callback: use the GemEquipmentHandler callbacks to get variable (True) or use internal value
     :type use_callback: boolean
+
+    Set the 'shared_table' keyword argument to a :class:`secsgem.gem.sharedvariables.SharedVariableTable`
+    to read the value from shared memory.
+
+    Set the 'change_events' keyword argument to a list of collection events
+    triggered when the value is changed with :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_values`.
     """
 
     def __init__(self, dvid, name, value_type, use_callback=True, **kwargs):
@@ -70,6 +112,12 @@ class DataValue(object):
         self.value_type = value_type
         self.use_callback = use_callback
         self.value = 0
+        self.shared_table = None
+        self.change_events = []
+        self.version = 0
+
+        # encoded value set with GemEquipmentHandler.update_values
+        self._pushed_value = None
 
         if isinstance(self.dvid, int):
             self.id_type = SecsVarU4
@@ -101,6 +149,14 @@ class StatusVariable(object):
     :type value_type: type of class inherited from :class:`secsgem.secs.variables.SecsVar`
     :param use_callback: use the GemEquipmentHandler callbacks to get variable (True) or use internal value
     :type use_callback: boolean
+
+    Set the 'shared_table' keyword argument to a :class:`secsgem.gem.sharedvariables.SharedVariableTable`
+    to read the value from shared memory.
+
+    Set the 'limit_min' and 'limit_max' keyword arguments to allow the host to define limits for the variable.
+
+    Set the 'change_events' keyword argument to a list of collection events
+    triggered when the value is changed with :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_values`.
     """
 
     def __init__(self, svid, name, unit, value_type, use_callback=True, **kwargs):
@@ -110,6 +166,14 @@ class StatusVariable(object):
         self.value_type = value_type
         self.use_callback = use_callback
         self.value = 0
+        self.shared_table = None
+        self.limit_min = None
+        self.limit_max = None
+        self.change_events = []
+        self.version = 0
+
+        # encoded value set with GemEquipmentHandler.update_values
+        self._pushed_value = None
 
         if isinstance(self.svid, int):
             self.id_type = SecsVarU4
@@ -204,6 +268,324 @@ class CollectionEventReport(object):
             setattr(self, key, value)
 
 
+class _CollectionEventPlan(object):
+    """Precompiled reports of a linked collection event
+
+    The variables are collected once, so building the reports only requests their values.
+
+    :param status_variables: status variables used in the reports, without duplicates
+    :type status_variables: list of :class:`secsgem.gem.equipmenthandler.StatusVariable`
+    :param data_values: data values used in the reports, without duplicates
+    :type data_values: list of :class:`secsgem.gem.equipmenthandler.DataValue`
+    :param reports: report ids with the positions of their values (0 for status variables, 1 for data values and index)
+    :type reports: list of tuples (rptid, list of tuples (integer, integer))
+    """
+
+    def __init__(self, status_variables, data_values, reports):
+        self.status_variables = status_variables
+        self.data_values = data_values
+        self.reports = reports
+
+
+class _PersistentDict(MutableMapping):
+    """Dictionary sharing its unchanged parts with its copies, used for the reports and links defined by the host
+
+    The items are kept in small dictionaries, selected by the hash of the key through a fixed number of node lists.
+    A copy shares all nodes with the original, a change only copies the nodes on the path to the changed key.
+    Nodes created by a dictionary are changed in place until it is copied again.
+    So copying and changing an item doesn't depend on the number of items.
+    """
+
+    _BITS = 5
+    _WIDTH = 1 << _BITS
+    _LEVELS = 3
+
+    def __init__(self, *args, **kwargs):
+        self._root = [None] * self._WIDTH
+        self._length = 0
+        # ids of the nodes only used by this dictionary
+        self._owned = set([id(self._root)])
+
+        self.update(*args, **kwargs)
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return repr(dict(self.items()))
+
+    def __len__(self):
+        """Get the number of items"""
+        return self._length
+
+    def _find_leaf(self, key):
+        node = self._root
+        hashed = hash(key)
+
+        for level in range(self._LEVELS):
+            node = node[(hashed >> (level * self._BITS)) & (self._WIDTH - 1)]
+            if node is None:
+                return None
+
+        return node
+
+    def _writable_leaf(self, key):
+        if id(self._root) not in self._owned:
+            self._root = list(self._root)
+            self._owned.add(id(self._root))
+
+        node = self._root
+        hashed = hash(key)
+
+        for level in range(self._LEVELS):
+            index = (hashed >> (level * self._BITS)) & (self._WIDTH - 1)
+            child = node[index]
+
+            if child is None or id(child) not in self._owned:
+                if level == self._LEVELS - 1:
+                    child = dict(child) if child is not None else {}
+                else:
+                    child = list(child) if child is not None else [None] * self._WIDTH
+
+                self._owned.add(id(child))
+                node[index] = child
+
+            node = child
+
+        return node
+
+    def __getitem__(self, key):
+        """Get an item"""
+        leaf = self._find_leaf(key)
+        if leaf is None:
+            raise KeyError(key)
+
+        return leaf[key]
+
+    def __contains__(self, key):
+        """Check if a key is in the dictionary"""
+        leaf = self._find_leaf(key)
+
+        return leaf is not None and key in leaf
+
+    def __setitem__(self, key, value):
+        """Set an item, copies the nodes shared with other dictionaries"""
+        leaf = self._writable_leaf(key)
+        if key not in leaf:
+            self._length += 1
+
+        leaf[key] = value
+
+    def __delitem__(self, key):
+        """Remove an item, copies the nodes shared with other dictionaries"""
+        if key not in self:
+            raise KeyError(key)
+
+        del self._writable_leaf(key)[key]
+        self._length -= 1
+
+    def __iter__(self):
+        """Iterate the keys"""
+        nodes = [(self._root, 0)]
+
+        while nodes:
+            node, level = nodes.pop()
+
+            if level == self._LEVELS:
+                for key in list(node):
+                    yield key
+            else:
+                nodes.extend((child, level + 1) for child in node if child is not None)
+
+    def copy(self):
+        """Get a copy sharing all nodes, in constant time"""
+        result = _PersistentDict()
+        result._root = self._root  # noqa
+        result._length = self._length  # noqa
+        result._owned = set()  # noqa
+
+        # shared nodes are copied before the next change by either dictionary
+        self._owned = set()
+
+        return result
+
+
+class _IdSet(object):
+    """Ordered set of ids with cached encoded lists, used for the enabled events, enabled alarms and set alarms
+
+    Copies share the ids, so copying the enabled events of the reports and links doesn't depend on their number.
+    """
+
+    def __init__(self):
+        # id -> sequence number of its insertion
+        self._ids = _PersistentDict()
+        self._counter = 0
+
+        # ids in order and value type -> encoded list, dropped on every change
+        self._ordered = None
+        self._encoded = {}
+
+    def __contains__(self, item):
+        """Check if an id is in the set"""
+        return item in self._ids
+
+    def __len__(self):
+        """Get the number of ids"""
+        return len(self._ids)
+
+    def update(self, item, member):
+        """Add an id to (member is True) or remove it from (member is False) the set"""
+        if member and item not in self._ids:
+            self._ids[item] = self._counter
+            self._counter += 1
+        elif not member and item in self._ids:
+            del self._ids[item]
+        else:
+            return
+
+        self._ordered = None
+        self._encoded = {}
+
+    def clear(self):
+        """Remove all ids"""
+        self._ids = _PersistentDict()
+        self._ordered = None
+        self._encoded = {}
+
+    def ids(self):
+        """Get the ids in the order they were added"""
+        ordered = self._ordered
+        if ordered is None:
+            ordered = [item for _, item in sorted((number, item) for item, number in self._ids.items())]
+            self._ordered = ordered
+
+        return list(ordered)
+
+    def copy(self):
+        """Get an independent copy of the set, the ids are shared until one of the sets changes"""
+        id_set = _IdSet()
+        id_set._ids = self._ids.copy()  # noqa
+        id_set._counter = self._counter  # noqa
+        id_set._ordered = self._ordered  # noqa
+        id_set._encoded = dict(self._encoded)  # noqa
+
+        return id_set
+
+    def encoded(self, value_type):
+        """Get the ids as list of SV of the *value_type*, encoded only after a change
+
+        Every caller gets its own list object, the encoded items are shared.
+        """
+        cached = self._encoded.get(value_type)
+        if cached is None:
+            cached = value_type(SV, self.ids())
+            self._encoded[value_type] = cached
+
+        result = copy.copy(cached)
+        result.data = list(cached.data)
+
+        return result
+
+
+class _VersionedDict(dict):
+    """Dictionary counting its changes, used for the status variables and equipment constants
+
+    Responses built from all items are kept until the version changes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        """Set an item and count the change"""
+        dict.__setitem__(self, key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        """Remove an item and count the change"""
+        dict.__delitem__(self, key)
+        self.version += 1
+
+    def clear(self):
+        """Remove all items and count the change"""
+        dict.clear(self)
+        self.version += 1
+
+    def pop(self, *args):
+        """Remove an item and count the change"""
+        self.version += 1
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        """Remove an item and count the change"""
+        self.version += 1
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        """Add an item if missing and count the change"""
+        self.version += 1
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        """Update the items and count the change"""
+        dict.update(self, *args, **kwargs)
+        self.version += 1
+
+
+class _EventReportModel(object):
+    """Reports and links defined by the host with the compiled plans, indexes and enabled events
+
+    A published model is only read, the handler publishes a changed copy with the next version instead.
+    Readers take the reference once and see a consistent state of all parts without locking.
+    The parts are :class:`_PersistentDict` shared with the copy, so a change only copies the entries it touches.
+
+    :param version: version of the model
+    :type version: integer
+    """
+
+    def __init__(self, version=0):
+        self.version = version
+
+        self.reports = _PersistentDict()  # rptid -> CollectionEventReport
+        self.links = _PersistentDict()  # ceid -> CollectionEventLink
+        self.plans = _PersistentDict()  # ceid -> _CollectionEventPlan
+
+        self.report_collection_events = _PersistentDict()  # rptid -> frozenset of linked ceids
+        self.variable_reports = _PersistentDict()  # vid -> frozenset of rptids containing the variable
+
+        self.events_enabled = _IdSet()
+
+    def copy(self):
+        """Get a copy with the next version
+
+        The dictionaries share their entries with this model, so copying takes constant time.
+        Use :func:`secsgem.gem.equipmenthandler._EventReportModel.change_link` to change a link of the copy.
+        """
+        model = _EventReportModel(self.version + 1)
+
+        model.reports = self.reports.copy()
+        model.links = self.links.copy()
+        model.plans = self.plans.copy()
+        model.report_collection_events = self.report_collection_events.copy()
+        model.variable_reports = self.variable_reports.copy()
+        model.events_enabled = self.events_enabled.copy()
+
+        return model
+
+    def change_link(self, ceid):
+        """Replace a link with a copy, so it can be changed without affecting older models
+
+        :param ceid: linked collection event
+        :type ceid: various
+        :returns: the copy of the link
+        :rtype: :class:`secsgem.gem.equipmenthandler.CollectionEventLink`
+        """
+        link = copy.copy(self.links[ceid])
+        link._reports = list(link.reports)  # noqa
+        self.links[ceid] = link
+
+        return link
+
+
 class EquipmentConstant(object):
     """Equipment constant definition
 
@@ -269,8 +651,18 @@ class Alarm(object):
     :type ce_on: types supported by data item CEID
     :param ce_off: collection event for alarm cleared
     :type ce_off: types supported by data item CEID
+
+    Set the 'debounce' and 'min_interval' keyword arguments to override the storm control settings of the
+    :class:`secsgem.gem.equipmenthandler.GemEquipmentHandler` for alarms reported with
+    :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_alarms`.
+
+    Changes of *enabled* and *set* are passed to the handler the alarm belongs to,
+    which keeps the lists of enabled and set alarms.
     """
 
+    # called with the alarm after enabled or set changed
+    _listener = None
+
     def __init__(self, alid, name, text, code, ce_on, ce_off, **kwargs):
         self.alid = alid
         self.name = name
@@ -280,6 +672,8 @@ class Alarm(object):
         self.ce_off = ce_off
         self.enabled = False
         self.set = False
+        self.debounce = None
+        self.min_interval = None
 
         if isinstance(self.alid, int):
             self.id_type = SecsVarU4
@@ -289,6 +683,28 @@ class Alarm(object):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    @property
+    def enabled(self):
+        """Alarm is reported to the host"""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+        if self._listener is not None:
+            self._listener(self)
+
+    @property
+    def set(self):
+        """Alarm is set"""
+        return self._set
+
+    @set.setter
+    def set(self, value):
+        self._set = value
+        if self._listener is not None:
+            self._listener(self)
+
 
 class RemoteCommand(object):
     """Remote command definition
@@ -356,39 +772,94 @@ class GemEquipmentHandler(GemHandler):
         self._time_format = 1
 
         self._data_values = {
+            DVID_LIMIT_VARIABLE: DataValue(DVID_LIMIT_VARIABLE, "LimitVariable", SecsVarU4),
+            DVID_EVENT_LIMIT: DataValue(DVID_EVENT_LIMIT, "EventLimit", SecsVarBinary),
+            DVID_TRANSITION_TYPE: DataValue(DVID_TRANSITION_TYPE, "TransitionType", SecsVarU1),
         }
 
-        self._status_variables = {
+        self._status_variables = _VersionedDict({
             SVID_CLOCK: StatusVariable(SVID_CLOCK, "Clock", "", SecsVarString),
             SVID_CONTROL_STATE: StatusVariable(SVID_CONTROL_STATE, "ControlState", "", SecsVarBinary),
             SVID_EVENTS_ENABLED: StatusVariable(SVID_EVENTS_ENABLED, "EventsEnabled", "", SecsVarArray),
             SVID_ALARMS_ENABLED: StatusVariable(SVID_ALARMS_ENABLED, "AlarmsEnabled", "", SecsVarArray),
             SVID_ALARMS_SET: StatusVariable(SVID_ALARMS_SET, "AlarmsSet", "", SecsVarArray),
-        }
+            SVID_SPOOL_COUNT_ACTUAL: StatusVariable(SVID_SPOOL_COUNT_ACTUAL, "SpoolCountActual", "", SecsVarU4),
+            SVID_SPOOL_COUNT_TOTAL: StatusVariable(SVID_SPOOL_COUNT_TOTAL, "SpoolCountTotal", "", SecsVarU4),
+            SVID_SPOOL_FULL_TIME: StatusVariable(SVID_SPOOL_FULL_TIME, "SpoolFullTime", "", SecsVarString),
+            SVID_SPOOL_START_TIME: StatusVariable(SVID_SPOOL_START_TIME, "SpoolStartTime", "", SecsVarString),
+        })
 
         self._collection_events = {
             CEID_EQUIPMENT_OFFLINE: CollectionEvent(CEID_EQUIPMENT_OFFLINE, "EquipmentOffline", []),
             CEID_CONTROL_STATE_LOCAL: CollectionEvent(CEID_CONTROL_STATE_LOCAL, "ControlStateLocal", []),
             CEID_CONTROL_STATE_REMOTE: CollectionEvent(CEID_CONTROL_STATE_REMOTE, "ControlStateRemote", []),
+            CEID_LIMIT_ZONE_TRANSITION: CollectionEvent(CEID_LIMIT_ZONE_TRANSITION, "LimitZoneTransition", \
+                [DVID_LIMIT_VARIABLE, DVID_EVENT_LIMIT, DVID_TRANSITION_TYPE]),
             CEID_CMD_START_DONE: CollectionEvent(CEID_CMD_START_DONE, "CmdStartDone", []),
             CEID_CMD_STOP_DONE: CollectionEvent(CEID_CMD_STOP_DONE, "CmdStopDone", []),
         }
 
-        self._equipment_constants = {
+        self._equipment_constants = _VersionedDict({
             ECID_ESTABLISH_COMMUNICATIONS_TIMEOUT: EquipmentConstant(ECID_ESTABLISH_COMMUNICATIONS_TIMEOUT, "EstablishCommunicationsTimeout", 10, 120, 10, "sec", SecsVarI2),
             ECID_TIME_FORMAT: EquipmentConstant(ECID_TIME_FORMAT, "TimeFormat", 0, 2, 1, "", SecsVarI4),
-        }
+        })
 
-        self._alarms = {
-        }
+        self._alarms = _VersionedDict({
+        })
 
         self._remote_commands = {
             RCMD_START: RemoteCommand(RCMD_START, "Start", [], CEID_CMD_START_DONE),
             RCMD_STOP: RemoteCommand(RCMD_STOP, "Stop", [], CEID_CMD_STOP_DONE),
         }
 
-        self._registered_reports = {}
-        self._registered_collection_events = {}
+        # reports and links defined by the host, replaced by a changed copy by S2F33, S2F35 and S2F37
+        self._event_reports = _EventReportModel()
+        self._event_reports_lock = threading.Lock()
+
+        # maintained by the alarms when their state changes, read by the status variables and S5F7
+        self._alarms_enabled = _IdSet()
+        self._alarms_set = _IdSet()
+        # alarms dictionary and its version when the states were read from the alarms
+        self._alarm_states_synced = None
+
+        self.collectionEventWindow = 8
+        self.asyncCollectionEvents = False
+
+        self._collection_event_emitter = None
+        self._collection_event_emitter_lock = threading.Lock()
+
+        # (stream, function) -> (dictionary, version, response) of namelist requests for all items
+        self._namelist_responses = {}
+
+        self.spool = None
+        self.spoolStreams = {}
+        self.spoolTransmitWindow = 8
+
+        self._spool_transmit_thread = None
+        self._spool_transmit_lock = threading.Lock()
+
+        self.maxTraces = 32
+
+        self._trace_scheduler = None
+        self._trace_scheduler_lock = threading.Lock()
+
+        self._limit_monitors = {}
+        self._limit_monitors_lock = threading.Lock()
+
+        self._value_version = 0
+        self._value_version_lock = threading.Lock()
+
+        self.alarmWindow = 8
+        self.alarmDebounce = 0.0
+        self.alarmMinInterval = 0.0
+
+        self._alarm_reporter = None
+        self._alarm_reporter_lock = threading.Lock()
+        # reentrant, the alarms report their changes while update_alarms holds the lock
+        self._alarm_states_lock = threading.RLock()
+
+        # object type name -> ObjectType, answered by S14F1 and S14F3
+        self._object_types = {}
 
         self.controlState = Fysom({
             'initial': "INIT",
@@ -559,25 +1030,81 @@ class GemEquipmentHandler(GemHandler):
 
         return dv.value_type(dv.value)
 
-    def _get_dv_value(self, dv):
+    def on_dv_values_request(self, dvids, dvs):
+        """Get the values of multiple data values.
+
+        Override in inherited class to request all values at once, the default requests every value with
+        :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.on_dv_value_request`.
+
+        :param dvids: Ids of the data values encoded in the corresponding type
+        :type dvids: list of :class:`secsgem.secs.variables.SecsVar`
+        :param dvs: The data values requested
+        :type dvs: list of :class:`secsgem.gem.equipmenthandler.DataValue`
+        :returns: The values encoded in the corresponding type, in the order of the request
+        :rtype: list of :class:`secsgem.secs.variables.SecsVar`
+        """
+        return [self.on_dv_value_request(dvid, dv) for dvid, dv in zip(dvids, dvs)]
+
+    def _get_dv_value(self, dv, transition=None):
         """Get the data value depending on its configuation
 
         :param dv: The data value requested
         :type dv: :class:`secsgem.gem.equipmenthandler.DataValue`
+        :param transition: (svid, limitid, transition type) of the limit zone transition event being built
+        :type transition: tuple
         :returns: The value encoded in the corresponding type
         :rtype: :class:`secsgem.secs.variables.SecsVar`
         """
+        if dv.dvid in _INTERNAL_DVIDS:
+            return self._get_limit_transition_value(dv, transition)
+
+        if dv._pushed_value is not None:  # noqa
+            return dv._pushed_value  # noqa
+
+        if dv.shared_table is not None:
+            return dv.value_type(dv.shared_table.read(dv.dvid))
+
         if dv.use_callback:
             return self.on_dv_value_request(dv.id_type(dv.dvid), dv)
         else:
             return dv.value_type(dv.value)
 
+    def _get_dv_values(self, dvs, transition=None):
+        """Get multiple data values, the values using callbacks are requested with one call
+
+        :param dvs: The data values requested
+        :type dvs: list of :class:`secsgem.gem.equipmenthandler.DataValue`
+        :param transition: (svid, limitid, transition type) of the limit zone transition event being built
+        :type transition: tuple
+        :returns: The values encoded in the corresponding type
+        :rtype: list of :class:`secsgem.secs.variables.SecsVar`
+        """
+        values = []
+        requested = []
+
+        for index, dv in enumerate(dvs):
+            if dv.use_callback and dv.shared_table is None and dv._pushed_value is None and dv.dvid not in _INTERNAL_DVIDS:  # noqa
+                requested.append(index)
+                values.append(None)
+            else:
+                values.append(self._get_dv_value(dv, transition))
+
+        if requested:
+            results = self.on_dv_values_request([dvs[index].id_type(dvs[index].dvid) for index in requested], [dvs[index] for index in requested])
+            for index, value in zip(requested, results):
+                values[index] = value
+
+        return values
+
     # status variables
 
     @property
     def status_variables(self):
         """The list of the status variables
 
+        The S1F11 response for all status variables is kept until the dictionary is changed.
+        Replace a status variable in the dictionary instead of changing its name or unit.
+
         :returns: Status variable list
         :rtype: list of :class:`secsgem.gem.equipmenthandler.StatusVariables`
         """
@@ -599,6 +1126,21 @@ class GemEquipmentHandler(GemHandler):
 
         return sv.value_type(sv.value)
 
+    def on_sv_values_request(self, svids, svs):
+        """Get the values of multiple status variables.
+
+        Override in inherited class to request all values at once, the default requests every value with
+        :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.on_sv_value_request`.
+
+        :param svids: Ids of the status variables encoded in the corresponding type
+        :type svids: list of :class:`secsgem.secs.variables.SecsVar`
+        :param svs: The status variables requested
+        :type svs: list of :class:`secsgem.gem.equipmenthandler.StatusVariable`
+        :returns: The values encoded in the corresponding type, in the order of the request
+        :rtype: list of :class:`secsgem.secs.variables.SecsVar`
+        """
+        return [self.on_sv_value_request(svid, sv) for svid, sv in zip(svids, svs)]
+
     def _get_sv_value(self, sv):
         """Get the status variable value depending on its configuation
 
@@ -612,20 +1154,60 @@ class GemEquipmentHandler(GemHandler):
         if sv.svid == SVID_CONTROL_STATE:
             return sv.value_type(self._get_control_state_id())
         if sv.svid == SVID_EVENTS_ENABLED:
-            events = self._get_events_enabled()
-            return sv.value_type(SV, events)
+            return self._event_reports.events_enabled.encoded(sv.value_type)
         if sv.svid == SVID_ALARMS_ENABLED:
-            alarms = self._get_alarms_enabled()
-            return sv.value_type(SV, alarms)
+            with self._alarm_states_lock:
+                self._sync_alarm_states()
+                return self._alarms_enabled.encoded(sv.value_type)
         if sv.svid == SVID_ALARMS_SET:
-            alarms = self._get_alarms_set()
-            return sv.value_type(SV, alarms)
+            with self._alarm_states_lock:
+                self._sync_alarm_states()
+                return self._alarms_set.encoded(sv.value_type)
+        if sv.svid == SVID_SPOOL_COUNT_ACTUAL:
+            return sv.value_type(len(self.spool) if self.spool is not None else 0)
+        if sv.svid == SVID_SPOOL_COUNT_TOTAL:
+            return sv.value_type(self.spool.count_total if self.spool is not None else 0)
+        if sv.svid == SVID_SPOOL_FULL_TIME:
+            return sv.value_type(self._format_time(self.spool.full_time) if self.spool is not None else "")
+        if sv.svid == SVID_SPOOL_START_TIME:
+            return sv.value_type(self._format_time(self.spool.start_time) if self.spool is not None else "")
+
+        if sv._pushed_value is not None:  # noqa
+            return sv._pushed_value  # noqa
+
+        if sv.shared_table is not None:
+            return sv.value_type(sv.shared_table.read(sv.svid))
 
         if sv.use_callback:
             return self.on_sv_value_request(sv.id_type(sv.svid), sv)
         else:
             return sv.value_type(sv.value)
 
+    def _get_sv_values(self, svs):
+        """Get multiple status variables, the values using callbacks are requested with one call
+
+        :param svs: The status variables requested
+        :type svs: list of :class:`secsgem.gem.equipmenthandler.StatusVariable`
+        :returns: The values encoded in the corresponding type
+        :rtype: list of :class:`secsgem.secs.variables.SecsVar`
+        """
+        values = []
+        requested = []
+
+        for index, sv in enumerate(svs):
+            if sv.use_callback and sv.shared_table is None and sv._pushed_value is None and sv.svid not in _INTERNAL_SVIDS:  # noqa
+                requested.append(index)
+                values.append(None)
+            else:
+                values.append(self._get_sv_value(sv))
+
+        if requested:
+            results = self.on_sv_values_request([svs[index].id_type(svs[index].svid) for index in requested], [svs[index] for index in requested])
+            for index, value in zip(requested, results):
+                values[index] = value
+
+        return values
+
     def _on_s01f03(self, handler, packet):
         """Callback handler for Stream 1, Function 3, Equipment status request
 
@@ -638,22 +1220,35 @@ class GemEquipmentHandler(GemHandler):
 
         message = self.secs_decode(packet)
 
-        responses = []
-
         if len(message) == 0:
-            for svid in self._status_variables:
-                sv = self._status_variables[svid]
-                responses.append(self._get_sv_value(sv))
-        else:
-            for svid in message:
-                if svid not in self._status_variables:
-                    responses.append(SecsVarArray(SV, []))
-                else:
-                    sv = self._status_variables[svid]
-                    responses.append(self._get_sv_value(sv))
+            return self._encode_sv_values(self._get_sv_values(list(self._status_variables.values())))
+
+        svs = [self._status_variables[svid] for svid in message if svid in self._status_variables]
+        values = iter(self._get_sv_values(svs))
+
+        responses = []
+        for svid in message:
+            if svid not in self._status_variables:
+                responses.append(SecsVarArray(SV, []))
+            else:
+                responses.append(next(values))
 
         return self.stream_function(1, 4)(responses)
 
+    def _encode_sv_values(self, values):
+        """Encode the S1F4 response for status variable values directly
+
+        The values are encoded one after the other, without converting them to the items of the response first.
+
+        :param values: values encoded in the corresponding type
+        :type values: list of :class:`secsgem.secs.variables.SecsVar`
+        :returns: the response
+        :rtype: :class:`secsgem.secs.functionbase.SecsEncodedStreamFunction`
+        """
+        data = [value.encode() if isinstance(value, _SV_TYPES) else SV(value).encode() for value in values]
+
+        return SecsEncodedStreamFunction(self.stream_function(1, 4), SecsVarArray(SV).encode_item_header(len(data)) + b"".join(data))
+
     def _on_s01f11(self, handler, packet):
         """Callback handler for Stream 1, Function 11, SV namelist request
 
@@ -666,22 +1261,52 @@ class GemEquipmentHandler(GemHandler):
 
         message = self.secs_decode(packet)
 
+        if len(message) == 0:
+            return self._get_namelist_response(1, 12, self._status_variables, \
+                lambda sv: {"SVID": sv.svid, "SVNAME": sv.name, "UNITS": sv.unit})
+
         responses = []
 
-        if len(message) == 0:
-            for svid in self._status_variables:
+        for svid in message:
+            if svid not in self._status_variables:
+                responses.append({"SVID": svid, "SVNAME": "", "UNITS": ""})
+            else:
                 sv = self._status_variables[svid]
                 responses.append({"SVID": sv.svid, "SVNAME": sv.name, "UNITS": sv.unit})
-        else:
-            for svid in message:
-                if svid not in self._status_variables:
-                    responses.append({"SVID": svid, "SVNAME": "", "UNITS": ""})
-                else:
-                    sv = self._status_variables[svid]
-                    responses.append({"SVID": sv.svid, "SVNAME": sv.name, "UNITS": sv.unit})
 
         return self.stream_function(1, 12)(responses)
 
+    def _get_namelist_response(self, stream, function, variables, item):
+        """Get the response of a namelist request for all variables
+
+        The response is encoded once and kept until the dictionary of the variables is changed.
+
+        :param stream: stream of the response
+        :type stream: integer
+        :param function: function of the response
+        :type function: integer
+        :param variables: the status variables or equipment constants
+        :type variables: dict
+        :param item: function generating the response item for a variable
+        :type item: function
+        :returns: the response
+        :rtype: :class:`secsgem.secs.functionbase.SecsEncodedStreamFunction`
+        """
+        # plain dictionaries set by subclasses can't be tracked, their response is built every time
+        version = getattr(variables, "version", None)
+
+        cached = self._namelist_responses.get((stream, function))
+        if cached is not None and version is not None and cached[0] is variables and cached[1] == version:
+            return cached[2]
+
+        function_class = self.stream_function(stream, function)
+        response = SecsEncodedStreamFunction(function_class, function_class([item(variable) for variable in list(variables.values())]).encode())
+
+        if version is not None:
+            self._namelist_responses[(stream, function)] = (variables, version, response)
+
+        return response
+
     # collection events
 
     @property
@@ -697,20 +1322,24 @@ class GemEquipmentHandler(GemHandler):
     def registered_reports(self):
         """The list of the subscribed reports
 
+        The dictionary belongs to the current version of the reports and links, it isn't changed by the host anymore.
+
         :returns: Collection event report list
         :rtype: dictionary of subscribed reports
         """
-        return self._registered_reports
+        return self._event_reports.reports
 
     @property
     def registered_collection_events(self):
         """The list of the subscribed collection events
 
+        The dictionary belongs to the current version of the reports and links, it isn't changed by the host anymore.
+
         :returns: Collection event list
         :rtype: dictionary of :class:`secsgem.gem.equipmenthandler.CollectionEventLink`
 
         """
-        return self._registered_collection_events
+        return self._event_reports.links
 
     def trigger_collection_events(self, ceids):
         """Triggers the supplied collection events
@@ -718,124 +1347,104 @@ class GemEquipmentHandler(GemHandler):
         :param ceids: List of collection events
         :type ceids: list of various
         """
+        if self.asyncCollectionEvents:
+            self.trigger_collection_events_async(ceids)
+            return
+
         if not isinstance(ceids, list):
             ceids = [ceids]
 
+        model = self._event_reports
+
         for ceid in ceids:
-            if ceid in self._registered_collection_events:
-                if self._registered_collection_events[ceid].enabled:
-                    reports = self._build_collection_event(ceid)
+            if ceid in model.links:
+                if model.links[ceid].enabled:
+                    reports = self._build_collection_event(ceid, model)
 
-                    self.send_and_waitfor_response(self.stream_function(6, 11)({"DATAID": 1, "CEID": ceid, "RPT": reports}))
+                    self._send_or_spool(self.stream_function(6, 11)({"DATAID": 1, "CEID": ceid, "RPT": reports}))
 
-    def _on_s02f33(self, handler, packet):
-        """Callback handler for Stream 2, Function 33, Define Report
+    def trigger_collection_events_async(self, ceids, callback=None):
+        """Triggers the supplied collection events without waiting for the host
 
-        :param handler: handler the message was received on
-        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
-        :param packet: complete message received
-        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        The reports are built immediately, the messages are sent from a separate thread
+        with up to *collectionEventWindow* unacknowledged messages.
+        Events that are spooled because the host is not available are finished with the error "spooled".
+
+        :param ceids: List of collection events
+        :type ceids: list of various
+        :param callback: function called with the :class:`secsgem.gem.emitter.CollectionEventEmission` when it was acknowledged or failed
+        :type callback: function
+        :returns: queued collection events
+        :rtype: list of :class:`secsgem.gem.emitter.CollectionEventEmission`
         """
-        del handler  # unused parameters
+        return self._emit_collection_events(ceids, callback)
 
-        message = self.secs_decode(packet)
+    def _emit_collection_events(self, ceids, callback=None, transition=None):
+        """Build the reports of collection events and queue them for sending
 
-        # 0  = Accept
-        # 1  = Denied. Insufficient space.
-        # 2  = Denied. Invalid format.
-        # 3  = Denied. At least one RPTID already defined.
-        # 4  = Denied. At least VID does not exist.
-        # >4 = Other errors
-        DRACK = 0
+        :param ceids: List of collection events
+        :type ceids: list of various
+        :param callback: function called with the :class:`secsgem.gem.emitter.CollectionEventEmission` when it was acknowledged or failed
+        :type callback: function
+        :param transition: (svid, limitid, transition type) reported by the limit zone transition event
+        :type transition: tuple
+        :returns: queued collection events
+        :rtype: list of :class:`secsgem.gem.emitter.CollectionEventEmission`
+        """
+        if not isinstance(ceids, list):
+            ceids = [ceids]
 
-        # pre check message for errors
-        for report in message.DATA:
-            if report.RPTID in self._registered_reports and len(report.VID) > 0:
-                DRACK = 3
-            else:
-                for vid in report.VID:
-                    if (vid not in self._data_values) and (vid not in self._status_variables):
-                        DRACK = 4
+        emissions = []
 
-        # pre check okay
-        if DRACK == 0:
-            # no data -> remove all reports and links
-            if not message.DATA:
-                self._registered_collection_events.clear()
-                self._registered_reports.clear()
-            else:
-                for report in message.DATA:
-                    # no vids -> remove this reports and links
-                    if not report.VID:
-                        # remove report from linked collection events
-                        for collection_event in list(self._registered_collection_events):
-                            if report.RPTID in self._registered_collection_events[collection_event].reports:
-                                self._registered_collection_events[collection_event].reports.remove(report.RPTID)
-                                # remove collection event link if no collection events present
-                                if not self._registered_collection_events[collection_event].reports:
-                                    del self._registered_collection_events[collection_event]
-                        # remove report
-                        if report.RPTID in self._registered_reports:
-                            del self._registered_reports[report.RPTID]
-                    else:
-                        # add report
-                        self._registered_reports[report.RPTID] = CollectionEventReport(report.RPTID, report.VID)
+        model = self._event_reports
 
-        return self.stream_function(2, 34)(DRACK)
+        for ceid in ceids:
+            if ceid in model.links:
+                if model.links[ceid].enabled:
+                    emissions.append(CollectionEventEmission(ceid, self._build_collection_event(ceid, model, transition), callback))
 
-    def _on_s02f35(self, handler, packet):
-        """Callback handler for Stream 2, Function 35, Link event report
+        if emissions and self._is_spooled(6, 11) and not self.communicationState.isstate("COMMUNICATING"):
+            for emission in emissions:
+                self._spool_message(self.stream_function(6, 11)({"DATAID": 1, "CEID": emission.ceid, "RPT": emission.reports}))
+                emission._finish(None, "spooled")  # noqa
+        elif emissions:
+            emitter = self._get_collection_event_emitter()
+            for emission in emissions:
+                emitter.emit(emission)
 
-        :param handler: handler the message was received on
-        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
-        :param packet: complete message received
-        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
-        """
-        del handler  # unused parameters
+        return emissions
 
-        message = self.secs_decode(packet)
+    def _get_collection_event_emitter(self):
+        with self._collection_event_emitter_lock:
+            if self._collection_event_emitter is None:
+                self._collection_event_emitter = CollectionEventEmitter(self, self.collectionEventWindow)
 
-        # 0  = Accepted
-        # 1  = Denied. Insufficient space
-        # 2  = Denied. Invalid format
-        # 3  = Denied. At least one CEID link already defined
-        # 4  = Denied. At least one CEID does not exist
-        # 5  = Denied. At least one RPTID does not exist
-        # >5 = Other errors
-        LRACK = 0
+            return self._collection_event_emitter
 
-        # pre check message for errors
-        for event in message.DATA:
-            if event.CEID.get() not in self._collection_events:
-                LRACK = 4
-            for rptid in event.RPTID:
-                if event.CEID.get() in self._registered_collection_events:
-                    ce = self._registered_collection_events[event.CEID.get()]
-                    if rptid.get() in ce.reports:
-                        LRACK = 3
-                if rptid.get() not in self._registered_reports:
-                    LRACK = 5
+    # traces
 
-        # pre check okay
-        if LRACK == 0:
-            for event in message.DATA:
-                # no report ids, remove all links for collection event
-                if not event.RPTID:
-                    if event.CEID.get() in self._registered_collection_events:
-                        del self._registered_collection_events[event.CEID.get()]
-                else:
-                    if event.CEID.get() in self._registered_collection_events:
-                        ce = self._registered_collection_events[event.CEID.get()]
-                        for rptid in event.RPTID.get():
-                            ce.reports.append(rptid)
-                    else:
-                        self._registered_collection_events[event.CEID.get()] = \
-                            CollectionEventLink(self._collection_events[event.CEID.get()], event.RPTID.get())
+    @property
+    def traces(self):
+        """The active traces requested by the host
 
-        return self.stream_function(2, 36)(LRACK)
+        :returns: Trace dictionary
+        :rtype: dict of :class:`secsgem.gem.trace.Trace`
+        """
+        with self._trace_scheduler_lock:
+            if self._trace_scheduler is None:
+                return {}
 
-    def _on_s02f37(self, handler, packet):
-        """Callback handler for Stream 2, Function 37, En-/Disable Event Report
+            return self._trace_scheduler.traces
+
+    def _get_trace_scheduler(self):
+        with self._trace_scheduler_lock:
+            if self._trace_scheduler is None:
+                self._trace_scheduler = TraceScheduler(self)
+
+            return self._trace_scheduler
+
+    def _on_s02f23(self, handler, packet):
+        """Callback handler for Stream 2, Function 23, Trace initialize
 
         :param handler: handler the message was received on
         :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
@@ -846,11 +1455,506 @@ class GemEquipmentHandler(GemHandler):
 
         message = self.secs_decode(packet)
 
-        # 0  = Accepted
-        # 1  = Denied. At least one CEID does not exist
-        ERACK = 0
+        trid = message.TRID.get()
+        total_samples = message.TOTSMP.get()
 
-        if not self._set_ce_state(message.CEED.get(), message.CEID.get()):
+        if total_samples == 0:
+            if self._trace_scheduler is not None:
+                self._trace_scheduler.remove(trid)
+
+            return self.stream_function(2, 24)(TIAACK.ACK)
+
+        period = parse_sample_period(message.DSPER.get())
+        if period is None:
+            return self.stream_function(2, 24)(TIAACK.INVALID_PERIOD)
+
+        group_size = message.REPGSZ.get()
+        if group_size < 1 or group_size > total_samples:
+            return self.stream_function(2, 24)(TIAACK.INVALID_REPGSZ)
+
+        svids = message.SVID.get()
+        for svid in svids:
+            if svid not in self._status_variables:
+                return self.stream_function(2, 24)(TIAACK.SVID_UNKNOWN)
+
+        scheduler = self._get_trace_scheduler()
+
+        traces = scheduler.traces
+        if trid not in traces and len(traces) >= self.maxTraces:
+            return self.stream_function(2, 24)(TIAACK.NO_MORE_TRACES)
+
+        scheduler.add(Trace(trid, svids, period, total_samples, group_size))
+
+        return self.stream_function(2, 24)(TIAACK.ACK)
+
+    # value updates
+
+    @property
+    def value_version(self):
+        """Version of the last change made with :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_values`
+
+        The *version* attribute of a status variable or data value is the value version of its last change.
+
+        :returns: value version
+        :rtype: integer
+        """
+        return self._value_version
+
+    def update_value(self, vid, value):
+        """Set the value of a status variable or data value
+
+        See :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_values`.
+
+        :param vid: ID of the status variable or data value
+        :type vid: various
+        :param value: new value
+        :type value: various or :class:`secsgem.secs.variables.SecsVar`
+        :returns: True if the value changed
+        :rtype: boolean
+        """
+        return bool(self.update_values({vid: value}))
+
+    def update_values(self, values):
+        """Set the values of status variables and data values
+
+        The values are encoded once and reported without calling
+        :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.on_sv_value_request` or
+        :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.on_dv_value_request` for these variables.
+        Values equal to the current value are ignored.
+        Once a value was set with this method, the variable is always reported with the last value set here.
+
+        The changed variables get a new value version,
+        the limits of changed status variables are checked and the event *values_changed* is fired.
+        Afterwards the *change_events* of the changed variables are triggered, every collection event once.
+
+        :param values: new values by status variable or data value id
+        :type values: dict
+        :returns: ids of the changed variables
+        :rtype: list of various
+        """
+        variables = []
+        for vid, value in values.items():
+            if vid in self._status_variables:
+                variable = self._status_variables[vid]
+            elif vid in self._data_values:
+                variable = self._data_values[vid]
+            else:
+                raise ValueError("Unknown variable id {}".format(vid))
+
+            variables.append((vid, variable, value if isinstance(value, SecsVar) else variable.value_type(value)))
+
+        changes = collections.OrderedDict()
+
+        with self._value_version_lock:
+            version = self._value_version + 1
+
+            for vid, variable, encoded in variables:
+                pushed = variable._pushed_value  # noqa
+                if pushed is not None and pushed.get() == encoded.get():
+                    continue
+
+                variable._pushed_value = encoded  # noqa
+                variable.value = encoded.get()
+                variable.version = version
+
+                changes[vid] = variable
+
+            if changes:
+                self._value_version = version
+
+        if not changes:
+            return []
+
+        self.check_limits(dict((vid, variable.value) for vid, variable in changes.items() if vid in self._status_variables))
+
+        self.events.fire("values_changed", {"changes": dict((vid, variable.value) for vid, variable in changes.items()), \
+            "version": version, "handler": self})
+
+        ceids = []
+        for variable in changes.values():
+            for ceid in variable.change_events:
+                if ceid not in ceids:
+                    ceids.append(ceid)
+
+        if ceids:
+            self.trigger_collection_events(ceids)
+
+        return list(changes.keys())
+
+    # limits
+
+    @property
+    def limit_monitors(self):
+        """The limits defined by the host
+
+        :returns: Limit monitors by status variable id
+        :rtype: dict of :class:`secsgem.gem.limits.LimitMonitor`
+        """
+        with self._limit_monitors_lock:
+            return dict(self._limit_monitors)
+
+    def check_limits(self, values):
+        """Check new values of status variables against the limits defined by the host
+
+        Only variables with limits are evaluated, only limits between the previous and the new value are visited.
+        The collection event LimitZoneTransition is triggered for every limit crossed,
+        the data values LimitVariable, EventLimit and TransitionType report the transition.
+        The events are sent with :func:`trigger_collection_events_async`, so the caller, e.g. the trace thread,
+        doesn't wait for the host.
+
+        :param values: new values by status variable id
+        :type values: dict of integer/float or :class:`secsgem.secs.variables.SecsVar`
+        :returns: transitions, tuples of (svid, limitid, transition type)
+        :rtype: list of tuples
+        """
+        transitions = []
+
+        with self._limit_monitors_lock:
+            if not self._limit_monitors:
+                return transitions
+
+            for svid, value in values.items():
+                monitor = self._limit_monitors.get(svid)
+                if monitor is None:
+                    continue
+
+                if isinstance(value, SecsVar):
+                    value = value.get()
+
+                for limitid, transition in monitor.update(value):
+                    transitions.append((svid, limitid, transition))
+
+        for transition in transitions:
+            # the transition is only passed to the reports of this event, not to events built by other threads
+            self._emit_collection_events([CEID_LIMIT_ZONE_TRANSITION], transition=transition)
+
+        return transitions
+
+    def _get_limit_transition_value(self, dv, transition):
+        """Get a data value of the limit zone transition event
+
+        :param dv: The data value requested
+        :type dv: :class:`secsgem.gem.equipmenthandler.DataValue`
+        :param transition: (svid, limitid, transition type) of the event being built, None outside of the event
+        :type transition: tuple
+        :returns: The value encoded in the corresponding type, empty outside of the event
+        :rtype: :class:`secsgem.secs.variables.SecsVar`
+        """
+        if transition is None:
+            return dv.value_type([])
+
+        svid, limitid, transition_type = transition
+
+        if dv.dvid == DVID_LIMIT_VARIABLE:
+            return self._status_variables[svid].id_type(svid)
+        if dv.dvid == DVID_EVENT_LIMIT:
+            return dv.value_type(limitid)
+
+        return dv.value_type(transition_type)
+
+    def _check_limit_definition(self, sv, limits, monitor):
+        """Validate the limits for a status variable received with S2F45
+
+        :param sv: status variable to define the limits for
+        :type sv: :class:`secsgem.gem.equipmenthandler.StatusVariable`
+        :param limits: limits received
+        :type limits: :class:`secsgem.secs.variables.SecsVarArray`
+        :param monitor: current limits of the variable
+        :type monitor: :class:`secsgem.gem.limits.LimitMonitor`
+        :returns: LIMITID and LIMITACK of the first invalid limit, empty list if all limits are valid
+        :rtype: list
+        """
+        limitids = set()
+
+        for limit in limits:
+            limitid = limit.LIMITID.get()
+            upper_db = limit.UPPERDB.get()
+            lower_db = limit.LOWERDB.get()
+
+            if limitid in limitids:
+                return [limitid, LIMITACK.LIMITID_REPEATED]
+            limitids.add(limitid)
+
+            # empty deadbands delete the limit
+            if upper_db == [] and lower_db == []:
+                if monitor is None or limitid not in monitor.limits:
+                    return [limitid, LIMITACK.LIMITID_UNKNOWN]
+                continue
+
+            if isinstance(upper_db, list) or isinstance(lower_db, list):
+                return [limitid, LIMITACK.ILLEGAL_FORMAT]
+            if upper_db > sv.limit_max:
+                return [limitid, LIMITACK.UPPERDB_ABOVE_LIMITMAX]
+            if lower_db < sv.limit_min:
+                return [limitid, LIMITACK.LOWERDB_BELOW_LIMITMIN]
+            if upper_db < lower_db:
+                return [limitid, LIMITACK.UPPERDB_BELOW_LOWERDB]
+
+        return []
+
+    def _on_s02f45(self, handler, packet):
+        """Callback handler for Stream 2, Function 45, Define variable limit attributes
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        errors = []
+        svids = set()
+
+        with self._limit_monitors_lock:
+            # pre check message for errors
+            for variable in message.DATA:
+                svid = variable.VID.get()
+
+                if svid not in self._status_variables:
+                    errors.append({"VID": svid, "LVACK": LVACK.VARIABLE_UNKNOWN, "LIMITACK": []})
+                elif self._status_variables[svid].limit_min is None or self._status_variables[svid].limit_max is None:
+                    errors.append({"VID": svid, "LVACK": LVACK.NO_LIMITS_CAPABILITY, "LIMITACK": []})
+                elif svid in svids:
+                    errors.append({"VID": svid, "LVACK": LVACK.VARIABLE_REPEATED, "LIMITACK": []})
+                else:
+                    limit_error = self._check_limit_definition(self._status_variables[svid], variable.LIMIT, \
+                        self._limit_monitors.get(svid))
+                    if limit_error:
+                        errors.append({"VID": svid, "LVACK": LVACK.LIMIT_VALUE_ERROR, "LIMITACK": limit_error})
+
+                svids.add(svid)
+
+            if errors:
+                return self.stream_function(2, 46)({"VLAACK": VLAACK.LIMIT_DEFINITION_ERROR, "DATA": errors})
+
+            # no variables -> remove all limits
+            if not message.DATA:
+                self._limit_monitors.clear()
+
+            for variable in message.DATA:
+                svid = variable.VID.get()
+                monitor = self._limit_monitors.get(svid)
+
+                # no limits -> remove all limits of the variable
+                if not variable.LIMIT:
+                    self._limit_monitors.pop(svid, None)
+                    continue
+
+                limits = monitor.limits if monitor is not None else {}
+                for limit in variable.LIMIT:
+                    if limit.UPPERDB.get() == []:
+                        del limits[limit.LIMITID.get()]
+                    else:
+                        limits[limit.LIMITID.get()] = VariableLimit(limit.LIMITID.get(), limit.UPPERDB.get(), limit.LOWERDB.get())
+
+                if limits:
+                    self._limit_monitors[svid] = LimitMonitor(list(limits.values()), monitor.value if monitor is not None else None)
+                else:
+                    self._limit_monitors.pop(svid, None)
+
+        return self.stream_function(2, 46)({"VLAACK": VLAACK.ACK, "DATA": []})
+
+    def _on_s02f47(self, handler, packet):
+        """Callback handler for Stream 2, Function 47, Variable limit attribute request
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        svids = message.get()
+        if len(svids) == 0:
+            svids = [svid for svid, sv in self._status_variables.items() if sv.limit_min is not None and sv.limit_max is not None]
+
+        responses = []
+
+        with self._limit_monitors_lock:
+            for svid in svids:
+                sv = self._status_variables.get(svid)
+
+                if sv is None or sv.limit_min is None or sv.limit_max is None:
+                    responses.append({"VID": svid, "ATTRIBUTES": {"UNITS": sv.unit if sv is not None else "", \
+                        "LIMITMIN": [], "LIMITMAX": [], "LIMIT": []}})
+                    continue
+
+                monitor = self._limit_monitors.get(svid)
+                limits = sorted(monitor.limits.values(), key=lambda limit: limit.limitid) if monitor is not None else []
+
+                responses.append({"VID": svid, "ATTRIBUTES": {"UNITS": sv.unit, \
+                    "LIMITMIN": sv.value_type(sv.limit_min), "LIMITMAX": sv.value_type(sv.limit_max), \
+                    "LIMIT": [{"LIMITID": limit.limitid, "UPPERDB": sv.value_type(limit.upper_db), \
+                        "LOWERDB": sv.value_type(limit.lower_db)} for limit in limits]}})
+
+        return self.stream_function(2, 48)(responses)
+
+    def _on_s02f33(self, handler, packet):
+        """Callback handler for Stream 2, Function 33, Define Report
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        # 0  = Accept
+        # 1  = Denied. Insufficient space.
+        # 2  = Denied. Invalid format.
+        # 3  = Denied. At least one RPTID already defined.
+        # 4  = Denied. At least VID does not exist.
+        # >4 = Other errors
+        DRACK = 0
+
+        with self._event_reports_lock:
+            model = self._event_reports
+
+            # pre check message for errors
+            for report in message.DATA:
+                if report.RPTID in model.reports and len(report.VID) > 0:
+                    DRACK = 3
+                else:
+                    for vid in report.VID:
+                        if (vid not in self._data_values) and (vid not in self._status_variables):
+                            DRACK = 4
+
+            # pre check okay
+            if DRACK == 0:
+                # no data -> remove all reports and links
+                if not message.DATA:
+                    self._publish_event_reports(_EventReportModel(model.version + 1))
+                else:
+                    model = model.copy()
+                    changed_ceids = set()
+
+                    for report in message.DATA:
+                        rptid = report.RPTID.get()
+
+                        # no vids -> remove this reports and links
+                        if not report.VID:
+                            # remove report from linked collection events
+                            for collection_event in model.report_collection_events.pop(rptid, ()):
+                                model.change_link(collection_event).reports.remove(rptid)
+                                changed_ceids.add(collection_event)
+                                # remove collection event link if no collection events present
+                                if not model.links[collection_event].reports:
+                                    del model.links[collection_event]
+                                    model.events_enabled.update(collection_event, False)
+                            # remove report
+                            if rptid in model.reports:
+                                # a report can contain a variable more than once
+                                for vid in set(vid.get() for vid in model.reports[rptid].vars):
+                                    rptids = model.variable_reports.get(vid, frozenset()) - frozenset([rptid])
+                                    if rptids:
+                                        model.variable_reports[vid] = rptids
+                                    else:
+                                        model.variable_reports.pop(vid, None)
+                                del model.reports[rptid]
+                        else:
+                            # add report
+                            model.reports[report.RPTID] = CollectionEventReport(report.RPTID, report.VID)
+                            for vid in report.VID:
+                                model.variable_reports[vid.get()] = \
+                                    model.variable_reports.get(vid.get(), frozenset()) | frozenset([rptid])
+
+                    # new reports are not linked yet, only the events of removed reports change
+                    self._publish_event_reports(model, changed_ceids)
+
+        return self.stream_function(2, 34)(DRACK)
+
+    def _on_s02f35(self, handler, packet):
+        """Callback handler for Stream 2, Function 35, Link event report
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        # 0  = Accepted
+        # 1  = Denied. Insufficient space
+        # 2  = Denied. Invalid format
+        # 3  = Denied. At least one CEID link already defined
+        # 4  = Denied. At least one CEID does not exist
+        # 5  = Denied. At least one RPTID does not exist
+        # >5 = Other errors
+        LRACK = 0
+
+        with self._event_reports_lock:
+            model = self._event_reports
+
+            # pre check message for errors
+            for event in message.DATA:
+                ceid = event.CEID.get()
+                if ceid not in self._collection_events:
+                    LRACK = 4
+                for rptid in event.RPTID:
+                    if ceid in model.report_collection_events.get(rptid.get(), ()):
+                        LRACK = 3
+                    if rptid.get() not in model.reports:
+                        LRACK = 5
+
+            # pre check okay
+            if LRACK == 0:
+                model = model.copy()
+                changed_ceids = set()
+
+                for event in message.DATA:
+                    ceid = event.CEID.get()
+                    changed_ceids.add(ceid)
+
+                    # no report ids, remove all links for collection event
+                    if not event.RPTID:
+                        if ceid in model.links:
+                            for rptid in model.links[ceid].reports:
+                                ceids = model.report_collection_events[rptid] - frozenset([ceid])
+                                if ceids:
+                                    model.report_collection_events[rptid] = ceids
+                                else:
+                                    del model.report_collection_events[rptid]
+                            del model.links[ceid]
+                            model.events_enabled.update(ceid, False)
+                    else:
+                        if ceid in model.links:
+                            model.change_link(ceid).reports.extend(event.RPTID.get())
+                        else:
+                            model.links[ceid] = CollectionEventLink(self._collection_events[ceid], event.RPTID.get())
+
+                        for rptid in event.RPTID.get():
+                            model.report_collection_events[rptid] = \
+                                model.report_collection_events.get(rptid, frozenset()) | frozenset([ceid])
+
+                self._publish_event_reports(model, changed_ceids)
+
+        return self.stream_function(2, 36)(LRACK)
+
+    def _on_s02f37(self, handler, packet):
+        """Callback handler for Stream 2, Function 37, En-/Disable Event Report
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        # 0  = Accepted
+        # 1  = Denied. At least one CEID does not exist
+        ERACK = 0
+
+        if not self._set_ce_state(message.CEED.get(), message.CEID.get()):
             ERACK = 1
 
         return self.stream_function(2, 38)(ERACK)
@@ -871,12 +1975,48 @@ class GemEquipmentHandler(GemHandler):
 
         reports = []
 
-        if ceid in self._registered_collection_events:
-            if self._registered_collection_events[ceid].enabled:
-                reports = self._build_collection_event(ceid)
+        model = self._event_reports
+
+        if ceid in model.links:
+            if model.links[ceid].enabled:
+                reports = self._build_collection_event(ceid, model)
 
         return self.stream_function(6, 16)({"DATAID": 1, "CEID": ceid, "RPT": reports})
 
+    def _on_s06f19(self, handler, packet):
+        """Callback handler for Stream 6, Function 19, individual report request
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        rptid = message.get()
+
+        values = []
+
+        report = self._event_reports.reports.get(rptid)
+
+        if report is not None:
+
+            svs = [self._status_variables[var] for var in report.vars if var in self._status_variables]
+            dvs = [self._data_values[var] for var in report.vars if var not in self._status_variables and var in self._data_values]
+
+            sv_values = iter(self._get_sv_values(svs))
+            dv_values = iter(self._get_dv_values(dvs))
+
+            for var in report.vars:
+                if var in self._status_variables:
+                    values.append(next(sv_values))
+                elif var in self._data_values:
+                    values.append(next(dv_values))
+
+        return self.stream_function(6, 20)(values)
+
     def _set_ce_state(self, ceed, ceids):
         """En-/Disable event reports for the supplied ceids (or all, if ceid is an empty list)
 
@@ -888,42 +2028,137 @@ class GemEquipmentHandler(GemHandler):
         :rtype: bool
         """
         result = True
-        if not ceids:
-            for ceid in self._registered_collection_events:
-                self._registered_collection_events[ceid].enabled = ceed
-        else:
+
+        with self._event_reports_lock:
+            model = self._event_reports.copy()
+
+            if not ceids:
+                ceids = list(model.links)
+
             for ceid in ceids:
-                if ceid in self._registered_collection_events:
-                    self._registered_collection_events[ceid].enabled = ceed
+                if ceid in model.links:
+                    model.change_link(ceid).enabled = ceed
+                    model.events_enabled.update(ceid, ceed)
                 else:
                     result = False
 
+            self._event_reports = model
+
         return result
 
-    def _build_collection_event(self, ceid):
+    def _build_collection_event(self, ceid, model=None, transition=None):
         """Build reports for a collection event
 
         :param ceid: collection event to build
         :type ceid: integer
+        :param model: reports and links to use, the current ones if None
+        :type model: :class:`secsgem.gem.equipmenthandler._EventReportModel`
+        :param transition: (svid, limitid, transition type) reported by the limit zone transition event
+        :type transition: tuple
         :returns: collection event data
         :rtype: array
         """
+        if model is None:
+            model = self._event_reports
+
+        plan = model.plans.get(ceid)
+        if plan is None:
+            # the published model isn't changed, the plans of linked events are compiled when they are published
+            plan = self._compile_collection_event_plan(ceid, model)
+
+        values = (self._get_sv_values(plan.status_variables), self._get_dv_values(plan.data_values, transition))
+
+        return [{"RPTID": rptid, "V": [values[source][index] for source, index in positions]} for rptid, positions in plan.reports]
+
+    def _compile_collection_event_plans(self, ceids=None):
+        """Compile the plans for linked collection events
+
+        Call it manually after replacing status variables or data values used in linked reports,
+        :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler._get_variable_collection_events` returns the affected events.
+
+        :param ceids: collection events to compile, None for all linked collection events
+        :type ceids: list of various
+        """
+        with self._event_reports_lock:
+            self._publish_event_reports(self._event_reports.copy(), ceids)
+
+    def _publish_event_reports(self, model, ceids=None):
+        """Compile the plans of changed collection events and replace the current reports and links
+
+        Called with the reports lock held, when the reports or links were changed by the host.
+
+        :param model: the changed reports and links
+        :type model: :class:`secsgem.gem.equipmenthandler._EventReportModel`
+        :param ceids: changed collection events, None for all linked collection events
+        :type ceids: list of various
+        """
+        if ceids is None:
+            model.plans = _PersistentDict()
+            ceids = list(model.links)
+
+        for ceid in ceids:
+            if ceid in model.links:
+                model.plans[ceid] = self._compile_collection_event_plan(ceid, model)
+            else:
+                model.plans.pop(ceid, None)
+
+        self._event_reports = model
+
+    def _get_variable_collection_events(self, vid):
+        """Get the linked collection events with reports containing a variable
+
+        :param vid: ID of the status variable or data value
+        :type vid: various
+        :returns: collection events
+        :rtype: set of various
+        """
+        model = self._event_reports
+        ceids = set()
+
+        for rptid in model.variable_reports.get(vid, ()):
+            ceids.update(model.report_collection_events.get(rptid, ()))
+
+        return ceids
+
+    def _compile_collection_event_plan(self, ceid, model):
+        """Compile the reports of a linked collection event
+
+        :param ceid: collection event to compile
+        :type ceid: integer
+        :param model: reports and links to compile from
+        :type model: :class:`secsgem.gem.equipmenthandler._EventReportModel`
+        :returns: plan for building the reports
+        :rtype: :class:`secsgem.gem.equipmenthandler._CollectionEventPlan`
+        """
+        status_variables = []
+        data_values = []
+        positions = {}
         reports = []
 
-        for rptid in self._registered_collection_events[ceid].reports:
-            report = self._registered_reports[rptid]
-            variables = []
+        for rptid in model.links[ceid].reports:
+            report = model.reports[rptid]
+            report_positions = []
             for var in report.vars:
                 if var in self._status_variables:
-                    v = self._get_sv_value(self._status_variables[var])
-                    variables.append(v)
+                    key = (0, var)
+                    source = status_variables
+                    variable = self._status_variables[var]
                 elif var in self._data_values:
-                    v = self._get_dv_value(self._data_values[var])
-                    variables.append(v)
+                    key = (1, var)
+                    source = data_values
+                    variable = self._data_values[var]
+                else:
+                    continue
+
+                if key not in positions:
+                    positions[key] = len(source)
+                    source.append(variable)
 
-            reports.append({"RPTID": rptid, "V": variables})
+                report_positions.append((key[0], positions[key]))
 
-        return reports
+            reports.append((rptid, report_positions))
+
+        return _CollectionEventPlan(status_variables, data_values, reports)
 
     # equipment constants
 
@@ -931,6 +2166,9 @@ class GemEquipmentHandler(GemHandler):
     def equipment_constants(self):
         """The list of the equipments contstants
 
+        The S2F29 response for all equipment constants is kept until the dictionary is changed.
+        Replace an equipment constant in the dictionary instead of changing its name, limits, default or unit.
+
         :returns: Equipment constant list
         :rtype: list of :class:`secsgem.gem.equipmenthandler.EquipmentConstant`
         """
@@ -1019,8 +2257,7 @@ class GemEquipmentHandler(GemHandler):
         responses = []
 
         if len(message) == 0:
-            for ecid in self._equipment_constants:
-                ec = self._equipment_constants[ecid]
+            for ec in list(self._equipment_constants.values()):
                 responses.append(self._get_ec_value(ec))
         else:
             for ecid in message:
@@ -1078,24 +2315,31 @@ class GemEquipmentHandler(GemHandler):
 
         message = self.secs_decode(packet)
 
+        if len(message) == 0:
+            return self._get_namelist_response(2, 30, self._equipment_constants, self._get_ec_namelist_item)
+
         responses = []
 
-        if len(message) == 0:
-            for ecid in self._equipment_constants:
-                ec = self._equipment_constants[ecid]
-                responses.append({"ECID": ec.ecid, "ECNAME": ec.name, "ECMIN": ec.min_value if ec.min_value is not None else "", \
-                    "ECMAX": ec.max_value if ec.max_value is not None else "", "ECDEF": ec.default_value, "UNITS": ec.unit})
-        else:
-            for ecid in message:
-                if ecid not in self._equipment_constants:
-                    responses.append({"ECID": ecid, "ECNAME": "", "ECMIN": "", "ECMAX": "", "ECDEF": "", "UNITS": ""})
-                else:
-                    ec = self._equipment_constants[ecid]
-                    responses.append({"ECID": ec.ecid, "ECNAME": ec.name, "ECMIN": ec.min_value if ec.min_value is not None else "", \
-                        "ECMAX": ec.max_value if ec.max_value is not None else "", "ECDEF": ec.default_value, "UNITS": ec.unit})
+        for ecid in message:
+            if ecid not in self._equipment_constants:
+                responses.append({"ECID": ecid, "ECNAME": "", "ECMIN": "", "ECMAX": "", "ECDEF": "", "UNITS": ""})
+            else:
+                responses.append(self._get_ec_namelist_item(self._equipment_constants[ecid]))
 
         return self.stream_function(2, 30)(responses)
 
+    @staticmethod
+    def _get_ec_namelist_item(ec):
+        """Get the S2F30 item for an equipment constant
+
+        :param ec: the equipment constant
+        :type ec: :class:`secsgem.gem.equipmenthandler.EquipmentConstant`
+        :returns: the item
+        :rtype: dict
+        """
+        return {"ECID": ec.ecid, "ECNAME": ec.name, "ECMIN": ec.min_value if ec.min_value is not None else "", \
+            "ECMAX": ec.max_value if ec.max_value is not None else "", "ECDEF": ec.default_value, "UNITS": ec.unit}
+
     # alarms
 
     @property
@@ -1115,17 +2359,19 @@ class GemEquipmentHandler(GemHandler):
         """
         if alid not in self.alarms:
             raise ValueError("Unknown alarm id {}".format(alid))
-        
-        if self.alarms[alid].set:
-            return
 
-        if self.alarms[alid].enabled:
-            self.send_and_waitfor_response(self.stream_function(5, 1)({"ALCD": self.alarms[alid].code | ALCD.ALARM_SET , \
-                "ALID": alid, "ALTX": self.alarms[alid].text}))
-        
-        self.alarms[alid].set = True
+        with self._alarm_states_lock:
+            alarm = self.alarms[alid]
+            if alarm.set:
+                return
+
+            alarm.set = True
 
-        self.trigger_collection_events([self.alarms[alid].ce_on])
+        if alarm.enabled:
+            self._send_or_spool(self.stream_function(5, 1)({"ALCD": alarm.code | ALCD.ALARM_SET , \
+                "ALID": alid, "ALTX": alarm.text}))
+
+        self.trigger_collection_events([alarm.ce_on])
 
     def clear_alarm(self, alid):
         """The list of the alarms
@@ -1135,17 +2381,103 @@ class GemEquipmentHandler(GemHandler):
         """
         if alid not in self.alarms:
             raise ValueError("Unknown alarm id {}".format(alid))
-        
-        if not self.alarms[alid].set:
-            return
 
-        if self.alarms[alid].enabled:
-            self.send_and_waitfor_response(self.stream_function(5, 1)({"ALCD": self.alarms[alid].code , "ALID": alid, "ALTX": self.alarms[alid].text}))
+        with self._alarm_states_lock:
+            alarm = self.alarms[alid]
+            if not alarm.set:
+                return
+
+            alarm.set = False
 
-        self.alarms[alid].set = False
+        if alarm.enabled:
+            self._send_or_spool(self.stream_function(5, 1)({"ALCD": alarm.code , "ALID": alid, "ALTX": alarm.text}))
 
-        self.trigger_collection_events([self.alarms[alid].ce_off])
+        self.trigger_collection_events([alarm.ce_off])
         
+    def update_alarms(self, states):
+        """Set and clear multiple alarms without waiting for the host
+
+        The states of all alarms are changed at once, before anything is reported.
+        The S5F1 messages and the collection events are sent from a separate thread,
+        with up to *alarmWindow* unacknowledged messages.
+        A change is reported after the alarm kept its state for *alarmDebounce* seconds
+        and at least *alarmMinInterval* seconds after the last report of the alarm.
+        Changes reverted before they were reported are dropped.
+
+        :param states: new states by alarm id, True to set the alarm, False to clear it
+        :type states: dict
+        :returns: ids of the alarms that changed their state
+        :rtype: list of various
+        """
+        for alid in states:
+            if alid not in self._alarms:
+                raise ValueError("Unknown alarm id {}".format(alid))
+
+        changes = collections.OrderedDict()
+        previous = {}
+
+        with self._alarm_states_lock:
+            for alid, state in states.items():
+                alarm = self._alarms[alid]
+                if alarm.set == bool(state):
+                    continue
+
+                previous[alid] = alarm.set
+                changes[alid] = bool(state)
+
+                alarm.set = bool(state)
+
+            if changes:
+                self._get_alarm_reporter().report(changes, previous)
+
+        return list(changes.keys())
+
+    def set_alarms(self, alids):
+        """Set multiple alarms without waiting for the host
+
+        See :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_alarms`.
+
+        :param alids: Alarm ids
+        :type alids: list of str/int
+        :returns: ids of the alarms that were not set before
+        :rtype: list of various
+        """
+        return self.update_alarms(collections.OrderedDict((alid, True) for alid in alids))
+
+    def clear_alarms(self, alids):
+        """Clear multiple alarms without waiting for the host
+
+        See :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_alarms`.
+
+        :param alids: Alarm ids
+        :type alids: list of str/int
+        :returns: ids of the alarms that were set before
+        :rtype: list of various
+        """
+        return self.update_alarms(collections.OrderedDict((alid, False) for alid in alids))
+
+    @property
+    def alarm_statistics(self):
+        """Counters of the alarms reported with :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.update_alarms`
+
+        See :attr:`secsgem.gem.alarms.AlarmReporter.statistics`.
+
+        :returns: counters by name, empty if no alarms were reported yet
+        :rtype: dict
+        """
+        with self._alarm_reporter_lock:
+            if self._alarm_reporter is None:
+                return {}
+
+            return self._alarm_reporter.statistics
+
+    def _get_alarm_reporter(self):
+        with self._alarm_reporter_lock:
+            if self._alarm_reporter is None:
+                self._alarm_reporter = AlarmReporter(self, self.alarmWindow)
+
+            return self._alarm_reporter
+
     def _on_s05f03(self, handler, packet):
         """Callback handler for Stream 5, Function 3, Alarm en-/disabled
 
@@ -1206,13 +2538,215 @@ class GemEquipmentHandler(GemHandler):
 
         result = []
 
-        for alid in list(self.alarms.keys()):
-            if self.alarms[alid].enabled:
-                result.append({"ALCD": self.alarms[alid].code | (ALCD.ALARM_SET if self.alarms[alid].set else 0), \
-                    "ALID": alid, "ALTX": self.alarms[alid].text})
+        with self._alarm_states_lock:
+            self._sync_alarm_states()
+
+            for alid in self._alarms_enabled.ids():
+                alarm = self._alarms[alid]
+                result.append({"ALCD": alarm.code | (ALCD.ALARM_SET if alid in self._alarms_set else 0), \
+                    "ALID": alid, "ALTX": alarm.text})
 
         return self.stream_function(5, 8)(result)
 
+    # process programs
+
+    def _on_s07f17(self, handler, packet):
+        """Callback handler for Stream 7, Function 17, Delete process program
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        if self.processPrograms is None:
+            return self.stream_function(7, 18)(ACKC7.MODE_UNSUPPORTED)
+
+        # empty list deletes all process programs
+        ppids = message.get() or self.processPrograms.ppids
+
+        if any(ppid not in self.processPrograms for ppid in ppids):
+            return self.stream_function(7, 18)(ACKC7.PPID_NOT_FOUND)
+
+        for ppid in ppids:
+            self.processPrograms.delete(ppid)
+
+        return self.stream_function(7, 18)(ACKC7.ACCEPTED)
+
+    def _on_s07f19(self, handler, packet):
+        """Callback handler for Stream 7, Function 19, Current equipment process program request
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler, packet  # unused parameters
+
+        if self.processPrograms is None:
+            return self.stream_function(7, 20)([])
+
+        return self.stream_function(7, 20)(self.processPrograms.ppids)
+
+    # object services
+
+    @property
+    def object_types(self):
+        """The object types available to the host
+
+        :returns: Object types by name
+        :rtype: dict of :class:`secsgem.gem.objectservices.ObjectType`
+        """
+        return self._object_types
+
+    @staticmethod
+    def _object_services_response(data, errors):
+        """Build the data of a GetAttr or SetAttr response
+
+        :param data: object ids and attribute ids and values
+        :type data: list of tuples
+        :param errors: error codes and texts
+        :type errors: list of tuples
+        :returns: data of the response
+        :rtype: dict
+        """
+        objects = []
+        for objid, attributes in data:
+            # a missing attribute is sent as empty list
+            objects.append({"OBJID": objid, "ATTRIBS": [{"ATTRID": attrid, \
+                "ATTRDATA": value if value is not None else SecsVarArray(ATTRDATA, [])} for attrid, value in attributes]})
+
+        return {
+            "DATA": objects,
+            "ERRORS": {"OBJACK": OBJACK.ERROR if errors else OBJACK.SUCCESSFUL, \
+                "ERROR": [{"ERRCODE": code, "ERRTEXT": text[:120]} for code, text in errors]}
+        }
+
+    def _get_object_type(self, message, errors):
+        """Get the object type addressed by a GetAttr or SetAttr request
+
+        :param message: decoded request
+        :type message: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :param errors: list the error is added to
+        :type errors: list
+        :returns: the object type, None if it isn't available
+        :rtype: :class:`secsgem.gem.objectservices.ObjectType`
+        """
+        # only objects owned by the equipment itself are supported
+        if message.OBJSPEC.get():
+            errors.append((ERRCODE.UNKNOWN_OBJECT, "Unknown object specifier {}".format(message.OBJSPEC.get())))
+            return None
+
+        object_type = self._object_types.get(message.OBJTYPE.get())
+        if object_type is None:
+            errors.append((ERRCODE.UNKNOWN_OBJECT_TYPE, "Unknown object type {}".format(message.OBJTYPE.get())))
+
+        return object_type
+
+    def _on_s14f01(self, handler, packet):
+        """Callback handler for Stream 14, Function 1, GetAttr request
+
+        An empty object id list requests all objects fulfilling the filters.
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        errors = []
+        object_type = self._get_object_type(message, errors)
+        if object_type is None:
+            return self.stream_function(14, 2)(self._object_services_response([], errors))
+
+        objids = message.OBJID.get() or None
+        if objids is not None:
+            for objid in objids:
+                if objid not in object_type:
+                    errors.append((ERRCODE.UNKNOWN_OBJECT_INSTANCE, "Unknown object {}".format(objid)))
+
+        attrids = []
+        for attrid in message.ATTRID.get():
+            if attrid in object_type.attributes:
+                attrids.append(attrid)
+            else:
+                errors.append((ERRCODE.UNKNOWN_ATTRIBUTE, "Unknown attribute {}".format(attrid)))
+
+        filters = [(item.ATTRID.get(), item.ATTRRELN.get(), item.ATTRDATA.get()) for item in message.FILTER]
+
+        try:
+            result = object_type.query(filters, objids)
+        except KeyError as exc:
+            errors.append((ERRCODE.UNKNOWN_ATTRIBUTE, "Unknown filter attribute {}".format(exc.args[0])))
+            result = []
+        except ValueError as exc:
+            errors.append((ERRCODE.UNSUPPORTED_OPTION, str(exc)))
+            result = []
+
+        data = [(objid, list(zip(attrids, values))) for objid, values in object_type.get_attributes(result, attrids)]
+
+        return self.stream_function(14, 2)(self._object_services_response(data, errors))
+
+    def _on_s14f03(self, handler, packet):
+        """Callback handler for Stream 14, Function 3, SetAttr request
+
+        The response contains the changed attributes as read back from the objects.
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        errors = []
+        object_type = self._get_object_type(message, errors)
+        if object_type is None:
+            return self.stream_function(14, 4)(self._object_services_response([], errors))
+
+        data = []
+        for objid in message.OBJID.get():
+            if objid not in object_type:
+                errors.append((ERRCODE.UNKNOWN_OBJECT_INSTANCE, "Unknown object {}".format(objid)))
+                continue
+
+            attrids = []
+            for attrib in message.ATTRIBS:
+                attrid = attrib.ATTRID.get()
+
+                if attrid not in object_type.attributes:
+                    errors.append((ERRCODE.UNKNOWN_ATTRIBUTE, "Unknown attribute {}".format(attrid)))
+                    continue
+
+                if attrid not in object_type.setters:
+                    errors.append((ERRCODE.READ_ONLY_ATTRIBUTE, "Attribute {} is read only".format(attrid)))
+                    continue
+
+                try:
+                    object_type.set_attribute(objid, attrid, attrib.ATTRDATA.get())
+                except ValueError as exc:
+                    errors.append((ERRCODE.INVALID_ATTRIBUTE_VALUE, "Invalid value for attribute {}: {}".format(attrid, exc)))
+                    continue
+                except KeyError:
+                    # removed meanwhile
+                    errors.append((ERRCODE.UNKNOWN_OBJECT_INSTANCE, "Unknown object {}".format(objid)))
+                    break
+
+                attrids.append(attrid)
+
+            for changed_objid, values in object_type.get_attributes([objid], attrids):
+                data.append((changed_objid, list(zip(attrids, values))))
+
+        return self.stream_function(14, 4)(self._object_services_response(data, errors))
+
     # remote commands
 
     @property
@@ -1273,6 +2807,235 @@ class GemEquipmentHandler(GemHandler):
     def _on_rcmd_STOP(self):
         self.logger.warning("remote command STOP not implemented, this is required for GEM compliance")
     
+    # spooling
+
+    def _is_spooled(self, stream, function):
+        """Check if a primary message is put in the spool when the host is not available
+
+        :param stream: stream of the message
+        :type stream: integer
+        :param function: function of the message
+        :type function: integer
+        :returns: message is spooled
+        :rtype: boolean
+        """
+        if self.spool is None or stream not in self.spoolStreams:
+            return False
+
+        return not self.spoolStreams[stream] or function in self.spoolStreams[stream]
+
+    def _spool_message(self, function):
+        """Put a primary message in the spool
+
+        :param function: message to spool
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        """
+        if not self.spool.append(function.stream, function.function, function.encode()):
+            self.logger.warning("spool is full, discarding S%dF%d", function.stream, function.function)
+
+    def _spool_failed_message(self, function):
+        """Put a primary message in the spool if it couldn't be sent because the host is not available
+
+        :param function: message that wasn't sent
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: message was passed to the spool
+        :rtype: boolean
+        """
+        if not self._is_spooled(function.stream, function.function) or self.communicationState.isstate("COMMUNICATING"):
+            return False
+
+        self._spool_message(function)
+        return True
+
+    def _send_or_spool(self, function):
+        """Send a primary message and wait for the response, spool it if the host is not available
+
+        :param function: message to send
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: Packet that was received, None if the message was spooled or sending failed
+        :rtype: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        if self._spool_failed_message(function):
+            return None
+
+        response = self.send_and_waitfor_response(function)
+        if response is None:
+            self._spool_failed_message(function)
+
+        return response
+
+    def _on_s02f43(self, handler, packet):
+        """Callback handler for Stream 2, Function 43, Reset spooling streams and functions
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        streams = {}
+        errors = []
+
+        for stream in message:
+            strid = stream.STRID.get()
+            fcnids = stream.FCNID.get()
+
+            if strid in (1, 9):
+                errors.append({"STRID": strid, "STRACK": STRACK.SPOOLING_NOT_ALLOWED, "FCNID": fcnids})
+            elif strid not in secsStreamsFunctions:
+                errors.append({"STRID": strid, "STRACK": STRACK.STREAM_UNKNOWN, "FCNID": fcnids})
+            elif [fcnid for fcnid in fcnids if fcnid not in secsStreamsFunctions[strid]]:
+                errors.append({"STRID": strid, "STRACK": STRACK.FUNCTION_UNKNOWN, \
+                    "FCNID": [fcnid for fcnid in fcnids if fcnid not in secsStreamsFunctions[strid]]})
+            elif [fcnid for fcnid in fcnids if fcnid % 2 == 0]:
+                errors.append({"STRID": strid, "STRACK": STRACK.SECONDARY_FUNCTION, "FCNID": [fcnid for fcnid in fcnids if fcnid % 2 == 0]})
+            else:
+                streams[strid] = fcnids
+
+        if errors:
+            return self.stream_function(2, 44)({"RSPACK": RSPACK.REJECTED, "DATA": errors})
+
+        self.spoolStreams = streams
+
+        return self.stream_function(2, 44)({"RSPACK": RSPACK.ACK, "DATA": []})
+
+    def _on_s06f23(self, handler, packet):
+        """Callback handler for Stream 6, Function 23, Request spooled data
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        rsdc = self.secs_decode(packet).get()
+
+        with self._spool_transmit_lock:
+            if self.spool is None or len(self.spool) == 0:
+                return self.stream_function(6, 24)(RSDA.DENIED_NO_DATA)
+
+            if self._spool_transmit_thread is not None and self._spool_transmit_thread.is_alive():
+                return self.stream_function(6, 24)(RSDA.DENIED_BUSY)
+
+            if rsdc == RSDC.PURGE:
+                self.spool.purge()
+                return self.stream_function(6, 24)(RSDA.ACK)
+
+            # acknowledge before the spooled messages are sent
+            self.send_response(self.stream_function(6, 24)(RSDA.ACK), packet.header.system)
+
+            self._start_spool_transmit()
+
+        return None
+
+    def transmit_spool(self):
+        """Send the spooled messages to the host without a request from the host
+
+        :returns: True if the transmission was started, False if the spool is empty or already transmitted
+        :rtype: boolean
+        """
+        with self._spool_transmit_lock:
+            if self.spool is None or len(self.spool) == 0:
+                return False
+
+            if self._spool_transmit_thread is not None and self._spool_transmit_thread.is_alive():
+                return False
+
+            self._start_spool_transmit()
+
+        return True
+
+    def _start_spool_transmit(self):
+        self._spool_transmit_thread = threading.Thread(target=self._transmit_spool, name="secsgem_gemEquipmentHandler_transmitSpool")
+        self._spool_transmit_thread.daemon = True  # kill thread automatically on main program termination
+        self._spool_transmit_thread.start()
+
+    def _transmit_spool(self):
+        """Send the spooled messages with up to *spoolTransmitWindow* unacknowledged messages
+
+        A message is removed from the spool when it and all messages before it were answered by the host.
+        Only a reply with the stream of the message and the next function counts as answer.
+        The transmission stops if sending fails, an answer times out or the host replies with another message
+        (e.g. an abort with function 0), the remaining messages stay in the spool.
+        """
+        response_queue = queue.Queue()
+        window = max(1, self.spoolTransmitWindow)
+
+        # system => [position, deadline, answered, stream, function], in the order the messages were sent
+        outstanding = collections.OrderedDict()
+        position = None
+        exhausted = False
+        failed = False
+        sent = 0
+
+        while True:
+            while not failed and not exhausted and len(outstanding) < window:
+                messages = self.spool.read(position, window - len(outstanding))
+                if not messages:
+                    exhausted = True
+
+                for message in messages:
+                    # the stored data is sent as is, without decoding and encoding it again
+                    function = SecsEncodedStreamFunction(self.stream_function(message.stream, message.function), message.data)
+
+                    system_id = self.send_stream_function_async(function, response_queue)
+                    if system_id is None:
+                        failed = True
+                        break
+
+                    outstanding[system_id] = [message.position, time.time() + self.connection.T3, False, \
+                        message.stream, message.function]
+                    position = message.position
+                    sent += 1
+
+            if not outstanding:
+                break
+
+            timeout = max(0, next(iter(outstanding.values()))[1] - time.time())
+
+            try:
+                response = response_queue.get(True, timeout)
+            except queue.Empty:
+                response = None
+
+            rejected = False
+            if isinstance(response, HsmsPacket) and response.header.system in outstanding:
+                entry = outstanding[response.header.system]
+
+                if response.header.stream == entry[3] and response.header.function == entry[4] + 1:
+                    entry[2] = True
+                    self._remove_queue(response.header.system)
+                else:
+                    self.logger.warning("spooled message S%dF%d answered with S%dF%d, stopping transmission", \
+                        entry[3], entry[4], response.header.stream, response.header.function)
+                    rejected = True
+
+            released = None
+            while outstanding and next(iter(outstanding.values()))[2]:
+                released = outstanding.popitem(False)[1][0]
+
+            if released is not None:
+                self.spool.release(released)
+
+            timed_out = outstanding and next(iter(outstanding.values()))[1] <= time.time()
+            if timed_out:
+                self.logger.warning("spooled message not answered by host, stopping transmission")
+
+            if rejected or timed_out:
+                failed = True
+
+                for system_id in outstanding:
+                    self._remove_queue(system_id)
+
+                outstanding.clear()
+
+        self.logger.info("spool transmission %s after %d messages, %d messages left", \
+            "failed" if failed else "finished", sent, len(self.spool))
+
     # helpers
 
     def _get_clock(self):
@@ -1281,13 +3044,26 @@ class GemEquipmentHandler(GemHandler):
         :returns: time code
         :rtype: string
         """
-        now = datetime.now(tzlocal())
+        return self._format_time(time.time())
+
+    def _format_time(self, timestamp):
+        """Returns a timestamp depending on configured time format
+
+        :param timestamp: seconds since the epoch, None for no timestamp
+        :type timestamp: float
+        :returns: time code, empty if no timestamp was passed
+        :rtype: string
+        """
+        if timestamp is None:
+            return ""
+
+        moment = datetime.fromtimestamp(timestamp, tzlocal())
         if self._time_format == 0:
-            return now.strftime("%y%m%d%H%M%S")
+            return moment.strftime("%y%m%d%H%M%S")
         elif self._time_format == 2:
-            return now.isoformat()
+            return moment.isoformat()
         else:
-            return now.strftime("%Y%m%d%H%M%S") + now.strftime("%f")[0:2]
+            return moment.strftime("%Y%m%d%H%M%S") + moment.strftime("%f")[0:2]
 
     def _get_control_state_id(self):
         """The id of the control state for the current control state
@@ -1312,13 +3088,7 @@ class GemEquipmentHandler(GemHandler):
         :returns: collection event
         :rtype: list of various
         """
-        enabled_ceid = []
-
-        for ceid in self._registered_collection_events:
-            if self._registered_collection_events[ceid].enabled:
-                enabled_ceid.append(ceid)
-
-        return enabled_ceid
+        return self._event_reports.events_enabled.ids()
 
     def _get_alarms_enabled(self):
         """List of the enabled alarms
@@ -1326,13 +3096,10 @@ class GemEquipmentHandler(GemHandler):
         :returns: alarms
         :rtype: list of various
         """
-        enabled_alarms = []
+        with self._alarm_states_lock:
+            self._sync_alarm_states()
 
-        for alid in self._alarms:
-            if self._alarms[alid].enabled:
-                enabled_alarms.append(alid)
-
-        return enabled_alarms
+            return self._alarms_enabled.ids()
 
     def _get_alarms_set(self):
         """List of the set alarms
@@ -1340,13 +3107,64 @@ class GemEquipmentHandler(GemHandler):
         :returns: alarms
         :rtype: list of various
         """
-        set_alarms = []
+        with self._alarm_states_lock:
+            self._sync_alarm_states()
+
+            return self._alarms_set.ids()
+
+    def _sync_alarm_states(self):
+        """Read the enabled and set states of all alarms after alarms were added, removed or replaced
+
+        The alarms report later changes of their states to :func:`_on_alarm_state_changed`.
+        Must be called with the alarm states lock held.
+        """
+        # the alarms dictionary can be replaced by a plain dictionary, which is compared by length
+        synced = (id(self._alarms), getattr(self._alarms, "version", len(self._alarms)))
+        if synced == self._alarm_states_synced:
+            return
+
+        self._alarms_enabled.clear()
+        self._alarms_set.clear()
 
-        for alid in self._alarms:
-            if self._alarms[alid].set:
-                set_alarms.append(alid)
+        for alid, alarm in self._alarms.items():
+            alarm._listener = self._on_alarm_state_changed  # noqa
+            self._alarms_enabled.update(alid, alarm.enabled)
+            self._alarms_set.update(alid, alarm.set)
 
-        return set_alarms
+        self._alarm_states_synced = synced
+
+    def _on_alarm_state_changed(self, alarm):
+        """Update the enabled and set alarms after an alarm changed
+
+        :param alarm: the changed alarm
+        :type alarm: :class:`secsgem.gem.equipmenthandler.Alarm`
+        """
+        with self._alarm_states_lock:
+            # removed or replaced alarms are ignored
+            if self._alarms.get(alarm.alid) is not alarm:
+                return
+
+            self._alarms_enabled.update(alarm.alid, alarm.enabled)
+            self._alarms_set.update(alarm.alid, alarm.set)
+
+    def disable(self):
+        """Disables the connection"""
+        GemHandler.disable(self)
+
+        with self._collection_event_emitter_lock:
+            if self._collection_event_emitter is not None:
+                self._collection_event_emitter.stop(False)
+                self._collection_event_emitter = None
+
+        with self._trace_scheduler_lock:
+            if self._trace_scheduler is not None:
+                self._trace_scheduler.stop(False)
+                self._trace_scheduler = None
+
+        with self._alarm_reporter_lock:
+            if self._alarm_reporter is not None:
+                self._alarm_reporter.stop(False)
+                self._alarm_reporter = None
 
     def on_connection_closed(self, connection):
         """Connection was closed"""
@@ -0,0 +1,220 @@
+#####################################################################
+# eventbatches.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Columnar batches of received collection event reports"""
+
+import logging
+import queue
+import threading
+import time
+
+_STOP = object()
+_WAKEUP = object()
+
+
+class CollectionEventBatch(object):
+    """Reports of one collection event and report id, stored by column
+
+    Row *n* of the batch is the report received at ``timestamps[n]``,
+    the value of the data value ``dvids[i]`` in this report is ``columns[i][n]``.
+
+    :param ceid: collection event id
+    :type ceid: various
+    :param rptid: report id
+    :type rptid: various
+    :param dvids: data value ids of the report
+    :type dvids: list
+    """
+
+    def __init__(self, ceid, rptid, dvids):
+        self.ceid = ceid
+        self.rptid = rptid
+        self.dvids = list(dvids)
+
+        self.timestamps = []
+        self.columns = [[] for _ in self.dvids]
+
+        self.created = time.time()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'ceid': self.ceid, 'rptid': self.rptid, 'dvids': self.dvids, \
+            'rows': len(self.timestamps)})
+
+    def __len__(self):
+        """Number of reports in the batch"""
+        return len(self.timestamps)
+
+    def column(self, dvid):
+        """Get the values of a data value
+
+        :param dvid: data value id
+        :type dvid: various
+        :returns: values of all reports in the batch
+        :rtype: list
+        """
+        return self.columns[self.dvids.index(dvid)]
+
+    def append(self, timestamp, values):
+        """Add the values of a report
+
+        :param timestamp: time the report was received
+        :type timestamp: float
+        :param values: values of the report, in the order of the data value ids
+        :type values: list
+        """
+        if len(values) != len(self.columns):
+            raise ValueError("Report {} has {} values, expected {}".format(self.rptid, len(values), len(self.columns)))
+
+        self.timestamps.append(timestamp)
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+
+class CollectionEventBatcher(object):
+    """Collects received reports in batches and passes them to a sink
+
+    A batch contains the reports of one collection event and report id.
+    It is passed to the sink when it has *max_size* reports or its first report is *max_age* seconds old.
+    If the data values of a report change, the batch with the old data values is passed to the sink first.
+
+    The sink is called from a separate thread with one batch at a time,
+    so a slow sink doesn't delay the answers to the equipment.
+
+    :param sink: function called with each complete batch
+    :type sink: def sink(batch)
+    :param max_size: maximum number of reports in a batch
+    :type max_size: integer
+    :param max_age: maximum time in seconds a report waits in a batch
+    :type max_age: float
+    """
+
+    def __init__(self, sink, max_size=1000, max_age=1.0):
+        self.sink = sink
+        self.max_size = max_size
+        self.max_age = max_age
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        # (ceid, rptid) -> batch being filled
+        self._batches = {}
+
+        # complete batches and wakeups
+        self._queue = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="secsgem_collectionEventBatcher")
+        self._thread.daemon = True  # kill thread automatically on main program termination
+        self._thread.start()
+
+    def add(self, ceid, rptid, dvids, values, timestamp=None):
+        """Add a received report
+
+        :param ceid: collection event id
+        :type ceid: various
+        :param rptid: report id
+        :type rptid: various
+        :param dvids: data value ids of the report
+        :type dvids: list
+        :param values: values of the report, in the order of the data value ids
+        :type values: list
+        :param timestamp: time the report was received, now if None
+        :type timestamp: float
+        """
+        if len(values) != len(dvids):
+            raise ValueError("Report {} has {} values, expected {}".format(rptid, len(values), len(dvids)))
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        key = (ceid, rptid)
+
+        with self._lock:
+            batch = self._batches.get(key)
+
+            if batch is not None and batch.dvids != list(dvids):
+                # report was redefined
+                self._queue.put(self._batches.pop(key))
+                batch = None
+
+            if batch is None:
+                batch = CollectionEventBatch(ceid, rptid, dvids)
+                self._batches[key] = batch
+
+                # the thread has to wait for the age of the new batch
+                self._queue.put(_WAKEUP)
+
+            batch.append(timestamp, values)
+
+            if len(batch) >= self.max_size:
+                self._queue.put(self._batches.pop(key))
+
+    def flush(self):
+        """Pass all batches to the sink, also the incomplete ones"""
+        with self._lock:
+            for batch in self._batches.values():
+                self._queue.put(batch)
+
+            self._batches = {}
+
+    def stop(self, wait=True):
+        """Stop the batcher, the batches are passed to the sink before
+
+        :param wait: wait for the thread to finish
+        :type wait: boolean
+        """
+        self.flush()
+        self._queue.put(_STOP)
+
+        if wait:
+            self._thread.join()
+
+    def _pop_expired(self, now):
+        with self._lock:
+            expired = [key for key, batch in self._batches.items() if batch.created + self.max_age <= now]
+
+            return [self._batches.pop(key) for key in expired]
+
+    def _next_deadline(self):
+        with self._lock:
+            if not self._batches:
+                return None
+
+            return min(batch.created for batch in self._batches.values()) + self.max_age
+
+    def _deliver(self, batch):
+        try:
+            self.sink(batch)
+        except Exception:
+            self.logger.exception("collection event batch sink failed")
+
+    def _run(self):
+        while True:
+            for batch in self._pop_expired(time.time()):
+                self._deliver(batch)
+
+            deadline = self._next_deadline()
+            timeout = max(0, deadline - time.time()) if deadline is not None else None
+
+            try:
+                item = self._queue.get(True, timeout)
+            except queue.Empty:
+                continue
+
+            if item is _STOP:
+                break
+
+            if isinstance(item, CollectionEventBatch):
+                self._deliver(item)
@@ -20,6 +20,9 @@ import threading
 
 from ..common.fysom import Fysom
 from ..secs.handler import SecsHandler
+from ..secs.dataitems import ACKC7
+from ..secs.functionbase import SecsEncodedStreamFunction
+from .processprograms import encode_process_program_message, split_process_program_message
 
 class GemHandler(SecsHandler):
     """Baseclass for creating Host/Equipment models. This layer contains GEM functionality. Inherit from this class and override required functions.
@@ -88,6 +91,8 @@ class GemHandler(SecsHandler):
 
         self.waitEventList = []
 
+        self.processPrograms = None
+
     def __repr__(self):
         """Generate textual representation for an object of this class"""
         return "{} {}".format(self.__class__.__name__, str(self._serialize_data()))
@@ -137,8 +142,7 @@ class GemHandler(SecsHandler):
         elif self.communicationState.isstate('WAIT_DELAY'):
             pass
         elif self.communicationState.isstate('COMMUNICATING'):
-            threading.Thread(target=self._handle_stream_function, args=(packet, ), \
-                name="secsgem_gemHandler_callback_S{}F{}".format(packet.header.stream, packet.header.function)).start()
+            self._dispatch_stream_function(packet, "secsgem_gemHandler_callback_S{}F{}".format(packet.header.stream, packet.header.function))
 
     def _on_hsms_select(self):
         """Selected received from hsms layer"""
@@ -256,6 +260,58 @@ class GemHandler(SecsHandler):
         s7f6 = self.secs_decode(self.send_and_waitfor_response(self.stream_function(7, 5)(ppid)))
         return s7f6.PPID.get(), s7f6.PPBODY.get()
 
+    def send_stored_process_program(self, ppid):
+        """Send a process program from the process program store
+
+        The encoded body is sent as it is stored, without decoding it.
+
+        :param ppid: Transferred process programs ID
+        :type ppid: string
+        :returns: acknowledge code, None if the process program isn't stored
+        :rtype: integer
+        """
+        if self.processPrograms is None:
+            raise ValueError("No process program store configured")
+
+        self.logger.info("Send stored process program %s", ppid)
+
+        data = encode_process_program_message(self.processPrograms, ppid)
+        if data is None:
+            return None
+
+        return self.secs_decode(self.send_and_waitfor_response(SecsEncodedStreamFunction(self.stream_function(7, 3), data))).get()
+
+    def fetch_process_program(self, ppid):
+        """Request a process program and put it into the process program store
+
+        The encoded body is stored as it was received, without decoding it.
+
+        :param ppid: Transferred process programs ID
+        :type ppid: string
+        :returns: True if the process program was received and stored
+        :rtype: boolean
+        """
+        if self.processPrograms is None:
+            raise ValueError("No process program store configured")
+
+        self.logger.info("Fetch process program %s", ppid)
+
+        packet = self.send_and_waitfor_response(self.stream_function(7, 5)(ppid))
+        if packet is None or packet.header.stream != 7 or packet.header.function != 6:
+            return False
+
+        received_ppid, body = split_process_program_message(packet.data)
+        if received_ppid is None:
+            return False
+
+        if received_ppid != ppid:
+            self.logger.warning("Requested process program %s, but received %s", ppid, received_ppid)
+            return False
+
+        self.processPrograms.write_encoded(received_ppid, body)
+
+        return True
+
     def waitfor_communicating(self, timeout=None):
         """Wait until connection gets into communicating state. Returns immediately if state is communicating
 
@@ -306,3 +362,49 @@ class GemHandler(SecsHandler):
             return self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(), "MDLN": []})
         else:
             return self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(), "MDLN": [self.MDLN, self.SOFTREV]})
+
+    def _on_s07f03(self, handler, packet):
+        """Callback handler for Stream 7, Function 3, Process program send
+
+        The process program is written to the process program store without decoding the body.
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        if self.processPrograms is None:
+            return self.stream_function(7, 4)(ACKC7.MODE_UNSUPPORTED)
+
+        ppid, body = split_process_program_message(packet.data)
+        if ppid is None:
+            return self.stream_function(7, 4)(ACKC7.LENGTH_ERROR)
+
+        self.processPrograms.write_encoded(ppid, body)
+
+        self.events.fire("process_program_received", {"ppid": ppid, "handler": self.connection, 'peer': self})
+
+        return self.stream_function(7, 4)(ACKC7.ACCEPTED)
+
+    def _on_s07f05(self, handler, packet):
+        """Callback handler for Stream 7, Function 5, Process program request
+
+        The process program is sent from the process program store without decoding the body.
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        data = None
+        if self.processPrograms is not None:
+            data = encode_process_program_message(self.processPrograms, message.get())
+
+        # empty list if the process program is not available
+        return SecsEncodedStreamFunction(self.stream_function(7, 6), data if data is not None else b"\x01\x00")
@@ -15,7 +15,10 @@
 #####################################################################
 """Handler for GEM host."""
 
-from ..secs.dataitems import ALED, ACKC5, ACKC10
+import threading
+import time
+
+from ..secs.dataitems import ALED, ACKC5, ACKC10, DRACK, LRACK, ERACK
 from .handler import GemHandler
 from collections import OrderedDict
 
@@ -44,12 +47,149 @@ class GemHostHandler(GemHandler):
 
         self.reportSubscriptions = {}
 
+        # desired equipment state, restored after the connection was reestablished
+        self.collectionEventLinks = OrderedDict()
+        self.enabledCollectionEvents = []
+        self.alarmEnableStates = OrderedDict()
+
+        self.restoreStateOnCommunicating = True
+
+        # receives the reports instead of the collection_event_received event if set
+        self.collectionEventBatcher = None
+
+    def _serialize_data(self):
+        """Returns data for serialization
+
+        :returns: data to serialize for this object
+        :rtype: dict
+        """
+        data = GemHandler._serialize_data(self)
+        data.update({'reportSubscriptions': self.reportSubscriptions, 'collectionEventLinks': self.collectionEventLinks, \
+            'enabledCollectionEvents': self.enabledCollectionEvents, 'alarmEnableStates': self.alarmEnableStates})
+        return data
+
+    def _on_state_communicating(self, data):
+        """Connection state model changed to state COMMUNICATING
+
+        :param data: event attributes
+        :type data: object
+        """
+        GemHandler._on_state_communicating(self, data)
+
+        if not self.restoreStateOnCommunicating:
+            return
+
+        if not self.reportSubscriptions and not self.enabledCollectionEvents and not self.alarmEnableStates:
+            return
+
+        # the state change is handled on the receiving thread, so the messages need to be sent from a separate one
+        thread = threading.Thread(target=self._restore_state_thread, name="secsgem_gemHostHandler_restoreState")
+        thread.daemon = True  # kill thread automatically on main program termination
+        thread.start()
+
+    def _restore_state_thread(self):
+        try:
+            failed = self.restore_state()
+        except Exception:
+            self.logger.exception("Restoring equipment state failed")
+            return
+
+        self.events.fire("state_restored", {"failed": failed, "handler": self.connection, 'peer': self})
+
+    def restore_state(self):
+        """Restore the subscribed reports, links, enabled collection events and alarm states on the equipment
+
+        Called automatically after the connection was (re)established if *restoreStateOnCommunicating* is set.
+        All reports are defined with one S2F33. If the equipment rejects it, because it kept (parts of) the configuration,
+        all known reports are deleted with one S2F33, which also removes their links, and defined again.
+        The reports are then linked with one S2F35 and the collection events enabled with one S2F37.
+        Only if one of these messages is rejected, its items are sent one by one to find the failing ones.
+        The enabled alarms are compared with the S5F7 list, so only changed alarms are sent with S5F3.
+
+        The reports, links and enabled collection events are always sent again, not only the differences.
+        SECS-II has no message to read them back from the equipment, so the host can't know which of them were kept.
+        Deleting and defining all reports after a rejected S2F33 takes two messages,
+        finding the kept reports one by one would take one message per report.
+
+        :returns: failed collection events (ceid => tuple of stream/function and acknowledge code) and alarms (alid => ACKC5)
+        :rtype: dict with keys "collection_events" and "alarms"
+        """
+        self.logger.info("Restoring equipment state")
+
+        failed = {"collection_events": {}, "alarms": {}}
+
+        reports = list(self.reportSubscriptions.items())
+        build_reports = lambda items: {"DATAID": 0, "DATA": [{"RPTID": report_id, "VID": dvs} for report_id, dvs in items]}
+
+        # define all reports, succeeds if the equipment lost its configuration
+        if not reports or self._send_subscription_message(33, build_reports(reports)) == DRACK.ACK:
+            report_failures = {}
+        else:
+            # delete all known reports, this also removes their links.
+            # the equipment may not know some of them, so the acknowledge code is ignored
+            self._send_subscription_message(33, build_reports([(report_id, []) for report_id, _ in reports]))
+
+            report_failures = self._send_subscription_step(33, reports, DRACK.ACK, build_reports)
+
+        defined_report_ids = set(report_id for report_id, _ in reports if report_id not in report_failures)
+
+        for ceid, report_ids in self.collectionEventLinks.items():
+            for report_id in report_ids:
+                if report_id in report_failures:
+                    failed["collection_events"][ceid] = ("S2F33", report_failures[report_id])
+
+        # link the defined reports
+        links = []
+        for ceid, report_ids in self.collectionEventLinks.items():
+            linked_report_ids = [report_id for report_id in report_ids if report_id in defined_report_ids]
+            if linked_report_ids and ceid not in failed["collection_events"]:
+                links.append((ceid, linked_report_ids))
+
+        link_failures = self._send_subscription_step(
+            35, links, LRACK.ACK,
+            lambda items: {"DATAID": 0, "DATA": [{"CEID": ceid, "RPTID": report_ids} for ceid, report_ids in items]})
+
+        for ceid in link_failures:
+            failed["collection_events"][ceid] = ("S2F35", link_failures[ceid])
+
+        # enable collection events
+        enable_failures = self._send_subscription_step(
+            37, [(ceid, None) for ceid in self.enabledCollectionEvents if ceid not in failed["collection_events"]], ERACK.ACCEPTED,
+            lambda items: {"CEED": True, "CEID": [ceid for ceid, _ in items]})
+
+        for ceid in enable_failures:
+            failed["collection_events"][ceid] = ("S2F37", enable_failures[ceid])
+
+        # set the alarms with a different state
+        if self.alarmEnableStates:
+            response = self.send_and_waitfor_response(self.stream_function(5, 7)())
+            if response is not None:
+                enabled_alarms = set(alarm["ALID"] for alarm in self.secs_decode(response).get())
+            else:
+                enabled_alarms = None
+
+            for alid, enabled in self.alarmEnableStates.items():
+                if enabled_alarms is not None and (alid in enabled_alarms) == enabled:
+                    continue
+
+                response = self.send_and_waitfor_response(self.stream_function(5, 3)({"ALED": ALED.ENABLE if enabled else ALED.DISABLE, "ALID": alid}))
+                ack = self.secs_decode(response).get() if response is not None else None
+                if ack != ACKC5.ACCEPTED:
+                    failed["alarms"][alid] = ack
+
+        if failed["collection_events"] or failed["alarms"]:
+            self.logger.warning("Restoring equipment state failed for %s", failed)
+
+        return failed
+
     def clear_collection_events(self):
         """Clear all collection events"""
         self.logger.info("Clearing collection events")
 
         # clear subscribed reports
         self.reportSubscriptions = {}
+        self.collectionEventLinks = OrderedDict()
+        self.enabledCollectionEvents = []
 
         # disable all ceids
         self.disable_ceids()
@@ -85,6 +225,130 @@ class GemHostHandler(GemHandler):
         # enable collection event
         self.send_and_waitfor_response(self.stream_function(2, 37)({"CEED": True, "CEID": [ceid]}))
 
+        self._add_desired_subscription(ceid, [report_id])
+
+    def _add_desired_subscription(self, ceid, report_ids):
+        self.collectionEventLinks.setdefault(ceid, [])
+        self.collectionEventLinks[ceid].extend(report_ids)
+
+        if ceid not in self.enabledCollectionEvents:
+            self.enabledCollectionEvents.append(ceid)
+
+    def subscribe_collection_events(self, subscriptions):
+        """Subscribe to multiple collection events
+
+        All report definitions are sent in one S2F33, all links in one S2F35 and all enables in one S2F37.
+        If the equipment rejects one of these messages, its items are sent again one by one to find the failing ones.
+        The reports of collection events that failed to link or enable are deleted again.
+
+        :param subscriptions: collection events to subscribe, tuples of (ceid, dvs) or (ceid, dvs, report_id)
+        :type subscriptions: list of tuples
+        :returns: failed collection events with the failing stream/function and its acknowledge code
+        :rtype: dict, ceid => tuple (string, integer)
+        """
+        self.logger.info("Subscribing to %d collection events", len(subscriptions))
+
+        failed = {}
+        reports = []
+        links = OrderedDict()
+
+        for subscription in subscriptions:
+            ceid, dvs = subscription[0], subscription[1]
+            report_id = subscription[2] if len(subscription) > 2 else None
+
+            if report_id is None:
+                report_id = self.reportIDCounter
+                self.reportIDCounter += 1
+
+            reports.append((report_id, dvs, ceid))
+            links.setdefault(ceid, []).append(report_id)
+
+        # create reports
+        report_failures = self._send_subscription_step(
+            33, [(report_id, dvs) for report_id, dvs, _ in reports], DRACK.ACK,
+            lambda items: {"DATAID": 0, "DATA": [{"RPTID": report_id, "VID": dvs} for report_id, dvs in items]})
+
+        for report_id, dvs, ceid in reports:
+            if report_id in report_failures:
+                failed[ceid] = ("S2F33", report_failures[report_id])
+            else:
+                # note subscribed reports
+                self.reportSubscriptions[report_id] = dvs
+
+        # link event reports to collection events
+        link_failures = self._send_subscription_step(
+            35, [(ceid, report_ids) for ceid, report_ids in links.items() if ceid not in failed], LRACK.ACK,
+            lambda items: {"DATAID": 0, "DATA": [{"CEID": ceid, "RPTID": report_ids} for ceid, report_ids in items]})
+
+        for ceid in link_failures:
+            failed[ceid] = ("S2F35", link_failures[ceid])
+
+        # enable collection events
+        enable_failures = self._send_subscription_step(
+            37, [(ceid, None) for ceid in links if ceid not in failed], ERACK.ACCEPTED,
+            lambda items: {"CEED": True, "CEID": [ceid for ceid, _ in items]})
+
+        for ceid in enable_failures:
+            failed[ceid] = ("S2F37", enable_failures[ceid])
+
+        # delete the reports defined for collection events that failed later, this also removes their links
+        orphaned_report_ids = [report_id for report_id, _, ceid in reports \
+            if ceid in failed and failed[ceid][0] != "S2F33" and report_id in self.reportSubscriptions]
+        if orphaned_report_ids:
+            self._send_subscription_message(33, {"DATAID": 0, "DATA": [{"RPTID": report_id, "VID": []} for report_id in orphaned_report_ids]})
+
+            for report_id in orphaned_report_ids:
+                del self.reportSubscriptions[report_id]
+
+        for ceid, report_ids in links.items():
+            if ceid not in failed:
+                self._add_desired_subscription(ceid, report_ids)
+
+        if failed:
+            self.logger.warning("Subscribing to collection events %s failed", list(failed.keys()))
+
+        return failed
+
+    def _send_subscription_step(self, function, items, accepted, build):
+        """Send all items in one stream 2 message, retry them separately if the message was rejected
+
+        :param function: function of stream 2 to send
+        :type function: integer
+        :param items: tuples of item key and data
+        :type items: list of tuples
+        :param accepted: acknowledge code for accepted messages
+        :type accepted: integer
+        :param build: function creating the message data for a list of items
+        :type build: function
+        :returns: acknowledge codes of the failed items, None if the message wasn't answered
+        :rtype: dict, key => integer
+        """
+        if not items:
+            return {}
+
+        ack = self._send_subscription_message(function, build(items))
+        if ack == accepted:
+            return {}
+
+        # no answer (timeout or disconnect), retrying the items separately won't help
+        if ack is None or len(items) == 1:
+            return dict((item[0], ack) for item in items)
+
+        failed = {}
+        for item in items:
+            ack = self._send_subscription_message(function, build([item]))
+            if ack != accepted:
+                failed[item[0]] = ack
+
+        return failed
+
+    def _send_subscription_message(self, function, data):
+        response = self.send_and_waitfor_response(self.stream_function(2, function)(data))
+        if response is None:
+            return None
+
+        return self.secs_decode(response).get()
+
     def send_remote_command(self, rcmd, params):
         """Send a remote command
 
@@ -147,6 +411,8 @@ class GemHostHandler(GemHandler):
         """
         self.logger.info("Enable alarm %d", alid)
 
+        self.alarmEnableStates[alid] = True
+
         return self.secs_decode(self.send_and_waitfor_response(self.stream_function(5, 3)({"ALED": ALED.ENABLE, "ALID": alid}))).get()
 
     def disable_alarm(self, alid):
@@ -157,6 +423,8 @@ class GemHostHandler(GemHandler):
         """
         self.logger.info("Disable alarm %d", alid)
 
+        self.alarmEnableStates[alid] = False
+
         return self.secs_decode(self.send_and_waitfor_response(self.stream_function(5, 3)({"ALED": ALED.DISABLE, "ALID": alid}))).get()
 
     def list_alarms(self, alids=None):
@@ -200,7 +468,10 @@ class GemHostHandler(GemHandler):
         return self.stream_function(5, 2)(result)
         
     def _on_s06f11(self, handler, packet):
-        """Callback handler for Stream 6, Function 11, Establish Communication Request
+        """Callback handler for Stream 6, Function 11, Event Report Send
+
+        The reports are passed to *collectionEventBatcher* if it is set,
+        otherwise the event *collection_event_received* is fired for every report.
 
         :param handler: handler the message was received on
         :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
@@ -211,6 +482,17 @@ class GemHostHandler(GemHandler):
 
         message = self.secs_decode(packet)
 
+        batcher = self.collectionEventBatcher
+        if batcher is not None:
+            ceid = message.CEID.get()
+            timestamp = time.time()
+
+            for report in message.RPT:
+                rptid = report.RPTID.get()
+                batcher.add(ceid, rptid, self.reportSubscriptions[rptid], report.V.get(), timestamp)
+
+            return self.stream_function(6, 12)(0)
+
         for report in message.RPT:
             report_dvs = self.reportSubscriptions[report.RPTID.get()]
             report_values = report.V.get()
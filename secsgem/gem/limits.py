@@ -0,0 +1,144 @@
+#####################################################################
+# limits.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Limits monitoring of variables"""
+
+import bisect
+
+ZONE_LOWER = 0
+ZONE_UPPER = 1
+
+TRANSITION_LOWER_TO_UPPER = 0
+TRANSITION_UPPER_TO_LOWER = 1
+
+
+class VariableLimit(object):
+    """Limit of a variable defined by the host
+
+    The variable enters the upper zone of the limit when its value rises above *upper_db*
+    and the lower zone when its value drops below *lower_db*.
+
+    :param limitid: ID of the limit
+    :type limitid: integer
+    :param upper_db: upper deadband
+    :type upper_db: integer/float
+    :param lower_db: lower deadband
+    :type lower_db: integer/float
+    """
+
+    def __init__(self, limitid, upper_db, lower_db):
+        self.limitid = limitid
+        self.upper_db = upper_db
+        self.lower_db = lower_db
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'limitid': self.limitid, 'upper_db': self.upper_db, 'lower_db': self.lower_db})
+
+
+class LimitMonitor(object):
+    """Zones of the limits of a variable
+
+    The deadbands are kept in sorted lists, an update only visits the limits whose deadband
+    lies between the previous and the new value.
+    An unchanged value is not evaluated.
+
+    The zones are initialized with the first value without reporting transitions,
+    a value inside the deadband of a limit starts in the lower zone.
+
+    :param limits: limits of the variable
+    :type limits: list of :class:`secsgem.gem.limits.VariableLimit`
+    :param value: last known value of the variable, None if not known yet
+    :type value: integer/float
+    """
+
+    def __init__(self, limits, value=None):
+        self._limits = dict((limit.limitid, limit) for limit in limits)
+
+        upper = sorted((limit.upper_db, limit.limitid) for limit in limits)
+        lower = sorted((limit.lower_db, limit.limitid) for limit in limits)
+
+        self._upper_values = [deadband for deadband, _ in upper]
+        self._upper_ids = [limitid for _, limitid in upper]
+        self._lower_values = [deadband for deadband, _ in lower]
+        self._lower_ids = [limitid for _, limitid in lower]
+
+        self._zones = {}
+        self.value = None
+
+        if value is not None:
+            self.update(value)
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'limits': list(self._limits.values()), 'value': self.value})
+
+    @property
+    def limits(self):
+        """Limits of the variable
+
+        :returns: limits by limit id
+        :rtype: dict of :class:`secsgem.gem.limits.VariableLimit`
+        """
+        return dict(self._limits)
+
+    def zone(self, limitid):
+        """Get the zone of the variable for a limit
+
+        :param limitid: ID of the limit
+        :type limitid: integer
+        :returns: ZONE_LOWER or ZONE_UPPER, None if no value was checked yet
+        :rtype: integer
+        """
+        return self._zones.get(limitid)
+
+    def update(self, value):
+        """Check a new value of the variable
+
+        :param value: new value
+        :type value: integer/float
+        :returns: transitions in the order they were crossed, tuples of (limitid, transition type)
+        :rtype: list of tuples
+        """
+        old_value = self.value
+        self.value = value
+
+        if old_value is None:
+            for limit in self._limits.values():
+                self._zones[limit.limitid] = ZONE_UPPER if value > limit.upper_db else ZONE_LOWER
+            return []
+
+        transitions = []
+
+        if value > old_value:
+            # upper deadbands passed on the way up: old_value <= upper_db < value
+            start = bisect.bisect_left(self._upper_values, old_value)
+            end = bisect.bisect_left(self._upper_values, value)
+
+            for limitid in self._upper_ids[start:end]:
+                if self._zones[limitid] == ZONE_LOWER:
+                    self._zones[limitid] = ZONE_UPPER
+                    transitions.append((limitid, TRANSITION_LOWER_TO_UPPER))
+        elif value < old_value:
+            # lower deadbands passed on the way down: value < lower_db <= old_value
+            start = bisect.bisect_right(self._lower_values, value)
+            end = bisect.bisect_right(self._lower_values, old_value)
+
+            for limitid in reversed(self._lower_ids[start:end]):
+                if self._zones[limitid] == ZONE_UPPER:
+                    self._zones[limitid] = ZONE_LOWER
+                    transitions.append((limitid, TRANSITION_UPPER_TO_LOWER))
+
+        return transitions
@@ -0,0 +1,322 @@
+#####################################################################
+# objectservices.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Objects queried and changed by the host with the object services (stream 14)"""
+
+import itertools
+import operator
+import threading
+
+from ..secs.dataitems import ATTRRELN
+
+_RELATIONS = {
+    ATTRRELN.EQUAL: operator.eq,
+    ATTRRELN.NOT_EQUAL: operator.ne,
+    ATTRRELN.LESS: operator.lt,
+    ATTRRELN.LESS_EQUAL: operator.le,
+    ATTRRELN.MORE: operator.gt,
+    ATTRRELN.MORE_EQUAL: operator.ge,
+}
+
+
+def _key(value):
+    # lists can't be hashed, they are indexed as tuples
+    if isinstance(value, list):
+        return tuple(_key(item) for item in value)
+
+    return value
+
+
+def _matches(value, relation, qualifier):
+    """Check if an attribute value fulfills a filter
+
+    :param value: value of the attribute, None if not present
+    :type value: various
+    :param relation: relation of the attribute value to the qualifier
+    :type relation: :class:`secsgem.secs.dataitems.ATTRRELN`
+    :param qualifier: value the attribute value is compared to
+    :type qualifier: various
+    :returns: True if the filter is fulfilled
+    :rtype: boolean
+    """
+    if relation == ATTRRELN.PRESENT:
+        return value is not None
+    if relation == ATTRRELN.ABSENT:
+        return value is None
+
+    try:
+        return _RELATIONS[relation](value, qualifier)
+    except TypeError:
+        # values of different types can't be ordered
+        return False
+
+
+class ObjectType(object):
+    """Type of objects, that are available to the host with the object services
+
+    The attributes of the objects are read with getters,
+    a getter is either a function taking the object or the name of a python attribute of the object.
+    Attributes with a setter can be changed by the host, setters are functions taking the object and the new value
+    or names of python attributes.
+    A setter can raise ValueError to reject the value.
+
+    The values of the *indexed* attributes are kept in secondary indexes.
+    Queries with filters on these attributes only look at the objects in the index,
+    comparisons other than equality check every distinct value in the index, but not every object.
+    Filters on other attributes are only checked for the objects remaining after the indexed filters.
+    The indexes are updated when objects are added or removed, or when :func:`update` is called after an object changed.
+
+    :param name: object type (OBJTYPE)
+    :type name: string
+    :param attributes: getters by attribute id
+    :type attributes: dict
+    :param setters: setters by attribute id
+    :type setters: dict
+    :param indexed: attribute ids kept in secondary indexes
+    :type indexed: list
+    """
+
+    def __init__(self, name, attributes, setters=None, indexed=None):
+        self.name = name
+        self.attributes = attributes
+        self.setters = setters if setters is not None else {}
+        self.indexed = list(indexed) if indexed is not None else []
+
+        for attrid in self.indexed:
+            if attrid not in attributes:
+                raise ValueError("Indexed attribute {} of object type {} has no getter".format(attrid, name))
+
+        self._lock = threading.RLock()
+        self._counter = itertools.count()
+
+        # objid -> (sequence number, object)
+        self._objects = {}
+
+        # attrid -> value -> set of objids
+        self._indexes = dict((attrid, {}) for attrid in self.indexed)
+        # objid -> attrid -> indexed value
+        self._indexed_values = {}
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'name': self.name, 'attributes': list(self.attributes), \
+            'indexed': self.indexed, 'count': len(self._objects)})
+
+    def __len__(self):
+        """Number of objects of this type"""
+        return len(self._objects)
+
+    def __contains__(self, objid):
+        """Check if an object with the id exists"""
+        return objid in self._objects
+
+    @property
+    def objids(self):
+        """Ids of the objects in the order they were added
+
+        :returns: object ids
+        :rtype: list
+        """
+        with self._lock:
+            return self._ordered(self._objects)
+
+    def get(self, objid):
+        """Get an object
+
+        :param objid: object id
+        :type objid: various
+        :returns: the object, None if it doesn't exist
+        :rtype: various
+        """
+        item = self._objects.get(objid)
+
+        return item[1] if item is not None else None
+
+    def add(self, objid, obj):
+        """Add an object, replaces an object with the same id
+
+        :param objid: object id
+        :type objid: various
+        :param obj: the object
+        :type obj: various
+        """
+        with self._lock:
+            if objid in self._objects:
+                self._unindex(objid)
+                self._objects[objid] = (self._objects[objid][0], obj)
+            else:
+                self._objects[objid] = (next(self._counter), obj)
+
+            self._index(objid, obj)
+
+    def remove(self, objid):
+        """Remove an object
+
+        :param objid: object id
+        :type objid: various
+        :returns: True if the object existed
+        :rtype: boolean
+        """
+        with self._lock:
+            if objid not in self._objects:
+                return False
+
+            self._unindex(objid)
+            del self._objects[objid]
+
+        return True
+
+    def update(self, objid):
+        """Read the indexed attributes of a changed object again
+
+        :param objid: object id
+        :type objid: various
+        """
+        with self._lock:
+            if objid not in self._objects:
+                raise KeyError(objid)
+
+            self._unindex(objid)
+            self._index(objid, self._objects[objid][1])
+
+    def _index(self, objid, obj):
+        values = {}
+        for attrid in self.indexed:
+            value = _key(self.get_attribute(obj, attrid))
+
+            values[attrid] = value
+            self._indexes[attrid].setdefault(value, set()).add(objid)
+
+        self._indexed_values[objid] = values
+
+    def _unindex(self, objid):
+        for attrid, value in self._indexed_values.pop(objid, {}).items():
+            objids = self._indexes[attrid][value]
+
+            objids.discard(objid)
+            if not objids:
+                del self._indexes[attrid][value]
+
+    def _ordered(self, objids):
+        return sorted(objids, key=lambda objid: self._objects[objid][0])
+
+    def get_attribute(self, obj, attrid):
+        """Read an attribute of an object
+
+        :param obj: the object
+        :type obj: various
+        :param attrid: attribute id
+        :type attrid: various
+        :returns: value of the attribute
+        :rtype: various
+        """
+        getter = self.attributes[attrid]
+
+        if callable(getter):
+            return getter(obj)
+
+        return getattr(obj, getter, None)
+
+    def get_attributes(self, objids, attrids):
+        """Read attributes of several objects
+
+        :param objids: object ids
+        :type objids: list
+        :param attrids: attribute ids
+        :type attrids: list
+        :returns: object id and attribute values of each existing object
+        :rtype: list of tuples
+        """
+        with self._lock:
+            return [(objid, [self.get_attribute(self._objects[objid][1], attrid) for attrid in attrids]) \
+                for objid in objids if objid in self._objects]
+
+    def set_attribute(self, objid, attrid, value):
+        """Change an attribute of an object
+
+        The indexes of the object are updated afterwards.
+
+        :param objid: object id
+        :type objid: various
+        :param attrid: attribute id
+        :type attrid: various
+        :param value: new value
+        :type value: various
+        """
+        setter = self.setters[attrid]
+
+        with self._lock:
+            obj = self._objects[objid][1]
+
+            if callable(setter):
+                setter(obj, value)
+            else:
+                setattr(obj, setter, value)
+
+            if attrid in self._indexes:
+                self._unindex(objid)
+                self._index(objid, obj)
+
+    def query(self, filters=None, objids=None):
+        """Find the objects fulfilling all filters
+
+        :param filters: attribute id, relation (:class:`secsgem.secs.dataitems.ATTRRELN`) and value of each filter
+        :type filters: list of tuples
+        :param objids: only check these objects, all objects if None
+        :type objids: list
+        :returns: ids of the matching objects, in the order they were added or of *objids*
+        :rtype: list
+        """
+        filters = filters or []
+
+        for attrid, relation, _ in filters:
+            if attrid not in self.attributes:
+                raise KeyError(attrid)
+            if relation not in _RELATIONS and relation not in (ATTRRELN.PRESENT, ATTRRELN.ABSENT):
+                raise ValueError("Unsupported attribute relation {}".format(relation))
+
+        with self._lock:
+            candidates = None
+            remaining = []
+
+            for attrid, relation, qualifier in filters:
+                index = self._indexes.get(attrid)
+                if index is None:
+                    remaining.append((attrid, relation, qualifier))
+                    continue
+
+                if relation == ATTRRELN.EQUAL:
+                    matching = index.get(_key(qualifier), set())
+                else:
+                    matching = set()
+                    for value, value_objids in index.items():
+                        if _matches(value, relation, _key(qualifier)):
+                            matching |= value_objids
+
+                candidates = set(matching) if candidates is None else candidates & matching
+
+            if objids is not None:
+                result = [objid for objid in objids if objid in self._objects and \
+                    (candidates is None or objid in candidates)]
+            elif candidates is None:
+                result = self._ordered(self._objects)
+            else:
+                result = self._ordered(candidates)
+
+            if not remaining:
+                return result
+
+            return [objid for objid in result if all(_matches(self.get_attribute(self._objects[objid][1], attrid), \
+                relation, qualifier) for attrid, relation, qualifier in remaining)]
@@ -0,0 +1,329 @@
+#####################################################################
+# processprograms.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Disk backed store for process programs"""
+
+import binascii
+import collections
+import io
+import mmap
+import os
+import tempfile
+import threading
+
+from ..secs.variables import SecsVar, SecsVarList
+from ..secs.dataitems import PPID, PPBODY
+
+_FILE_SUFFIX = ".ppbody"
+
+_BODY_FORMAT_CODES = frozenset(item_type.formatCode for item_type in PPBODY.__allowedtypes__)
+
+# os.replace is not available in python 2
+_replace = getattr(os, "replace", os.rename)
+
+
+def _check_body(data, start=0):
+    """Check that the data from start to the end is a single PPBODY item
+
+    :returns: size of the item
+    :rtype: integer
+    """
+    text_pos, format_code, length = SecsVar().decode_item_header(data, start)
+
+    if format_code not in _BODY_FORMAT_CODES:
+        raise ValueError("Process program body has invalid format {}".format(format_code))
+
+    if text_pos + length != len(data):
+        raise ValueError("Process program body has length {}, expected {}".format(len(data) - text_pos, length))
+
+    return len(data) - start
+
+
+def split_process_program_message(data):
+    """Split the data of a S7F3 or S7F6 message into the process program id and the encoded body
+
+    The body isn't decoded, it is returned as view into the data, so it can be written to a file without copying it.
+
+    :param data: encoded data of the message
+    :type data: bytes
+    :returns: process program id and encoded PPBODY item, (None, None) if the list is empty
+    :rtype: tuple
+    """
+    text_pos, format_code, length = SecsVar().decode_item_header(data, 0)
+
+    if format_code != SecsVarList.formatCode or length not in (0, 2):
+        raise ValueError("Process program message has invalid format")
+
+    if length == 0:
+        return None, None
+
+    ppid = PPID()
+    text_pos = ppid.decode(data, text_pos)
+
+    _check_body(data, text_pos)
+
+    return ppid.get(), memoryview(data)[text_pos:]
+
+
+def encode_process_program_message(store, ppid):
+    """Encode the data of a S7F3 or S7F6 message for a stored process program
+
+    :param store: store containing the process program
+    :type store: :class:`secsgem.gem.processprograms.ProcessProgramStore`
+    :param ppid: process program id
+    :type ppid: string/bytes
+    :returns: encoded data of the message, None if the process program isn't stored
+    :rtype: bytes
+    """
+    # list with two items, followed by the process program id
+    return store.read_encoded(ppid, b"\x01\x02" + PPID(ppid).encode())
+
+
+class ProcessProgramStore(object):
+    """Process programs stored as files in a directory
+
+    Every process program is kept in a file containing its encoded PPBODY item,
+    so it is sent and received without decoding the body.
+    The ids and sizes are indexed when the store is opened, listing the process programs doesn't touch the files.
+
+    Reading maps the file into memory.
+    Recently used process programs up to *cache_size* bytes are kept in memory,
+    a single process program is cached if it is not larger than a quarter of the cache.
+
+    :param directory: directory for the process program files, created if missing
+    :type directory: string
+    :param cache_size: maximum size of the cached process programs in bytes
+    :type cache_size: integer
+    """
+
+    def __init__(self, directory, cache_size=16 * 1024 * 1024):
+        self.directory = directory
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+
+        # ppid -> size of the encoded body
+        self._index = collections.OrderedDict()
+
+        # ppid -> encoded body, least recently used first
+        self._cache = collections.OrderedDict()
+        self._cached_bytes = 0
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._load()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'directory': self.directory, 'count': len(self._index), \
+            'cached': len(self._cache)})
+
+    def __len__(self):
+        """Number of process programs in the store"""
+        return len(self._index)
+
+    def __contains__(self, ppid):
+        """Check if a process program is in the store"""
+        return ppid in self._index
+
+    @property
+    def ppids(self):
+        """Ids of the stored process programs
+
+        :returns: process program ids
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._index)
+
+    @staticmethod
+    def _file_name(ppid):
+        if isinstance(ppid, (bytes, bytearray)):
+            return "B" + binascii.hexlify(ppid).decode("ascii") + _FILE_SUFFIX
+
+        return "A" + binascii.hexlify(ppid.encode("utf-8")).decode("ascii") + _FILE_SUFFIX
+
+    @staticmethod
+    def _ppid_from_file_name(file_name):
+        ppid = binascii.unhexlify(file_name[1:-len(_FILE_SUFFIX)].encode("ascii"))
+
+        if file_name[0] == "B":
+            return ppid
+
+        return ppid.decode("utf-8")
+
+    def _path(self, ppid):
+        return os.path.join(self.directory, self._file_name(ppid))
+
+    def _load(self):
+        for file_name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, file_name)
+
+            # left over from an interrupted write
+            if file_name.endswith(".tmp"):
+                os.remove(path)
+                continue
+
+            if not file_name.endswith(_FILE_SUFFIX) or file_name[0] not in "AB":
+                continue
+
+            try:
+                ppid = self._ppid_from_file_name(file_name)
+            except (ValueError, TypeError, UnicodeDecodeError):
+                continue
+
+            self._index[ppid] = os.path.getsize(path)
+
+    def size(self, ppid):
+        """Get the size of the encoded process program body
+
+        :param ppid: process program id
+        :type ppid: string/bytes
+        :returns: size in bytes, None if the process program isn't stored
+        :rtype: integer
+        """
+        return self._index.get(ppid)
+
+    def read(self, ppid):
+        """Read a process program body
+
+        :param ppid: process program id
+        :type ppid: string/bytes
+        :returns: the body, None if the process program isn't stored
+        :rtype: :class:`secsgem.secs.dataitems.PPBODY`
+        """
+        data = self.read_encoded(ppid)
+        if data is None:
+            return None
+
+        body = PPBODY()
+        body.decode(data)
+
+        return body
+
+    def read_encoded(self, ppid, prefix=b""):
+        """Read an encoded process program body
+
+        The result is built with a single copy from the cache or the mapped file.
+
+        :param ppid: process program id
+        :type ppid: string/bytes
+        :param prefix: encoded data placed before the body
+        :type prefix: bytes
+        :returns: prefix and encoded PPBODY item, None if the process program isn't stored
+        :rtype: bytes
+        """
+        with self._lock:
+            size = self._index.get(ppid)
+            if size is None:
+                return None
+
+            # moved to the end as most recently used
+            body = self._cache.pop(ppid, None)
+            if body is not None:
+                self._cache[ppid] = body
+                return prefix + body
+
+        try:
+            with io.open(self._path(ppid), "rb") as body_file:
+                body_map = mmap.mmap(body_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            # deleted meanwhile
+            return None
+
+        try:
+            if size > self.cache_size // 4:
+                return b"".join((prefix, body_map))
+
+            body = body_map[:]
+        finally:
+            body_map.close()
+
+        self._add_to_cache(ppid, body)
+
+        return prefix + body
+
+    def _add_to_cache(self, ppid, body):
+        with self._lock:
+            if ppid not in self._index or ppid in self._cache:
+                return
+
+            self._cache[ppid] = body
+            self._cached_bytes += len(body)
+
+            while self._cached_bytes > self.cache_size:
+                _, removed = self._cache.popitem(last=False)
+                self._cached_bytes -= len(removed)
+
+    def _remove_from_cache(self, ppid):
+        body = self._cache.pop(ppid, None)
+        if body is not None:
+            self._cached_bytes -= len(body)
+
+    def write(self, ppid, ppbody):
+        """Store a process program, replaces a process program with the same id
+
+        :param ppid: process program id
+        :type ppid: string/bytes
+        :param ppbody: the body
+        :type ppbody: :class:`secsgem.secs.variables.SecsVar` or value supported by PPBODY
+        """
+        self.write_encoded(ppid, PPBODY(ppbody).encode())
+
+    def write_encoded(self, ppid, data):
+        """Store an encoded process program body, replaces a process program with the same id
+
+        The data is written to a temporary file that replaces the file of the process program when complete.
+
+        :param ppid: process program id
+        :type ppid: string/bytes
+        :param data: encoded PPBODY item
+        :type data: bytes/memoryview
+        """
+        size = _check_body(data)
+
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with io.open(handle, "wb") as body_file:
+                body_file.write(data)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        with self._lock:
+            _replace(temp_path, self._path(ppid))
+
+            self._index[ppid] = size
+            self._remove_from_cache(ppid)
+
+    def delete(self, ppid):
+        """Delete a process program
+
+        :param ppid: process program id
+        :type ppid: string/bytes
+        :returns: True if the process program was stored
+        :rtype: boolean
+        """
+        with self._lock:
+            if ppid not in self._index:
+                return False
+
+            del self._index[ppid]
+            self._remove_from_cache(ppid)
+
+            os.remove(self._path(ppid))
+
+        return True
@@ -0,0 +1,288 @@
+#####################################################################
+# sharedvariables.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Memory mapped table of variable values shared with other processes"""
+
+import io
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from past.builtins import long, unicode
+
+from ..secs.variables import SecsVarNumber, SecsVarBoolean, SecsVarText, SecsVarBinary
+
+# file header: magic, version, reserved, slot count, layout checksum
+_TABLE_HEADER = struct.Struct("<4sHHII")
+_TABLE_MAGIC = b"SGVT"
+_TABLE_VERSION = 1
+
+# slot header: sequence counter, length of the data
+_SLOT_HEADER = struct.Struct("<II")
+
+# reads of a slot while it is written, before giving up
+_MAX_READ_RETRIES = 100000
+
+_KIND_NUMBER = 0
+_KIND_TEXT = 1
+_KIND_BINARY = 2
+
+
+def _encode_checksum_id(vid):
+    """Encode a variable id for the layout checksum, the same way in python 2 and 3
+
+    :param vid: id of the variable
+    :type vid: integer or string
+    :returns: type tag followed by the decimal number or the UTF-8 text
+    :rtype: bytes
+    """
+    if isinstance(vid, bool):
+        raise TypeError("Id {!r} not supported for shared variables".format(vid))
+
+    if isinstance(vid, (int, long)):
+        return b"i" + str(vid).encode("ascii")
+
+    if isinstance(vid, unicode):
+        return b"s" + vid.encode("utf-8")
+
+    if isinstance(vid, bytes):
+        return b"s" + vid
+
+    raise TypeError("Id {!r} not supported for shared variables".format(vid))
+
+
+def shared_variable_layout(variables, capacities=None):
+    """Generate the table layout for status variables or data values
+
+    :param variables: variables to put in the table
+    :type variables: list of :class:`secsgem.gem.equipmenthandler.StatusVariable` or :class:`secsgem.gem.equipmenthandler.DataValue`
+    :param capacities: capacity in bytes for text and binary variables
+    :type capacities: dict, id => integer
+    :returns: layout for :class:`secsgem.gem.sharedvariables.SharedVariableTable`
+    :rtype: list of tuples
+    """
+    if capacities is None:
+        capacities = {}
+
+    layout = []
+    for variable in variables:
+        vid = variable.svid if hasattr(variable, "svid") else variable.dvid
+        if vid in capacities:
+            layout.append((vid, variable.value_type, capacities[vid]))
+        else:
+            layout.append((vid, variable.value_type))
+
+    return layout
+
+
+class _SharedVariableSlot(object):
+    def __init__(self, vid, value_type, kind, value_struct, capacity, offset):
+        self.vid = vid
+        self.value_type = value_type
+        self.kind = kind
+        self.value_struct = value_struct
+        self.capacity = capacity
+        self.offset = offset
+
+
+class SharedVariableTable(object):
+    """Fixed layout table of variable values in a memory mapped file
+
+    The table is written by a control process and read by the
+    :class:`secsgem.gem.equipmenthandler.GemEquipmentHandler` without callbacks or locks.
+    Both sides have to create the table with the same layout, a different layout is rejected when opening the file.
+
+    The file starts with a 16 byte header (magic "SGVT", version, reserved, slot count, layout checksum),
+    followed by one slot per variable in the order of the layout.
+    The layout checksum is the CRC32 of the entries "<id>:<type text code>:<capacity>" joined with ",".
+    The id is written as "i" followed by the decimal number or "s" followed by the UTF-8 text,
+    so python 2 and python 3 processes calculate the same checksum.
+    Every slot starts with a sequence counter and the data length (both 32 bit little endian),
+    followed by the value with the capacity of the slot, padded to 8 bytes.
+    Numbers are stored little endian in the format of the value type, text and binary values with up to *capacity* bytes.
+
+    The sequence counter is odd while a value is written.
+    Readers retry until they read the same even counter before and after the value, so only one writer per table is supported.
+
+    :param path: file name of the table
+    :type path: string
+    :param layout: variables in the table, tuples of (id, value_type) or (id, value_type, capacity)
+    :type layout: list of tuples
+    :param create: create (or reset) the file instead of opening an existing table
+    :type create: boolean
+    :param default_capacity: capacity in bytes for text and binary values without explicit capacity
+    :type default_capacity: integer
+
+    **Example**::
+
+        layout = [(10, secsgem.SecsVarF4), ("SV2", secsgem.SecsVarString, 32)]
+        table = secsgem.SharedVariableTable("/dev/shm/equipment", layout)
+
+        self.status_variables.update({
+            10: secsgem.StatusVariable(10, "temperature", "degC", secsgem.SecsVarF4, False, shared_table=table),
+            "SV2": secsgem.StatusVariable("SV2", "recipe", "", secsgem.SecsVarString, False, shared_table=table),
+        })
+    """
+
+    def __init__(self, path, layout, create=False, default_capacity=64):
+        self.path = path
+
+        self._slots = {}
+        self._order = []
+
+        offset = _TABLE_HEADER.size
+        checksum_data = []
+
+        for entry in layout:
+            vid, value_type = entry[0], entry[1]
+            capacity = entry[2] if len(entry) > 2 else None
+
+            if vid in self._slots:
+                raise ValueError("Variable {} is defined twice".format(vid))
+
+            if issubclass(value_type, SecsVarNumber):
+                kind = _KIND_NUMBER
+                value_struct = struct.Struct("<" + value_type._structCode)  # noqa
+                capacity = value_struct.size
+            elif issubclass(value_type, SecsVarBoolean):
+                kind = _KIND_NUMBER
+                value_struct = struct.Struct("<?")
+                capacity = value_struct.size
+            elif issubclass(value_type, (SecsVarText, SecsVarBinary)):
+                kind = _KIND_TEXT if issubclass(value_type, SecsVarText) else _KIND_BINARY
+                value_struct = None
+                capacity = capacity if capacity is not None else default_capacity
+            else:
+                raise TypeError("Type {} not supported for shared variables".format(value_type.__name__))
+
+            slot = _SharedVariableSlot(vid, value_type, kind, value_struct, capacity, offset)
+            self._slots[vid] = slot
+            self._order.append(slot)
+
+            # the ids are part of the checksum, so a table with swapped variables of the same type is rejected
+            checksum_data.append(b":".join([_encode_checksum_id(vid), value_type.textCode.encode("ascii"), str(capacity).encode("ascii")]))
+            offset += (_SLOT_HEADER.size + capacity + 7) // 8 * 8
+
+        self.size = offset
+        self.checksum = zlib.crc32(b",".join(checksum_data)) & 0xffffffff
+
+        if create:
+            with io.open(path, "wb") as table_file:
+                table_file.write(_TABLE_HEADER.pack(_TABLE_MAGIC, _TABLE_VERSION, 0, len(self._order), self.checksum))
+                table_file.write(b"\0" * (self.size - _TABLE_HEADER.size))
+        elif os.path.getsize(path) != self.size:
+            raise ValueError("Shared variable table {} has size {}, expected {}".format(path, os.path.getsize(path), self.size))
+
+        with io.open(path, "r+b") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), self.size)
+
+        magic, version, _, count, checksum = _TABLE_HEADER.unpack_from(self._map, 0)
+        if magic != _TABLE_MAGIC or version != _TABLE_VERSION or count != len(self._order) or checksum != self.checksum:
+            self._map.close()
+            raise ValueError("Shared variable table {} has a different layout".format(path))
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'path': self.path, 'variables': [slot.vid for slot in self._order]})
+
+    def __contains__(self, vid):
+        """Check if a variable is in the table"""
+        return vid in self._slots
+
+    def offset(self, vid):
+        """Get the offset of the slot of a variable in the file
+
+        :param vid: id of the variable
+        :type vid: various
+        :returns: offset of the slot header
+        :rtype: integer
+        """
+        return self._slots[vid].offset
+
+    def read(self, vid):
+        """Read the current value of a variable
+
+        :param vid: id of the variable
+        :type vid: various
+        :returns: value of the variable
+        :rtype: various
+        """
+        slot = self._slots[vid]
+        data = self._map
+
+        for _ in range(_MAX_READ_RETRIES):
+            sequence, length = _SLOT_HEADER.unpack_from(data, slot.offset)
+            if sequence & 1:
+                # let the writer finish instead of spinning
+                time.sleep(0)
+                continue
+
+            position = slot.offset + _SLOT_HEADER.size
+            if slot.kind == _KIND_NUMBER:
+                value = slot.value_struct.unpack_from(data, position)[0]
+            else:
+                value = data[position:position + min(length, slot.capacity)]
+
+            if _SLOT_HEADER.unpack_from(data, slot.offset)[0] == sequence:
+                break
+
+            time.sleep(0)
+        else:
+            raise IOError("Variable {} is being written".format(vid))
+
+        if slot.kind == _KIND_TEXT:
+            return value.decode("utf-8")
+
+        return value
+
+    def get(self, vid):
+        """Read the current value of a variable encoded in its type
+
+        :param vid: id of the variable
+        :type vid: various
+        :returns: value encoded in the value type of the layout
+        :rtype: :class:`secsgem.secs.variables.SecsVar`
+        """
+        return self._slots[vid].value_type(self.read(vid))
+
+    def write(self, vid, value):
+        """Write the value of a variable
+
+        :param vid: id of the variable
+        :type vid: various
+        :param value: new value
+        :type value: various
+        """
+        slot = self._slots[vid]
+
+        if slot.kind == _KIND_NUMBER:
+            encoded = slot.value_struct.pack(value)
+        else:
+            encoded = value.encode("utf-8") if slot.kind == _KIND_TEXT and not isinstance(value, bytes) else bytes(value)
+            if len(encoded) > slot.capacity:
+                raise ValueError("Value for variable {} longer than {} bytes".format(vid, slot.capacity))
+
+        sequence = _SLOT_HEADER.unpack_from(self._map, slot.offset)[0]
+        position = slot.offset + _SLOT_HEADER.size
+
+        _SLOT_HEADER.pack_into(self._map, slot.offset, (sequence + 1) & 0xffffffff, len(encoded))
+        self._map[position:position + len(encoded)] = encoded
+        _SLOT_HEADER.pack_into(self._map, slot.offset, (sequence + 2) & 0xffffffff, len(encoded))
+
+    def close(self):
+        """Close the memory map"""
+        self._map.close()
@@ -0,0 +1,370 @@
+#####################################################################
+# spool.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Disk backed spool for primary messages"""
+
+import io
+import mmap
+import os
+import struct
+import threading
+import time
+
+# segment header: magic, version, reserved, offset of the first unsent message
+_SEGMENT_HEADER = struct.Struct("<4sHHI")
+_SEGMENT_MAGIC = b"SGSP"
+_SEGMENT_VERSION = 1
+
+# message header: length of the data, stream, function
+_MESSAGE_HEADER = struct.Struct("<IBB")
+
+_SEGMENT_FILE_FORMAT = "{:010d}.spool"
+
+
+class SpooledMessage(object):
+    """Message read from the spool
+
+    :param stream: stream of the message
+    :type stream: integer
+    :param function: function of the message
+    :type function: integer
+    :param data: encoded data of the message
+    :type data: bytes
+    :param position: position after the message, used to release it from the spool
+    :type position: tuple
+    """
+
+    def __init__(self, stream, function, data, position):
+        self.stream = stream
+        self.function = function
+        self.data = data
+        self.position = position
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'stream': self.stream, 'function': self.function, 'length': len(self.data)})
+
+
+class _SpoolSegment(object):
+    def __init__(self, sequence, path, size):
+        self.sequence = sequence
+        self.path = path
+        self.size = size
+
+        self.read_offset = _SEGMENT_HEADER.size
+        self.write_offset = _SEGMENT_HEADER.size
+        self.count = 0
+
+        self.map = None
+
+    def open(self, create=False):
+        if self.map is not None:
+            return self.map
+
+        if create:
+            with io.open(self.path, "wb") as segment_file:
+                segment_file.write(_SEGMENT_HEADER.pack(_SEGMENT_MAGIC, _SEGMENT_VERSION, 0, self.read_offset))
+                segment_file.truncate(self.size)
+
+        with io.open(self.path, "r+b") as segment_file:
+            self.map = mmap.mmap(segment_file.fileno(), self.size)
+
+        return self.map
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def remove(self):
+        self.close()
+        os.remove(self.path)
+
+    def messages(self, offset):
+        """Iterate the (offset, stream, function, length) of the messages in the segment starting at offset"""
+        data = self.open()
+
+        while offset + _MESSAGE_HEADER.size <= self.size:
+            length, stream, function = _MESSAGE_HEADER.unpack_from(data, offset)
+            if length == 0 and stream == 0:
+                break
+
+            yield offset, stream, function, length
+            offset += _MESSAGE_HEADER.size + length
+
+
+class Spool(object):
+    """Spool for primary messages that could not be sent to the host
+
+    The messages are appended to a log of memory mapped segment files in *directory*.
+    Only the segment written to and the segment read from are mapped,
+    so the memory usage does not grow with the number of spooled messages.
+    The spool is kept on disk and reopened with the remaining messages after a restart.
+
+    Every segment file starts with a 12 byte header (magic "SGSP", version, reserved, offset of the first unsent message),
+    followed by the messages.
+    A message starts with the length of the data (32 bit little endian), the stream and the function (8 bit each),
+    followed by the encoded data of the message.
+    The header of a message is written after its data, a zero header marks the end of the segment.
+
+    When *max_size* is reached, the oldest segment is discarded if *overwrite* is set, otherwise new messages are discarded.
+
+    :param directory: directory for the segment files, created if it doesn't exist
+    :type directory: string
+    :param max_size: maximum size of all segment files in bytes
+    :type max_size: integer
+    :param segment_size: size of a segment file in bytes
+    :type segment_size: integer
+    :param overwrite: discard the oldest messages if the spool is full
+    :type overwrite: boolean
+
+    **Example**::
+
+        handler.spool = secsgem.Spool("/var/spool/equipment", max_size=256 * 1024 * 1024)
+        handler.spoolStreams = {5: [1], 6: [11]}
+    """
+
+    def __init__(self, directory, max_size=64 * 1024 * 1024, segment_size=1024 * 1024, overwrite=False):
+        if segment_size <= _SEGMENT_HEADER.size + _MESSAGE_HEADER.size:
+            raise ValueError("Segment size {} too small".format(segment_size))
+
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max(2, max_size // segment_size)
+        self.overwrite = overwrite
+
+        self.count_total = 0
+        self.start_time = None
+        self.full_time = None
+
+        self._lock = threading.Lock()
+        self._segments = []
+        self._count = 0
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._load()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'directory': self.directory, 'count': self._count, 'segments': len(self._segments)})
+
+    def __len__(self):
+        """Number of messages in the spool"""
+        return self._count
+
+    @property
+    def count_actual(self):
+        """Number of messages in the spool"""
+        return self._count
+
+    @property
+    def full(self):
+        """The spool reached its maximum size"""
+        return self.full_time is not None
+
+    @property
+    def size(self):
+        """Size of the segment files in bytes"""
+        return len(self._segments) * self.segment_size
+
+    def _load(self):
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(".spool"):
+                continue
+
+            path = os.path.join(self.directory, file_name)
+            if os.path.getsize(path) != self.segment_size:
+                raise ValueError("Spool segment {} has size {}, expected {}".format(path, os.path.getsize(path), self.segment_size))
+
+            segment = _SpoolSegment(int(file_name[:-6]), path, self.segment_size)
+            magic, version, _, read_offset = _SEGMENT_HEADER.unpack_from(segment.open(), 0)
+            if magic != _SEGMENT_MAGIC or version != _SEGMENT_VERSION:
+                segment.close()
+                raise ValueError("Spool segment {} has an unknown format".format(path))
+
+            segment.read_offset = read_offset
+            segment.write_offset = read_offset
+            for offset, _, _, length in segment.messages(read_offset):
+                segment.write_offset = offset + _MESSAGE_HEADER.size + length
+                segment.count += 1
+
+            segment.close()
+
+            if segment.count == 0:
+                os.remove(path)
+                continue
+
+            self._segments.append(segment)
+            self._count += segment.count
+
+        if self._count:
+            self.count_total = self._count
+            self.start_time = time.time()
+
+    def _add_segment(self):
+        sequence = self._segments[-1].sequence + 1 if self._segments else 0
+
+        segment = _SpoolSegment(sequence, os.path.join(self.directory, _SEGMENT_FILE_FORMAT.format(sequence)), self.segment_size)
+        segment.open(True)
+
+        if self._segments:
+            self._segments[-1].close()
+
+        self._segments.append(segment)
+
+        return segment
+
+    def _remove_segment(self, segment):
+        self._segments.remove(segment)
+        self._count -= segment.count
+        segment.remove()
+
+    def append(self, stream, function, data):
+        """Add a message to the spool
+
+        :param stream: stream of the message
+        :type stream: integer
+        :param function: function of the message
+        :type function: integer
+        :param data: encoded data of the message
+        :type data: bytes
+        :returns: True if the message was spooled, False if it was discarded because the spool is full
+        :rtype: boolean
+        """
+        length = _MESSAGE_HEADER.size + len(data)
+        if length > self.segment_size - _SEGMENT_HEADER.size:
+            raise ValueError("Message with {} bytes doesn't fit into a spool segment".format(len(data)))
+
+        with self._lock:
+            if self._count == 0:
+                self.count_total = 0
+                self.start_time = time.time()
+                self.full_time = None
+
+            segment = self._segments[-1] if self._segments else None
+
+            if segment is None or segment.write_offset + length > self.segment_size:
+                if len(self._segments) >= self.max_segments:
+                    if self.full_time is None:
+                        self.full_time = time.time()
+
+                    if not self.overwrite:
+                        return False
+
+                    self._remove_segment(self._segments[0])
+
+                segment = self._add_segment()
+
+            segment_map = segment.open()
+            offset = segment.write_offset
+
+            segment_map[offset + _MESSAGE_HEADER.size:offset + length] = data
+            _MESSAGE_HEADER.pack_into(segment_map, offset, len(data), stream, function)
+
+            segment.write_offset += length
+            segment.count += 1
+
+            self._count += 1
+            self.count_total += 1
+
+            return True
+
+    def read(self, position=None, count=100):
+        """Read messages from the spool without removing them
+
+        :param position: position of the last message already read, None to start with the first message
+        :type position: tuple
+        :param count: maximum number of messages
+        :type count: integer
+        :returns: messages following *position*
+        :rtype: list of :class:`secsgem.gem.spool.SpooledMessage`
+        """
+        messages = []
+
+        with self._lock:
+            for segment in list(self._segments):
+                if position is not None and segment.sequence < position[0]:
+                    continue
+
+                if position is not None and segment.sequence == position[0]:
+                    offset = max(position[1], segment.read_offset)
+                else:
+                    offset = segment.read_offset
+
+                segment_map = segment.open()
+                for offset, stream, function, length in segment.messages(offset):
+                    start = offset + _MESSAGE_HEADER.size
+                    messages.append(SpooledMessage(stream, function, segment_map[start:start + length], (segment.sequence, start + length)))
+
+                    if len(messages) >= count:
+                        break
+
+                if segment is not self._segments[-1]:
+                    segment.close()
+
+                if len(messages) >= count:
+                    break
+
+        return messages
+
+    def release(self, position):
+        """Remove the messages up to a position from the spool
+
+        :param position: position of the last message to remove
+        :type position: tuple
+        """
+        with self._lock:
+            for segment in list(self._segments):
+                if segment.sequence < position[0]:
+                    self._remove_segment(segment)
+                    continue
+
+                if segment.sequence == position[0] and position[1] > segment.read_offset:
+                    released = sum(1 for offset, _, _, _ in segment.messages(segment.read_offset) if offset < position[1])
+
+                    segment.read_offset = position[1]
+                    segment.count -= released
+                    self._count -= released
+
+                    if segment.count == 0 and segment is not self._segments[-1]:
+                        self._remove_segment(segment)
+                    else:
+                        _SEGMENT_HEADER.pack_into(segment.open(), 0, _SEGMENT_MAGIC, _SEGMENT_VERSION, 0, segment.read_offset)
+
+                break
+
+            if self._count == 0:
+                self._clear()
+
+    def purge(self):
+        """Remove all messages from the spool"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        for segment in self._segments:
+            segment.remove()
+
+        self._segments = []
+        self._count = 0
+        self.full_time = None
+
+    def close(self):
+        """Close the memory maps of the segment files"""
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
@@ -0,0 +1,266 @@
+#####################################################################
+# trace.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Trace data collection"""
+
+import collections
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from ..hsms.packets import HsmsPacket
+
+_STOP = object()
+_WAKEUP = object()
+
+
+def parse_sample_period(dsper):
+    """Convert a data sample period to seconds
+
+    :param dsper: period in the format hhmmss or hhmmsscc
+    :type dsper: string
+    :returns: period in seconds, None if the period is invalid
+    :rtype: float
+    """
+    if len(dsper) not in (6, 8) or not dsper.isdigit():
+        return None
+
+    hours, minutes, seconds = int(dsper[0:2]), int(dsper[2:4]), int(dsper[4:6])
+    hundredths = int(dsper[6:8]) if len(dsper) == 8 else 0
+
+    if minutes > 59 or seconds > 59:
+        return None
+
+    period = hours * 3600 + minutes * 60 + seconds + hundredths / 100.0
+    if period <= 0:
+        return None
+
+    return period
+
+
+class Trace(object):
+    """Trace requested by the host
+
+    :param trid: trace request id
+    :type trid: various
+    :param svids: status variables to sample
+    :type svids: list of various
+    :param period: sample period in seconds
+    :type period: float
+    :param total_samples: number of samples to make
+    :type total_samples: integer
+    :param group_size: number of samples sent in one S6F1 message
+    :type group_size: integer
+    """
+
+    def __init__(self, trid, svids, period, total_samples, group_size):
+        self.trid = trid
+        self.svids = svids
+        self.period = period
+        self.total_samples = total_samples
+        self.group_size = group_size
+
+        self.sample_number = 0
+        self.skipped_samples = 0
+
+        self._group = []
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'trid': self.trid, 'svids': self.svids, 'period': self.period, \
+            'total_samples': self.total_samples, 'group_size': self.group_size, 'sample_number': self.sample_number})
+
+    @property
+    def done(self):
+        """All samples were made"""
+        return self.sample_number >= self.total_samples
+
+
+class TraceScheduler(object):
+    """Samples the traces of a handler from a single thread
+
+    The traces are kept in a heap ordered by the time of their next sample.
+    The status variables of all traces due at the same time are read with one call to
+    :func:`secsgem.gem.equipmenthandler.GemEquipmentHandler.on_sv_values_request`.
+    The S6F1 messages are sent without waiting for the answer of the host, the thread keeps sampling meanwhile.
+    The sampled values are checked against the limits defined by the host.
+
+    If sampling falls behind by more than one period, the missed samples of a trace are skipped.
+
+    :param handler: handler to sample the status variables from and send the trace data with
+    :type handler: :class:`secsgem.gem.equipmenthandler.GemEquipmentHandler`
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._traces = {}
+        self._heap = []
+        self._counter = itertools.count()
+
+        # wakeups and responses of the host
+        self._queue = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="secsgem_traceScheduler")
+        self._thread.daemon = True  # kill thread automatically on main program termination
+        self._thread.start()
+
+    @property
+    def traces(self):
+        """Active traces
+
+        :returns: traces by trace request id
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._traces)
+
+    def add(self, trace):
+        """Start sampling a trace, replaces a trace with the same id
+
+        :param trace: trace to start
+        :type trace: :class:`secsgem.gem.trace.Trace`
+        """
+        with self._lock:
+            self._traces[trace.trid] = trace
+            heapq.heappush(self._heap, (time.time() + trace.period, next(self._counter), trace))
+
+        self._queue.put(_WAKEUP)
+
+    def remove(self, trid):
+        """Stop sampling a trace
+
+        :param trid: trace request id
+        :type trid: various
+        :returns: True if the trace was active
+        :rtype: boolean
+        """
+        with self._lock:
+            return self._traces.pop(trid, None) is not None
+
+    def stop(self, wait=True):
+        """Stop the scheduler
+
+        :param wait: wait for the thread to finish
+        :type wait: boolean
+        """
+        self._queue.put(_STOP)
+
+        if wait:
+            self._thread.join()
+
+    def _pop_due(self, now):
+        due = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_time, _, trace = heapq.heappop(self._heap)
+
+                # removed or replaced traces are dropped when they come up
+                if self._traces.get(trace.trid) is trace:
+                    due.append((due_time, trace))
+
+        return due
+
+    def _sample(self, due, now):
+        status_variables = collections.OrderedDict()
+        for _, trace in due:
+            for svid in trace.svids:
+                if svid not in status_variables and svid in self.handler.status_variables:
+                    status_variables[svid] = self.handler.status_variables[svid]
+
+        values = dict(zip(status_variables.keys(), self.handler._get_sv_values(list(status_variables.values()))))  # noqa
+        self.handler.check_limits(values)
+
+        sent = []
+        for due_time, trace in due:
+            trace.sample_number += 1
+            trace._group.extend(values[svid] for svid in trace.svids if svid in values)  # noqa
+
+            if trace.done or trace.sample_number % trace.group_size == 0:
+                sent.append(self.handler.stream_function(6, 1)({"TRID": trace.trid, "SMPLN": trace.sample_number, \
+                    "STIME": self.handler._format_time(now), "SV": trace._group}))  # noqa
+                trace._group = []  # noqa
+
+            with self._lock:
+                if trace.done:
+                    if self._traces.get(trace.trid) is trace:
+                        del self._traces[trace.trid]
+                    continue
+
+                next_time = due_time + trace.period
+                if next_time <= now:
+                    skipped = int((now - due_time) / trace.period)
+                    trace.skipped_samples += skipped
+                    next_time = due_time + (skipped + 1) * trace.period
+
+                heapq.heappush(self._heap, (next_time, next(self._counter), trace))
+
+        return sent
+
+    def _run(self):
+        # system => deadline of the answer
+        outstanding = collections.OrderedDict()
+
+        while True:
+            now = time.time()
+
+            due = self._pop_due(now)
+            if due:
+                for function in self._sample(due, now):
+                    system_id = self.handler.send_stream_function_async(function, self._queue)
+                    if system_id is None:
+                        self.handler._spool_failed_message(function)  # noqa
+                    else:
+                        outstanding[system_id] = time.time() + self.handler.connection.T3
+
+            timeouts = []
+            with self._lock:
+                if self._heap:
+                    timeouts.append(self._heap[0][0])
+            if outstanding:
+                timeouts.append(next(iter(outstanding.values())))
+
+            timeout = max(0, min(timeouts) - time.time()) if timeouts else None
+
+            try:
+                item = self._queue.get(True, timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+
+            if isinstance(item, HsmsPacket) and item.header.system in outstanding:
+                del outstanding[item.header.system]
+                self.handler._remove_queue(item.header.system)  # noqa
+
+            now = time.time()
+            for system_id, deadline in list(outstanding.items()):
+                if deadline > now:
+                    break
+
+                self.logger.warning("trace data not answered by host")
+                del outstanding[system_id]
+                self.handler._remove_queue(system_id)  # noqa
+
+        for system_id in outstanding:
+            self.handler._remove_queue(system_id)  # noqa
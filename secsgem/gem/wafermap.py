@@ -0,0 +1,364 @@
+#####################################################################
+# wafermap.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Wafer maps stored in compact arrays"""
+
+import array
+import struct
+
+from ..secs.variables import SecsVar, SecsVarList, SecsVarU1, SecsVarString, SecsVarI1, SecsVarI2, SecsVarI4, \
+    SecsVarI8
+from ..secs.dataitems import MID, IDTYP
+
+# array.tobytes/frombytes are called tostring/fromstring in python 2
+_to_bytes = getattr(array.array, "tobytes", getattr(array.array, "tostring", None))
+_from_bytes = getattr(array.array, "frombytes", getattr(array.array, "fromstring", None))
+
+_INTEGER_TYPES = [SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
+_INTEGER_FORMATS = dict((item_type.formatCode, item_type) for item_type in _INTEGER_TYPES)
+
+_BIN_FORMAT_CODES = (SecsVarU1.formatCode, SecsVarString.formatCode)
+
+_decode_item_header = SecsVar().decode_item_header
+
+
+def _item_header(format_code, length):
+    if length > 0xFFFFFF:
+        raise ValueError("Encoding wafer map not possible, data length too big {}".format(length))
+
+    if length > 0xFFFF:
+        return struct.pack(">BBH", (format_code << 2) | 3, length >> 16, length & 0xFFFF)
+    if length > 0xFF:
+        return struct.pack(">BH", (format_code << 2) | 2, length)
+
+    return struct.pack(">BB", (format_code << 2) | 1, length)
+
+
+def _integer_type(minimum, maximum):
+    for item_type in _INTEGER_TYPES:
+        bits = item_type._bytes * 8 - 1  # noqa
+        if -(1 << bits) <= minimum and maximum < (1 << bits):
+            return item_type
+
+    raise ValueError("Wafer map coordinates {}/{} can't be encoded".format(minimum, maximum))
+
+
+class WaferMap(object):
+    """Bin codes of the dies on a wafer, stored in a compact array
+
+    The dies are addressed by their x/y coordinates, *origin* is the coordinate of the first die in the first row.
+    The bin codes are kept row by row in :attr:`bins`, an :class:`array.array` of unsigned bytes.
+    It supports the buffer protocol, so NumPy can use it without a copy,
+    e.g. ``numpy.frombuffer(wafer_map.bins, numpy.uint8).reshape(wafer_map.rows, wafer_map.columns)``.
+
+    The map data messages of stream 12 are encoded from and decoded into the array directly,
+    without creating items for the single dies.
+    All three map data formats are supported, also for a part of the map:
+
+    - type 1 (S12F7, S12F14): rows with their starting location (RSINF)
+    - type 2 (S12F9, S12F16): consecutive dies from a starting position (STRP)
+    - type 3 (S12F11, S12F18): runs of dies with a bin code at their position (XYPOS)
+
+    :param mid: material id
+    :type mid: string/bytes
+    :param rows: number of rows (ROWCT)
+    :type rows: integer
+    :param columns: number of columns (COLCT)
+    :type columns: integer
+    :param origin: x and y coordinate of the first die
+    :type origin: tuple
+    :param null_bin: bin code of dies without a bin (NULBC)
+    :type null_bin: integer or string with one character
+    :param text: send the bin codes as text instead of U1
+    :type text: boolean
+    :param idtyp: id type of the material
+    :type idtyp: integer
+    """
+
+    def __init__(self, mid, rows, columns, origin=(0, 0), null_bin=0, text=False, idtyp=IDTYP.WAFER):
+        self.mid = mid
+        self.rows = rows
+        self.columns = columns
+        self.origin = tuple(origin)
+        self.null_bin = ord(null_bin) if not isinstance(null_bin, int) else null_bin
+        self.text = text
+        self.idtyp = idtyp
+
+        self.bins = array.array("B", [self.null_bin]) * (rows * columns)
+
+        # coordinates and directions of the map always fit into this type
+        self._position_type = _integer_type(min(-1, self.origin[0], self.origin[1]), \
+            max(1, self.origin[0] + columns - 1, self.origin[1] + rows - 1))
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'mid': self.mid, 'rows': self.rows, 'columns': self.columns, \
+            'origin': self.origin, 'null_bin': self.null_bin})
+
+    def __len__(self):
+        """Number of dies on the map"""
+        return len(self.bins)
+
+    def __getitem__(self, position):
+        """Get the bin code of the die at a x/y position"""
+        return self.bins[self._index(position[0], position[1])]
+
+    def __setitem__(self, position, bin_code):
+        """Set the bin code of the die at a x/y position"""
+        self.bins[self._index(position[0], position[1])] = bin_code
+
+    def _index(self, x, y):
+        column = x - self.origin[0]
+        row = y - self.origin[1]
+
+        if not 0 <= column < self.columns or not 0 <= row < self.rows:
+            raise IndexError("Position {}/{} is outside of the wafer map".format(x, y))
+
+        return row * self.columns + column
+
+    def row(self, y):
+        """Get the bin codes of a row
+
+        :param y: y coordinate of the row
+        :type y: integer
+        :returns: bin codes of the row
+        :rtype: :class:`array.array`
+        """
+        start = self._index(self.origin[0], y)
+        return self.bins[start:start + self.columns]
+
+    def set_row(self, y, bin_codes):
+        """Set the bin codes of a row
+
+        :param y: y coordinate of the row
+        :type y: integer
+        :param bin_codes: bin codes of all dies in the row
+        :type bin_codes: :class:`array.array` or list of integers
+        """
+        if len(bin_codes) != self.columns:
+            raise ValueError("Row has {} dies, expected {}".format(len(bin_codes), self.columns))
+
+        start = self._index(self.origin[0], y)
+        self.bins[start:start + self.columns] = array.array("B", bin_codes)
+
+    def _row_coordinates(self, rows):
+        if rows is None:
+            return range(self.origin[1], self.origin[1] + self.rows)
+
+        return rows
+
+    def _encode_header(self, count):
+        return _item_header(SecsVarList.formatCode, count) + MID(self.mid).encode() + IDTYP(self.idtyp).encode()
+
+    def _encode_position(self, *values):
+        position_type = self._position_type
+        data = struct.pack(">{}{}".format(len(values), position_type._structCode), *values)  # noqa
+
+        return _item_header(position_type.formatCode, len(data)) + data
+
+    def _encode_bins(self, start, end):
+        format_code = SecsVarString.formatCode if self.text else SecsVarU1.formatCode
+        return _item_header(format_code, end - start) + _to_bytes(self.bins[start:end])
+
+    def encode_rows(self, rows=None):
+        """Encode rows for the map data type 1 messages (S12F7, S12F14)
+
+        :param rows: y coordinates of the rows to send, all rows if None
+        :type rows: list of integers
+        :returns: encoded data of the message
+        :rtype: bytes
+        """
+        rows = self._row_coordinates(rows)
+
+        items = []
+        for y in rows:
+            start = self._index(self.origin[0], y)
+
+            items.append(b"\x01\x02")
+            items.append(self._encode_position(self.origin[0], y, 1))
+            items.append(self._encode_bins(start, start + self.columns))
+
+        return self._encode_header(3) + _item_header(SecsVarList.formatCode, len(rows)) + b"".join(items)
+
+    def encode_array(self, start=None, count=None):
+        """Encode consecutive dies for the map data type 2 messages (S12F9, S12F16)
+
+        The dies follow each other row by row.
+
+        :param start: x and y coordinate of the first die, the first die of the map if None
+        :type start: tuple
+        :param count: number of dies, up to the end of the map if None
+        :type count: integer
+        :returns: encoded data of the message
+        :rtype: bytes
+        """
+        if start is None:
+            start = self.origin
+
+        index = self._index(start[0], start[1])
+        end = len(self.bins) if count is None else index + count
+
+        if end > len(self.bins):
+            raise IndexError("{} dies from {}/{} exceed the wafer map".format(count, start[0], start[1]))
+
+        return self._encode_header(4) + self._encode_position(start[0], start[1]) + self._encode_bins(index, end)
+
+    def encode_coordinates(self, rows=None):
+        """Encode dies for the map data type 3 messages (S12F11, S12F18)
+
+        Dies with the null bin code are skipped,
+        the other dies are sent as runs of neighbouring dies in a row with the position of the first die.
+
+        :param rows: y coordinates of the rows to send, all rows if None
+        :type rows: list of integers
+        :returns: encoded data of the message
+        :rtype: bytes
+        """
+        null_bin = self.null_bin
+
+        items = []
+        for y in self._row_coordinates(rows):
+            start = self._index(self.origin[0], y)
+            row = self.bins[start:start + self.columns]
+
+            column = 0
+            while column < self.columns:
+                if row[column] == null_bin:
+                    column += 1
+                    continue
+
+                run_end = column + 1
+                while run_end < self.columns and row[run_end] != null_bin:
+                    run_end += 1
+
+                items.append(b"\x01\x02")
+                items.append(self._encode_position(self.origin[0] + column, y))
+                items.append(self._encode_bins(start + column, start + run_end))
+
+                column = run_end
+
+        return self._encode_header(3) + _item_header(SecsVarList.formatCode, len(items) // 3) + b"".join(items)
+
+    @staticmethod
+    def _decode_position(data, text_pos, count):
+        text_pos, format_code, length = _decode_item_header(data, text_pos)
+
+        position_type = _INTEGER_FORMATS.get(format_code)
+        if position_type is None or length != count * position_type._bytes:  # noqa
+            raise ValueError("Wafer map position has invalid format {}".format(format_code))
+
+        values = struct.unpack_from(">{}{}".format(count, position_type._structCode), data, text_pos)  # noqa
+
+        return text_pos + length, values
+
+    @staticmethod
+    def _decode_bins(data, text_pos):
+        text_pos, format_code, length = _decode_item_header(data, text_pos)
+
+        if format_code not in _BIN_FORMAT_CODES:
+            raise ValueError("Wafer map bin list has invalid format {}".format(format_code))
+        if text_pos + length > len(data):
+            raise ValueError("Wafer map bin list has length {}, expected {}".format(len(data) - text_pos, length))
+
+        bin_codes = array.array("B")
+        _from_bytes(bin_codes, bytes(data[text_pos:text_pos + length]))
+
+        return text_pos + length, bin_codes
+
+    def _run_index(self, x, y, count):
+        # index of the first die, all dies have to be in the same row
+        try:
+            index = self._index(x, y)
+            self._index(x + count - 1, y)
+        except IndexError as exc:
+            raise ValueError(str(exc))
+
+        return index
+
+    @staticmethod
+    def _peek_count(data, text_pos):
+        _, format_code, length = _decode_item_header(data, text_pos)
+
+        position_type = _INTEGER_FORMATS.get(format_code)
+        if position_type is None:
+            raise ValueError("Wafer map position has invalid format {}".format(format_code))
+
+        return length // position_type._bytes  # noqa
+
+    def decode(self, data):
+        """Set the bin codes from the data of a map data message
+
+        The format of the message (type 1, 2 or 3) is detected from the data.
+        The dies not contained in the message keep their bin codes,
+        the map is only changed if the whole message is valid.
+
+        :param data: encoded data of the message
+        :type data: bytes
+        :returns: material id of the message
+        :rtype: string/bytes
+        """
+        text_pos, format_code, length = _decode_item_header(data, 0)
+        if format_code != SecsVarList.formatCode or length not in (3, 4):
+            raise ValueError("Wafer map message has invalid format")
+
+        mid = MID()
+        text_pos = mid.decode(data, text_pos)
+        text_pos = IDTYP().decode(data, text_pos)
+
+        if length == 4:
+            text_pos, (x, y) = self._decode_position(data, text_pos, 2)
+            text_pos, bin_codes = self._decode_bins(data, text_pos)
+
+            index = self._run_index(x, y, 1) if bin_codes else 0
+            if index + len(bin_codes) > len(self.bins):
+                raise ValueError("{} dies from {}/{} exceed the wafer map".format(len(bin_codes), x, y))
+
+            self.bins[index:index + len(bin_codes)] = bin_codes
+
+            return mid.get()
+
+        text_pos, format_code, count = _decode_item_header(data, text_pos)
+        if format_code != SecsVarList.formatCode:
+            raise ValueError("Wafer map message has invalid format")
+
+        changes = []
+        position_count = None
+        for _ in range(count):
+            text_pos, format_code, length = _decode_item_header(data, text_pos)
+            if format_code != SecsVarList.formatCode or length != 2:
+                raise ValueError("Wafer map message has invalid format")
+
+            # type 1 has a direction after the position
+            if position_count is None:
+                position_count = 3 if self._peek_count(data, text_pos) == 3 else 2
+
+            text_pos, position = self._decode_position(data, text_pos, position_count)
+            text_pos, bin_codes = self._decode_bins(data, text_pos)
+
+            if not bin_codes:
+                continue
+
+            x = position[0]
+            if position_count == 3 and position[2] < 0:
+                # dies follow in negative x direction
+                bin_codes.reverse()
+                x -= len(bin_codes) - 1
+
+            changes.append((self._run_index(x, position[1], len(bin_codes)), bin_codes))
+
+        for index, bin_codes in changes:
+            self.bins[index:index + len(bin_codes)] = bin_codes
+
+        return mid.get()
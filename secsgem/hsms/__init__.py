@@ -22,3 +22,4 @@ from .connections import *  # noqa
 from .connectionmanager import *  # noqa
 from .packets import *  # noqa
 from .handler import *  # noqa
+from .journal import *  # noqa
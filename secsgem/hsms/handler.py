@@ -24,6 +24,7 @@ import queue
 
 from ..common.callbacks import CallbackHandler
 from ..common.events import EventProducer
+from ..common.executor import PRIORITY_HIGH
 
 from .connections import HsmsActiveConnection, HsmsPassiveConnection, hsmsSTypes
 from .packets import HsmsPacket, HsmsRejectReqHeader, HsmsStreamFunctionHeader,\
@@ -31,6 +32,26 @@ from .packets import HsmsPacket, HsmsRejectReqHeader, HsmsStreamFunctionHeader,\
     HsmsDeselectReqHeader, HsmsDeselectRspHeader, HsmsSeparateReqHeader
 
 from .connectionstatemachine import ConnectionStateMachine
+from .journal import JOURNAL_DIRECTION_IN, JOURNAL_DIRECTION_OUT
+
+
+class _LazyDecodedMessage(object):
+    """Defers decoding of a packet until a log record is actually formatted
+
+    :param decoder: function used to decode the packet
+    :type decoder: callable
+    :param packet: packet to decode
+    :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+    """
+
+    def __init__(self, decoder, packet):
+        self.decoder = decoder
+        self.packet = packet
+
+    def __str__(self):
+        """Generate string representation of the decoded packet"""
+        return str(self.decoder(self.packet))
+
 
 class HsmsHandler(object):
     """Baseclass for creating Host/Equipment models.
@@ -100,6 +121,12 @@ class HsmsHandler(object):
         # response queues
         self._systemQueues = {}
 
+        # optional binary journal for all sent and received packets
+        self.journal = None
+
+        # optional priority worker pool serializing outgoing packets by priority
+        self.send_executor = None
+
         # hsms connection state fsm
         self.connectionState = ConnectionStateMachine({"on_enter_CONNECTED": self._on_state_connect,
                                                        "on_exit_CONNECTED": self._on_state_disconnect,
@@ -288,12 +315,14 @@ class HsmsHandler(object):
         :param packet: received data packet
         :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
         """
+        self._journal_packet(packet, JOURNAL_DIRECTION_IN)
+
         if packet.header.sType > 0:
             self.__handle_hsms_requests(packet)
         else:
             if hasattr(self, 'secs_decode') and callable(getattr(self, 'secs_decode')):
-                message = self.secs_decode(packet)
-                self.communicationLogger.info("< %s\n%s", packet, message, extra=self._get_log_extra())
+                # only decoded if the record is emitted, result is cached on the packet for the callback
+                self.communicationLogger.info("< %s\n%s", packet, _LazyDecodedMessage(self.secs_decode, packet), extra=self._get_log_extra())
             else:
                 self.communicationLogger.info("< %s", packet, extra=self._get_log_extra())
 
@@ -302,7 +331,7 @@ class HsmsHandler(object):
 
                 out_packet = HsmsPacket(HsmsRejectReqHeader(packet.header.system, packet.header.sType, 4))
                 self.communicationLogger.info("> %s\n  %s", out_packet, hsmsSTypes[out_packet.header.sType], extra=self._get_log_extra())
-                self.connection.send_packet(out_packet)
+                self._send_packet(out_packet)
 
                 return True
 
@@ -368,7 +397,7 @@ class HsmsHandler(object):
 
         self.communicationLogger.info("> %s\n%s", out_packet, packet, extra=self._get_log_extra())
 
-        return self.connection.send_packet(out_packet)
+        return self._send_packet(out_packet)
 
     def send_and_waitfor_response(self, packet):
         """Send the packet and wait for the response
@@ -386,7 +415,7 @@ class HsmsHandler(object):
 
         self.communicationLogger.info("> %s\n%s", out_packet, packet, extra=self._get_log_extra())
 
-        if not self.connection.send_packet(out_packet):
+        if not self._send_packet(out_packet):
             self.logger.error("Sending packet failed")
             self._remove_queue(system_id)
             return None
@@ -400,6 +429,34 @@ class HsmsHandler(object):
 
         return response
 
+    def send_stream_function_async(self, packet, response_queue):
+        """Send the packet without waiting for the response
+
+        The response is put into *response_queue*.
+        The system has to be removed with :func:`_remove_queue` when the response was received or is no longer expected.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :param response_queue: queue the response is put into
+        :type response_queue: queue.Queue
+        :returns: system of the sent packet or None if sending failed
+        :rtype: integer
+        """
+        system_id = self.get_next_system_counter()
+
+        self._systemQueues[system_id] = response_queue
+
+        out_packet = HsmsPacket(HsmsStreamFunctionHeader(system_id, packet.stream, packet.function, True, self.sessionID), packet.encode())
+
+        self.communicationLogger.info("> %s\n%s", out_packet, packet, extra=self._get_log_extra())
+
+        if not self._send_packet(out_packet):
+            self.logger.error("Sending packet failed")
+            self._remove_queue(system_id)
+            return None
+
+        return system_id
+
     def send_response(self, function, system):
         """Send response function for system
 
@@ -412,7 +469,7 @@ class HsmsHandler(object):
 
         self.communicationLogger.info("> %s\n%s", out_packet, function, extra=self._get_log_extra())
 
-        return self.connection.send_packet(out_packet)
+        return self._send_packet(out_packet)
 
     def send_select_req(self):
         """Send a Select Request to the remote host
@@ -427,7 +484,7 @@ class HsmsHandler(object):
         packet = HsmsPacket(HsmsSelectReqHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
 
-        if not self.connection.send_packet(packet):
+        if not self._send_packet(packet):
             self._remove_queue(system_id)
             return None
 
@@ -448,7 +505,7 @@ class HsmsHandler(object):
         """
         packet = HsmsPacket(HsmsSelectRspHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
-        return self.connection.send_packet(packet)
+        return self._send_packet(packet)
 
     def send_linktest_req(self):
         """Send a Linktest Request to the remote host
@@ -463,7 +520,7 @@ class HsmsHandler(object):
         packet = HsmsPacket(HsmsLinktestReqHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
 
-        if not self.connection.send_packet(packet):
+        if not self._send_packet(packet):
             self._remove_queue(system_id)
             return None
 
@@ -484,7 +541,7 @@ class HsmsHandler(object):
         """
         packet = HsmsPacket(HsmsLinktestRspHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
-        return self.connection.send_packet(packet)
+        return self._send_packet(packet)
 
     def send_deselect_req(self):
         """Send a Deselect Request to the remote host
@@ -499,7 +556,7 @@ class HsmsHandler(object):
         packet = HsmsPacket(HsmsDeselectReqHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
 
-        if not self.connection.send_packet(packet):
+        if not self._send_packet(packet):
             self._remove_queue(system_id)
             return None
 
@@ -520,7 +577,7 @@ class HsmsHandler(object):
         """
         packet = HsmsPacket(HsmsDeselectRspHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
-        return self.connection.send_packet(packet)
+        return self._send_packet(packet)
 
     def send_reject_rsp(self, system_id, s_type, reason):
         """Send a Reject Response to the remote host
@@ -534,7 +591,7 @@ class HsmsHandler(object):
         """
         packet = HsmsPacket(HsmsRejectReqHeader(system_id, s_type, reason))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
-        return self.connection.send_packet(packet)
+        return self._send_packet(packet)
 
     def send_separate_req(self):
         """Send a Separate Request to the remote host"""
@@ -543,12 +600,51 @@ class HsmsHandler(object):
         packet = HsmsPacket(HsmsSeparateReqHeader(system_id))
         self.communicationLogger.info("> %s\n  %s", packet, hsmsSTypes[packet.header.sType], extra=self._get_log_extra())
 
-        if not self.connection.send_packet(packet):
+        if not self._send_packet(packet):
             return None
 
         return system_id
 
     # helpers
 
+    def _send_packet(self, packet):
+        """Send a packet using the connection and add it to the journal
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        :returns: True if the packet was sent
+        :rtype: boolean
+        """
+        self._journal_packet(packet, JOURNAL_DIRECTION_OUT)
+
+        if self.send_executor is None:
+            return self.connection.send_packet(packet)
+
+        if packet.header.sType > 0:
+            priority = PRIORITY_HIGH
+        else:
+            priority = self.send_executor.get_priority(packet.header.stream, packet.header.function)
+
+        # waits for the send, unless called on a worker of the pool, e.g. from a callback if the pool is shared
+        return bool(self.send_executor.call_prioritized(priority, self.connection.send_packet, packet))
+
+    def _journal_packet(self, packet, direction):
+        """Add a packet to the journal, a failing journal doesn't stop the communication
+
+        :param packet: sent or received packet
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        :param direction: JOURNAL_DIRECTION_IN or JOURNAL_DIRECTION_OUT
+        :type direction: integer
+        """
+        journal = self.journal
+        if journal is None:
+            return
+
+        try:
+            journal.append(packet, direction, self.name)
+        except (IOError, OSError, ValueError):
+            # e.g. the journal was closed while the handler is still running
+            self.logger.exception("journaling packet failed")
+
     def _get_log_extra(self):
         return {"address": self.address, "port": self.port, "sessionID": self.sessionID, "remoteName": self.name}
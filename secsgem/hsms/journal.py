@@ -0,0 +1,411 @@
+#####################################################################
+# journal.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Binary journal for raw hsms messages with an indexed reader"""
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import io
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from .packets import HsmsPacket
+
+JOURNAL_DIRECTION_IN = 0
+JOURNAL_DIRECTION_OUT = 1
+
+# data record: timestamp, direction, length of peer name, length of frame
+_RECORD_HEADER = struct.Struct("<dBHI")
+# index record: timestamp, data offset, frame length, peer key, direction, stream, function
+_INDEX_RECORD = struct.Struct("<dQIIBBBx")
+
+
+def journal_peer_key(peer):
+    """Generate the key used to index a peer name
+
+    :param peer: name of the peer
+    :type peer: string
+    :returns: 32 bit key for the peer
+    :rtype: integer
+    """
+    return zlib.crc32(peer.encode("utf-8")) & 0xffffffff
+
+
+class HsmsJournal(object):
+    """Append-only binary journal of raw hsms frames
+
+    Records are written to buffered segment files, that are rotated when they grow larger than *segment_size*.
+    For every segment an index file with fixed size records (time, peer, stream and function) is written,
+    which is used by :class:`secsgem.hsms.journal.HsmsJournalReader` to find messages without parsing the data.
+
+    :param path: directory the segments are written to
+    :type path: string
+    :param prefix: file name prefix for the segments
+    :type prefix: string
+    :param segment_size: maximum size of a data segment in bytes
+    :type segment_size: integer
+    :param max_segments: number of segments to keep, older segments are deleted (None keeps all)
+    :type max_segments: integer
+    :param buffer_size: size of the write buffer in bytes
+    :type buffer_size: integer
+
+    **Example**::
+
+        journal = secsgem.HsmsJournal("/var/log/secsgem")
+
+        handler = secsgem.GemHostHandler("10.211.55.33", 5000, True, 0, "test")
+        handler.journal = journal
+    """
+
+    def __init__(self, path, prefix="hsms", segment_size=64 * 1024 * 1024, max_segments=None, buffer_size=256 * 1024):
+        self.path = path
+        self.prefix = prefix
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.buffer_size = buffer_size
+
+        self._lock = threading.Lock()
+
+        self._data_file = None
+        self._index_file = None
+        self._offset = 0
+
+        # the index is searched by time, so the timestamps must not decrease
+        self._last_timestamp = 0.0
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+        segments = list_journal_segments(self.path, self.prefix)
+        self._segment = segments[-1] + 1 if segments else 0
+
+        self._open_segment()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'path': self.path, 'prefix': self.prefix, 'segment': self._segment})
+
+    def _open_segment(self):
+        data_name, index_name = journal_segment_files(self.path, self.prefix, self._segment)
+
+        self._data_file = io.open(data_name, "ab", buffering=self.buffer_size)
+        self._index_file = io.open(index_name, "ab", buffering=self.buffer_size)
+        self._offset = os.path.getsize(data_name)
+
+    def _close_segment(self):
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+
+        self._data_file = None
+        self._index_file = None
+
+    def _rotate(self):
+        self._close_segment()
+        self._segment += 1
+        self._open_segment()
+
+        if self.max_segments is None:
+            return
+
+        for segment in list_journal_segments(self.path, self.prefix)[:-self.max_segments]:
+            for filename in journal_segment_files(self.path, self.prefix, segment):
+                os.remove(filename)
+
+    def append(self, packet, direction, peer, timestamp=None):
+        """Append a packet to the journal
+
+        :param packet: packet to journal
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        :param direction: JOURNAL_DIRECTION_IN or JOURNAL_DIRECTION_OUT
+        :type direction: integer
+        :param peer: name of the remote peer
+        :type peer: string
+        :param timestamp: time of the message, current time if None, never before the previous message
+        :type timestamp: float
+        """
+        frame = packet.encode()
+        peer_name = peer.encode("utf-8")
+
+        with self._lock:
+            if self._data_file is None:
+                raise IOError("journal is closed")
+
+            # taken under the lock, so concurrent senders and the receiver append in time order
+            if timestamp is None:
+                timestamp = time.time()
+            timestamp = max(timestamp, self._last_timestamp)
+            self._last_timestamp = timestamp
+
+            record = _RECORD_HEADER.pack(timestamp, direction, len(peer_name), len(frame)) + peer_name + frame
+            index = _INDEX_RECORD.pack(timestamp, self._offset, len(frame),
+                                       journal_peer_key(peer), direction, packet.header.stream, packet.header.function)
+
+            self._data_file.write(record)
+            self._index_file.write(index)
+            self._offset += len(record)
+
+            if self._offset >= self.segment_size:
+                self._rotate()
+
+    def flush(self):
+        """Write buffered records to disk"""
+        with self._lock:
+            if self._data_file is not None:
+                self._data_file.flush()
+                self._index_file.flush()
+
+    def close(self):
+        """Flush and close the journal"""
+        with self._lock:
+            self._close_segment()
+
+
+class HsmsJournalRecord(object):
+    """Single message read from a journal
+
+    :param timestamp: time the message was journaled
+    :type timestamp: float
+    :param direction: JOURNAL_DIRECTION_IN or JOURNAL_DIRECTION_OUT
+    :type direction: integer
+    :param peer: name of the remote peer
+    :type peer: string
+    :param frame: raw hsms frame
+    :type frame: bytes
+    """
+
+    def __init__(self, timestamp, direction, peer, frame):
+        self.timestamp = timestamp
+        self.direction = direction
+        self.peer = peer
+        self.frame = frame
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return "{} {}".format(self.__class__.__name__, {'timestamp': self.timestamp, 'direction': self.direction, 'peer': self.peer})
+
+    @property
+    def packet(self):
+        """The decoded hsms packet
+
+        :returns: packet of this record
+        :rtype: :class:`secsgem.hsms.packets.HsmsPacket`
+        """
+        return HsmsPacket.decode(self.frame)
+
+    def to_sml(self, streams_functions=None):
+        """Decode the message to SML text
+
+        :param streams_functions: stream/function classes to decode with, defaults to :data:`secsgem.secs.functions.secsStreamsFunctions`
+        :type streams_functions: dict
+        :returns: SML representation of the message
+        :rtype: string
+        """
+        packet = self.packet
+
+        if packet.header.sType > 0:
+            return "{}".format(packet)
+
+        if streams_functions is None:
+            from ..secs.functions import secsStreamsFunctions
+            streams_functions = secsStreamsFunctions
+
+        function_class = streams_functions.get(packet.header.stream, {}).get(packet.header.function)
+        if function_class is None:
+            return "S{}F{} <unknown> .".format(packet.header.stream, packet.header.function)
+
+        function = function_class()
+        function.decode(packet.data)
+
+        return "{}".format(function)
+
+
+class HsmsJournalReader(object):
+    """Reader for journals written by :class:`secsgem.hsms.journal.HsmsJournal`
+
+    The index files are memory mapped, so only the records matching the filters are read from the data files.
+
+    :param path: directory the segments were written to
+    :type path: string
+    :param prefix: file name prefix for the segments
+    :type prefix: string
+    """
+
+    def __init__(self, path, prefix="hsms"):
+        self.path = path
+        self.prefix = prefix
+
+    def _read_index(self, segment):
+        _, index_name = journal_segment_files(self.path, self.prefix, segment)
+
+        size = os.path.getsize(index_name) if os.path.exists(index_name) else 0
+        size -= size % _INDEX_RECORD.size
+        if size == 0:
+            return None
+
+        with io.open(index_name, "rb") as index_file:
+            return mmap.mmap(index_file.fileno(), size, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _find_start(index, count, start):
+        low = 0
+        high = count
+        while low < high:
+            middle = (low + high) // 2
+            if _INDEX_RECORD.unpack_from(index, middle * _INDEX_RECORD.size)[0] < start:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def records(self, start=None, end=None, peer=None, stream=None, function=None):
+        """Iterate the journaled messages matching the filters
+
+        :param start: only messages at or after this time
+        :type start: float
+        :param end: only messages before this time
+        :type end: float
+        :param peer: only messages of this peer
+        :type peer: string
+        :param stream: only messages of this stream
+        :type stream: integer
+        :param function: only messages of this function
+        :type function: integer
+        :returns: matching records
+        :rtype: iterator of :class:`secsgem.hsms.journal.HsmsJournalRecord`
+        """
+        peer_key = journal_peer_key(peer) if peer is not None else None
+
+        for segment in list_journal_segments(self.path, self.prefix):
+            index = self._read_index(segment)
+            if index is None:
+                continue
+
+            data_name, _ = journal_segment_files(self.path, self.prefix, segment)
+
+            try:
+                with io.open(data_name, "rb") as data_file:
+                    for record in self._segment_records(index, data_file, start, end, peer, peer_key, stream, function):
+                        yield record
+            finally:
+                index.close()
+
+    def _segment_records(self, index, data_file, start, end, peer, peer_key, stream, function):
+        count = len(index) // _INDEX_RECORD.size
+
+        if start is not None:
+            first = self._find_start(index, count, start)
+        else:
+            first = 0
+
+        for position in range(first, count):
+            timestamp, offset, length, key, direction, record_stream, record_function = \
+                _INDEX_RECORD.unpack_from(index, position * _INDEX_RECORD.size)
+
+            if end is not None and timestamp >= end:
+                break
+            if peer_key is not None and key != peer_key:
+                continue
+            if stream is not None and record_stream != stream:
+                continue
+            if function is not None and record_function != function:
+                continue
+
+            data_file.seek(offset)
+            peer_length = _RECORD_HEADER.unpack(data_file.read(_RECORD_HEADER.size))[2]
+
+            record_peer = data_file.read(peer_length).decode("utf-8")
+            if peer is not None and record_peer != peer:
+                continue
+
+            yield HsmsJournalRecord(timestamp, direction, record_peer, data_file.read(length))
+
+
+def journal_segment_files(path, prefix, segment):
+    """Get the data and index file name of a journal segment
+
+    :param path: directory of the journal
+    :type path: string
+    :param prefix: file name prefix for the segments
+    :type prefix: string
+    :param segment: number of the segment
+    :type segment: integer
+    :returns: data and index file name
+    :rtype: tuple of strings
+    """
+    base = os.path.join(path, "{}.{:06d}".format(prefix, segment))
+    return base + ".dat", base + ".idx"
+
+
+def list_journal_segments(path, prefix):
+    """Get the existing segments of a journal in ascending order
+
+    :param path: directory of the journal
+    :type path: string
+    :param prefix: file name prefix for the segments
+    :type prefix: string
+    :returns: segment numbers
+    :rtype: list of integers
+    """
+    if not os.path.isdir(path):
+        return []
+
+    pattern = re.compile(r"^" + re.escape(prefix) + r"\.(\d{6})\.dat$")
+
+    segments = []
+    for filename in os.listdir(path):
+        match = pattern.match(filename)
+        if match:
+            segments.append(int(match.group(1)))
+
+    return sorted(segments)
+
+
+def _main(argv=None):  # pragma: no cover
+    """Print the messages of a journal as SML
+
+    Usage: python -m secsgem.hsms.journal PATH [--prefix hsms] [--peer NAME] [--stream S] [--function F]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print secsgem hsms journal as SML")
+    parser.add_argument("path", help="journal directory")
+    parser.add_argument("--prefix", default="hsms", help="segment file prefix")
+    parser.add_argument("--peer", help="only messages of this peer")
+    parser.add_argument("--stream", type=int, help="only messages of this stream")
+    parser.add_argument("--function", type=int, help="only messages of this function")
+    parser.add_argument("--start", type=float, help="only messages at or after this unix time")
+    parser.add_argument("--end", type=float, help="only messages before this unix time")
+    args = parser.parse_args(argv)
+
+    reader = HsmsJournalReader(args.path, args.prefix)
+    for record in reader.records(args.start, args.end, args.peer, args.stream, args.function):
+        print("{} {} {}\n{}".format(datetime.datetime.fromtimestamp(record.timestamp).isoformat(),
+                                    "<" if record.direction == JOURNAL_DIRECTION_IN else ">",
+                                    record.peer, record.to_sml()))
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(_main())
@@ -335,6 +335,9 @@ class HsmsPacket:
     :param data: data part used for streams and functions (SType 0)
     :type data: string
 
+    The decoded stream/function object is cached in the *decoded* member by
+    :func:`secsgem.secs.handler.SecsHandler.secs_decode`.
+
     **Example**::
 
         >>> import secsgem
@@ -351,6 +354,7 @@ class HsmsPacket:
             self.header = header
 
         self.data = data
+        self.decoded = None
 
     def __str__(self):
         """Generate string representation for an object of this class"""
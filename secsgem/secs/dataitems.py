@@ -925,6 +925,21 @@ class DSID(DataItemBase):
     __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarString]
 
 
+class DSPER(DataItemBase):
+    """Data sample period
+
+    Format hhmmss or hhmmsscc (hours, minutes, seconds, hundredths of seconds).
+
+    :Types:
+       - :class:`SecsVarString <secsgem.secs.variables.SecsVarString>`
+
+    **Used In Function**
+        - :class:`SecsS02F23 <secsgem.secs.functions.SecsS02F23>`
+    """
+
+    __type__ = SecsVarString
+
+
 class DUTMS(DataItemBase):
     """Die units of measure
 
@@ -1230,7 +1245,7 @@ class ERACK(DataItemBase):
 
 
 class ERRCODE(DataItemBase):
-    """Reference point
+    """Code identifying an error
 
     :Types:
        - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
@@ -1238,6 +1253,45 @@ class ERRCODE(DataItemBase):
        - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
        - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
 
+    **Values**
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | Value | Description                        | Constant                                                                |
+        +=======+====================================+=========================================================================+
+        | 0     | No error                           | :const:`secsgem.secs.dataitems.ERRCODE.NO_ERROR`                        |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 1     | Unknown object in object specifier | :const:`secsgem.secs.dataitems.ERRCODE.UNKNOWN_OBJECT`                  |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 2     | Unknown target object type         | :const:`secsgem.secs.dataitems.ERRCODE.UNKNOWN_TARGET_OBJECT_TYPE`      |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 3     | Unknown object instance            | :const:`secsgem.secs.dataitems.ERRCODE.UNKNOWN_OBJECT_INSTANCE`         |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 4     | Unknown attribute name             | :const:`secsgem.secs.dataitems.ERRCODE.UNKNOWN_ATTRIBUTE`               |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 5     | Read-only attribute, access denied | :const:`secsgem.secs.dataitems.ERRCODE.READ_ONLY_ATTRIBUTE`             |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 6     | Unknown object type                | :const:`secsgem.secs.dataitems.ERRCODE.UNKNOWN_OBJECT_TYPE`             |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 7     | Invalid attribute value            | :const:`secsgem.secs.dataitems.ERRCODE.INVALID_ATTRIBUTE_VALUE`         |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 8     | Syntax error                       | :const:`secsgem.secs.dataitems.ERRCODE.SYNTAX_ERROR`                    |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 9     | Verification error                 | :const:`secsgem.secs.dataitems.ERRCODE.VERIFICATION_ERROR`              |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 10    | Validation error                   | :const:`secsgem.secs.dataitems.ERRCODE.VALIDATION_ERROR`                |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 11    | Object identifier in use           | :const:`secsgem.secs.dataitems.ERRCODE.OBJECT_ID_IN_USE`                |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 12    | Parameters improperly specified    | :const:`secsgem.secs.dataitems.ERRCODE.PARAMETERS_IMPROPERLY_SPECIFIED` |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 13    | Insufficient parameters specified  | :const:`secsgem.secs.dataitems.ERRCODE.INSUFFICIENT_PARAMETERS`         |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 14    | Unsupported option requested       | :const:`secsgem.secs.dataitems.ERRCODE.UNSUPPORTED_OPTION`              |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 15    | Busy                               | :const:`secsgem.secs.dataitems.ERRCODE.BUSY`                            |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+        | 16-63 | Other errors                       |                                                                         |
+        +-------+------------------------------------+-------------------------------------------------------------------------+
+
     **Used In Function**
         - :class:`SecsS01F03 <secsgem.secs.functions.SecsS01F03>`
         - :class:`SecsS01F20 <secsgem.secs.functions.SecsS01F20>`
@@ -1301,6 +1355,23 @@ class ERRCODE(DataItemBase):
     __type__ = SecsVarDynamic    
     __allowedtypes__ = [SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
 
+    NO_ERROR = 0
+    UNKNOWN_OBJECT = 1
+    UNKNOWN_TARGET_OBJECT_TYPE = 2
+    UNKNOWN_OBJECT_INSTANCE = 3
+    UNKNOWN_ATTRIBUTE = 4
+    READ_ONLY_ATTRIBUTE = 5
+    UNKNOWN_OBJECT_TYPE = 6
+    INVALID_ATTRIBUTE_VALUE = 7
+    SYNTAX_ERROR = 8
+    VERIFICATION_ERROR = 9
+    VALIDATION_ERROR = 10
+    OBJECT_ID_IN_USE = 11
+    PARAMETERS_IMPROPERLY_SPECIFIED = 12
+    INSUFFICIENT_PARAMETERS = 13
+    UNSUPPORTED_OPTION = 14
+    BUSY = 15
+
 
 class ERRTEXT(DataItemBase):
     """Error description for error code
@@ -1433,6 +1504,20 @@ class EXTYPE(DataItemBase):
     __type__ = SecsVarString
 
 
+class FCNID(DataItemBase):
+    """Function ID
+
+       :Types: :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+
+    **Used In Function**
+        - :class:`SecsS02F43 <secsgem.secs.functions.SecsS02F43>`
+        - :class:`SecsS02F44 <secsgem.secs.functions.SecsS02F44>`
+
+    """
+
+    __type__ = SecsVarU1
+
+
 class FFROT(DataItemBase):
     """Film frame rotation
 
@@ -1654,6 +1739,138 @@ class LENGTH(DataItemBase):
     __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
 
 
+class LIMITACK(DataItemBase):
+    """Variable limit attribute acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | Value | Description                           | Constant                                                        |
+        +=======+=======================================+=================================================================+
+        | 1     | LIMITID does not exist                | :const:`secsgem.secs.dataitems.LIMITACK.LIMITID_UNKNOWN`        |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | 2     | LIMITID repeated in message           | :const:`secsgem.secs.dataitems.LIMITACK.LIMITID_REPEATED`       |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | 3     | UPPERDB > LIMITMAX                    | :const:`secsgem.secs.dataitems.LIMITACK.UPPERDB_ABOVE_LIMITMAX` |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | 4     | LOWERDB < LIMITMIN                    | :const:`secsgem.secs.dataitems.LIMITACK.LOWERDB_BELOW_LIMITMIN` |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | 5     | UPPERDB < LOWERDB                     | :const:`secsgem.secs.dataitems.LIMITACK.UPPERDB_BELOW_LOWERDB`  |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | 6     | Illegal format for UPPERDB or LOWERDB | :const:`secsgem.secs.dataitems.LIMITACK.ILLEGAL_FORMAT`         |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+        | 7-63  | Reserved                              |                                                                 |
+        +-------+---------------------------------------+-----------------------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS02F46 <secsgem.secs.functions.SecsS02F46>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    LIMITID_UNKNOWN = 1
+    LIMITID_REPEATED = 2
+    UPPERDB_ABOVE_LIMITMAX = 3
+    LOWERDB_BELOW_LIMITMIN = 4
+    UPPERDB_BELOW_LOWERDB = 5
+    ILLEGAL_FORMAT = 6
+
+
+class LIMITID(DataItemBase):
+    """Limit ID
+
+    Identifies a limit of a variable with limit monitoring.
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Used In Function**
+        - :class:`SecsS02F45 <secsgem.secs.functions.SecsS02F45>`
+        - :class:`SecsS02F46 <secsgem.secs.functions.SecsS02F46>`
+        - :class:`SecsS02F48 <secsgem.secs.functions.SecsS02F48>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+
+class LIMITMAX(DataItemBase):
+    """Maximum allowed value for a limit
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarF8 <secsgem.secs.variables.SecsVarF8>`
+       - :class:`SecsVarF4 <secsgem.secs.variables.SecsVarF4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F48 <secsgem.secs.functions.SecsS02F48>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarF4, SecsVarF8]
+
+
+class LIMITMIN(DataItemBase):
+    """Minimum allowed value for a limit
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarF8 <secsgem.secs.variables.SecsVarF8>`
+       - :class:`SecsVarF4 <secsgem.secs.variables.SecsVarF4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F48 <secsgem.secs.functions.SecsS02F48>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarF4, SecsVarF8]
+
+
+class LOWERDB(DataItemBase):
+    """Lower deadband of a limit
+
+    The variable enters the zone below the limit when the value drops below the lower deadband.
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarF8 <secsgem.secs.variables.SecsVarF8>`
+       - :class:`SecsVarF4 <secsgem.secs.variables.SecsVarF4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F45 <secsgem.secs.functions.SecsS02F45>`
+        - :class:`SecsS02F48 <secsgem.secs.functions.SecsS02F48>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarF4, SecsVarF8]
+
+
 class LRACK(DataItemBase):
     """Link report acknowledge code
 
@@ -1694,6 +1911,41 @@ class LRACK(DataItemBase):
     RPTID_UNKNOWN = 5
 
 
+class LVACK(DataItemBase):
+    """Variable limit definition acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+--------------------------------------------+------------------------------------------------------------+
+        | Value | Description                                | Constant                                                   |
+        +=======+============================================+============================================================+
+        | 1     | Variable does not exist                    | :const:`secsgem.secs.dataitems.LVACK.VARIABLE_UNKNOWN`     |
+        +-------+--------------------------------------------+------------------------------------------------------------+
+        | 2     | Variable has no limits capability          | :const:`secsgem.secs.dataitems.LVACK.NO_LIMITS_CAPABILITY` |
+        +-------+--------------------------------------------+------------------------------------------------------------+
+        | 3     | Variable repeated in message               | :const:`secsgem.secs.dataitems.LVACK.VARIABLE_REPEATED`    |
+        +-------+--------------------------------------------+------------------------------------------------------------+
+        | 4     | Limit value error as described in LIMITACK | :const:`secsgem.secs.dataitems.LVACK.LIMIT_VALUE_ERROR`    |
+        +-------+--------------------------------------------+------------------------------------------------------------+
+        | 5-63  | Reserved                                   |                                                            |
+        +-------+--------------------------------------------+------------------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS02F46 <secsgem.secs.functions.SecsS02F46>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    VARIABLE_UNKNOWN = 1
+    NO_LIMITS_CAPABILITY = 2
+    VARIABLE_REPEATED = 3
+    LIMIT_VALUE_ERROR = 4
+
+
 class MAPER(DataItemBase):
     """Map error
 
@@ -2373,6 +2625,29 @@ class REFP(DataItemBase):
     __allowedtypes__ = [SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
 
 
+class REPGSZ(DataItemBase):
+    """Reporting group size
+
+    Number of samples sent in one trace data message.
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F23 <secsgem.secs.functions.SecsS02F23>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
+
+
 class ROWCT(DataItemBase):
     """Row count in dies
 
@@ -2446,6 +2721,65 @@ class RPTID(DataItemBase):
     __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarString]
 
 
+class RSDA(DataItemBase):
+    """Request spool data acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+-------------------------------------+-----------------------------------------------------+
+        | Value | Description                         | Constant                                            |
+        +=======+=====================================+=====================================================+
+        | 0     | OK                                  | :const:`secsgem.secs.dataitems.RSDA.ACK`            |
+        +-------+-------------------------------------+-----------------------------------------------------+
+        | 1     | Denied, busy try later              | :const:`secsgem.secs.dataitems.RSDA.DENIED_BUSY`    |
+        +-------+-------------------------------------+-----------------------------------------------------+
+        | 2     | Denied, spooled data does not exist | :const:`secsgem.secs.dataitems.RSDA.DENIED_NO_DATA` |
+        +-------+-------------------------------------+-----------------------------------------------------+
+        | 3-63  | Reserved                            |                                                     |
+        +-------+-------------------------------------+-----------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS06F24 <secsgem.secs.functions.SecsS06F24>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    ACK = 0
+    DENIED_BUSY = 1
+    DENIED_NO_DATA = 2
+
+
+class RSDC(DataItemBase):
+    """Request spool data code
+
+       :Types: :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+
+    **Values**
+        +-------+---------------------------+-----------------------------------------------+
+        | Value | Description               | Constant                                      |
+        +=======+===========================+===============================================+
+        | 0     | Transmit spooled messages | :const:`secsgem.secs.dataitems.RSDC.TRANSMIT` |
+        +-------+---------------------------+-----------------------------------------------+
+        | 1     | Purge spooled messages    | :const:`secsgem.secs.dataitems.RSDC.PURGE`    |
+        +-------+---------------------------+-----------------------------------------------+
+        | 2-63  | Reserved                  |                                               |
+        +-------+---------------------------+-----------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS06F23 <secsgem.secs.functions.SecsS06F23>`
+
+    """
+
+    __type__ = SecsVarU1
+
+    TRANSMIT = 0
+    PURGE = 1
+
+
 class RSINF(DataItemBase):
     """Starting location
 
@@ -2466,6 +2800,35 @@ class RSINF(DataItemBase):
     __count__ = 3
 
 
+class RSPACK(DataItemBase):
+    """Reset spooling acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+-------------------------+-------------------------------------------------+
+        | Value | Description             | Constant                                        |
+        +=======+=========================+=================================================+
+        | 0     | Spooling setup accepted | :const:`secsgem.secs.dataitems.RSPACK.ACK`      |
+        +-------+-------------------------+-------------------------------------------------+
+        | 1     | Spooling setup rejected | :const:`secsgem.secs.dataitems.RSPACK.REJECTED` |
+        +-------+-------------------------+-------------------------------------------------+
+        | 2-63  | Reserved                |                                                 |
+        +-------+-------------------------+-------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS02F44 <secsgem.secs.functions.SecsS02F44>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    ACK = 0
+    REJECTED = 1
+
+
 class SDACK(DataItemBase):
     """Map setup acknowledge
 
@@ -2535,6 +2898,29 @@ class SHEAD(DataItemBase):
     __count__ = 10
 
 
+class SMPLN(DataItemBase):
+    """Sample number
+
+    Sample numbers start at 1 and are incremented for every sample of a trace.
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS06F01 <secsgem.secs.functions.SecsS06F01>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
+
+
 class SOFTREV(DataItemBase):
     """Software revision 
 
@@ -2558,6 +2944,68 @@ class SOFTREV(DataItemBase):
     __count__ = 20
 
 
+class STIME(DataItemBase):
+    """Sample time
+
+    :Types:
+       - :class:`SecsVarString <secsgem.secs.variables.SecsVarString>`
+
+    **Used In Function**
+        - :class:`SecsS06F01 <secsgem.secs.functions.SecsS06F01>`
+    """
+
+    __type__ = SecsVarString
+
+
+class STRACK(DataItemBase):
+    """Spool stream acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+----------------------------------------------+-------------------------------------------------------------+
+        | Value | Description                                  | Constant                                                    |
+        +=======+==============================================+=============================================================+
+        | 1     | Spooling not allowed for stream              | :const:`secsgem.secs.dataitems.STRACK.SPOOLING_NOT_ALLOWED` |
+        +-------+----------------------------------------------+-------------------------------------------------------------+
+        | 2     | Stream unknown                               | :const:`secsgem.secs.dataitems.STRACK.STREAM_UNKNOWN`       |
+        +-------+----------------------------------------------+-------------------------------------------------------------+
+        | 3     | Unknown function specified for this stream   | :const:`secsgem.secs.dataitems.STRACK.FUNCTION_UNKNOWN`     |
+        +-------+----------------------------------------------+-------------------------------------------------------------+
+        | 4     | Secondary function specified for this stream | :const:`secsgem.secs.dataitems.STRACK.SECONDARY_FUNCTION`   |
+        +-------+----------------------------------------------+-------------------------------------------------------------+
+        | 5-63  | Reserved                                     |                                                             |
+        +-------+----------------------------------------------+-------------------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS02F44 <secsgem.secs.functions.SecsS02F44>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    SPOOLING_NOT_ALLOWED = 1
+    STREAM_UNKNOWN = 2
+    FUNCTION_UNKNOWN = 3
+    SECONDARY_FUNCTION = 4
+
+
+class STRID(DataItemBase):
+    """Stream ID
+
+       :Types: :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+
+    **Used In Function**
+        - :class:`SecsS02F43 <secsgem.secs.functions.SecsS02F43>`
+        - :class:`SecsS02F44 <secsgem.secs.functions.SecsS02F44>`
+
+    """
+
+    __type__ = SecsVarU1
+
+
 class STRP(DataItemBase):
     """Starting position
 
@@ -2671,6 +3119,47 @@ class TEXT(DataItemBase):
     __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarString, SecsVarBinary]
 
 
+class TIAACK(DataItemBase):
+    """Trace initialize acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+------------------------+-------------------------------------------------------+
+        | Value | Description            | Constant                                              |
+        +=======+========================+=======================================================+
+        | 0     | Everything correct     | :const:`secsgem.secs.dataitems.TIAACK.ACK`            |
+        +-------+------------------------+-------------------------------------------------------+
+        | 1     | Too many SVIDs         | :const:`secsgem.secs.dataitems.TIAACK.TOO_MANY_SVIDS` |
+        +-------+------------------------+-------------------------------------------------------+
+        | 2     | No more traces allowed | :const:`secsgem.secs.dataitems.TIAACK.NO_MORE_TRACES` |
+        +-------+------------------------+-------------------------------------------------------+
+        | 3     | Invalid period         | :const:`secsgem.secs.dataitems.TIAACK.INVALID_PERIOD` |
+        +-------+------------------------+-------------------------------------------------------+
+        | 4     | Unknown SVID           | :const:`secsgem.secs.dataitems.TIAACK.SVID_UNKNOWN`   |
+        +-------+------------------------+-------------------------------------------------------+
+        | 5     | Invalid REPGSZ         | :const:`secsgem.secs.dataitems.TIAACK.INVALID_REPGSZ` |
+        +-------+------------------------+-------------------------------------------------------+
+        | 6-63  | Reserved               |                                                       |
+        +-------+------------------------+-------------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS02F24 <secsgem.secs.functions.SecsS02F24>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    ACK = 0
+    TOO_MANY_SVIDS = 1
+    NO_MORE_TRACES = 2
+    INVALID_PERIOD = 3
+    SVID_UNKNOWN = 4
+    INVALID_REPGSZ = 5
+
+
 class TID(DataItemBase):
     """Terminal ID
 
@@ -2724,6 +3213,52 @@ class TIMESTAMP(DataItemBase):
     __count__ = 32
 
 
+class TOTSMP(DataItemBase):
+    """Total samples
+
+    Number of samples to be made, 0 terminates the trace.
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F23 <secsgem.secs.functions.SecsS02F23>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8]
+
+
+class TRID(DataItemBase):
+    """Trace request ID
+
+    :Types:
+       - :class:`SecsVarString <secsgem.secs.variables.SecsVarString>`
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F23 <secsgem.secs.functions.SecsS02F23>`
+        - :class:`SecsS06F01 <secsgem.secs.functions.SecsS06F01>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarString]
+
+
 class UNITS(DataItemBase):
     """Units identifier
 
@@ -2740,6 +3275,32 @@ class UNITS(DataItemBase):
     __type__ = SecsVarString
 
 
+class UPPERDB(DataItemBase):
+    """Upper deadband of a limit
+
+    The variable enters the zone above the limit when the value rises above the upper deadband.
+
+    :Types:
+       - :class:`SecsVarI8 <secsgem.secs.variables.SecsVarI8>`
+       - :class:`SecsVarI1 <secsgem.secs.variables.SecsVarI1>`
+       - :class:`SecsVarI2 <secsgem.secs.variables.SecsVarI2>`
+       - :class:`SecsVarI4 <secsgem.secs.variables.SecsVarI4>`
+       - :class:`SecsVarF8 <secsgem.secs.variables.SecsVarF8>`
+       - :class:`SecsVarF4 <secsgem.secs.variables.SecsVarF4>`
+       - :class:`SecsVarU8 <secsgem.secs.variables.SecsVarU8>`
+       - :class:`SecsVarU1 <secsgem.secs.variables.SecsVarU1>`
+       - :class:`SecsVarU2 <secsgem.secs.variables.SecsVarU2>`
+       - :class:`SecsVarU4 <secsgem.secs.variables.SecsVarU4>`
+
+    **Used In Function**
+        - :class:`SecsS02F45 <secsgem.secs.functions.SecsS02F45>`
+        - :class:`SecsS02F48 <secsgem.secs.functions.SecsS02F48>`
+    """
+
+    __type__ = SecsVarDynamic
+    __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarF4, SecsVarF8]
+
+
 class V(DataItemBase):
     """Variable data
 
@@ -2804,6 +3365,38 @@ class VID(DataItemBase):
     __allowedtypes__ = [SecsVarU1, SecsVarU2, SecsVarU4, SecsVarU8, SecsVarI1, SecsVarI2, SecsVarI4, SecsVarI8, SecsVarString]
 
 
+class VLAACK(DataItemBase):
+    """Variable limit attribute acknowledge
+
+       :Types: :class:`SecsVarBinary <secsgem.secs.variables.SecsVarBinary>`
+       :Length: 1
+
+    **Values**
+        +-------+----------------------------------------+---------------------------------------------------------------+
+        | Value | Description                            | Constant                                                      |
+        +=======+========================================+===============================================================+
+        | 0     | Acknowledge, command will be performed | :const:`secsgem.secs.dataitems.VLAACK.ACK`                    |
+        +-------+----------------------------------------+---------------------------------------------------------------+
+        | 1     | Limit attribute definition error       | :const:`secsgem.secs.dataitems.VLAACK.LIMIT_DEFINITION_ERROR` |
+        +-------+----------------------------------------+---------------------------------------------------------------+
+        | 2     | Cannot perform at this time            | :const:`secsgem.secs.dataitems.VLAACK.NOT_NOW`                |
+        +-------+----------------------------------------+---------------------------------------------------------------+
+        | 3-63  | Reserved                               |                                                               |
+        +-------+----------------------------------------+---------------------------------------------------------------+
+
+    **Used In Function**
+        - :class:`SecsS02F46 <secsgem.secs.functions.SecsS02F46>`
+
+    """
+
+    __type__ = SecsVarBinary
+    __count__ = 1
+
+    ACK = 0
+    LIMIT_DEFINITION_ERROR = 1
+    NOT_NOW = 2
+
+
 class XDIES(DataItemBase):
     """Die size/index X-axis
 
@@ -192,3 +192,57 @@ class SecsStreamFunction(with_metaclass(StructureDisplayingMeta)):
             return SecsVar.get_format(cls._dataFormat)
         else:
             return "Header only"
+
+
+class SecsEncodedStreamFunction(object):
+    """Stream function with data encoded in advance
+
+    Sent in place of a :class:`secsgem.secs.functionbase.SecsStreamFunction`, so the data isn't encoded again.
+    Used for large or repeated messages, the data is only decoded for displaying the function.
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsEncodedStreamFunction(secsgem.SecsS01F04, secsgem.SecsS01F04([1, "text"]).encode())
+        S1F4
+          <L [2]
+            <U1 1 >
+            <A "text">
+          > .
+
+    :param function: stream function class
+    :type function: class derived from :class:`secsgem.secs.functionbase.SecsStreamFunction`
+    :param data: encoded data
+    :type data: bytes
+    """
+
+    def __init__(self, function, data):
+        self.stream = function._stream  # noqa
+        self.function = function._function  # noqa
+        self.is_reply_required = function._isReplyRequired  # noqa
+
+        self._function_class = function
+        self._data = data
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class"""
+        return repr(self.decode())
+
+    def encode(self):
+        """Get the encoded data
+
+        :returns: encoded data
+        :rtype: bytes
+        """
+        return self._data
+
+    def decode(self):
+        """Decode the data to the stream function
+
+        :returns: the decoded function
+        :rtype: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        """
+        function = self._function_class()
+        function.decode(self._data)
+
+        return function
@@ -914,6 +914,110 @@ class SecsS02F18(SecsStreamFunction):
     _isMultiBlock = False
 
 
+class SecsS02F23(SecsStreamFunction):
+    """Trace initialize - send
+
+    **Data Items**
+
+    - :class:`TRID <secsgem.secs.dataitems.TRID>`
+    - :class:`DSPER <secsgem.secs.dataitems.DSPER>`
+    - :class:`TOTSMP <secsgem.secs.dataitems.TOTSMP>`
+    - :class:`REPGSZ <secsgem.secs.dataitems.REPGSZ>`
+    - :class:`SVID <secsgem.secs.dataitems.SVID>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F23
+        {
+            TRID: U1/U2/U4/U8/I1/I2/I4/I8/A
+            DSPER: A
+            TOTSMP: U1/U2/U4/U8/I1/I2/I4/I8
+            REPGSZ: U1/U2/U4/U8/I1/I2/I4/I8
+            SVID: [
+                DATA: U1/U2/U4/U8/I1/I2/I4/I8/A
+                ...
+            ]
+        }
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F23({"TRID": 1, "DSPER": "000001", "TOTSMP": 10, "REPGSZ": 5, "SVID": [1001, 1002]})
+        S2F23 W
+          <L [5]
+            <U1 1 >
+            <A "000001">
+            <U1 10 >
+            <U1 5 >
+            <L [2]
+              <U2 1001 >
+              <U2 1002 >
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: dict
+    """
+
+    _stream = 2
+    _function = 23
+
+    _dataFormat = [
+        TRID,
+        DSPER,
+        TOTSMP,
+        REPGSZ,
+        [SVID]
+    ]
+
+    _toHost = False
+    _toEquipment = True
+
+    _hasReply = True
+    _isReplyRequired = True
+
+    _isMultiBlock = True
+
+
+class SecsS02F24(SecsStreamFunction):
+    """Trace initialize - acknowledge
+
+    **Data Items**
+
+    - :class:`TIAACK <secsgem.secs.dataitems.TIAACK>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F24
+        TIAACK: B[1]
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F24(secsgem.TIAACK.SVID_UNKNOWN)
+        S2F24
+          <B 0x4> .
+
+    :param value: parameters for this function (see example)
+    :type value: byte
+    """
+
+    _stream = 2
+    _function = 24
+
+    _dataFormat = TIAACK
+
+    _toHost = True
+    _toEquipment = False
+
+    _hasReply = False
+    _isReplyRequired = False
+
+    _isMultiBlock = False
+
+
 class SecsS02F29(SecsStreamFunction):
     """equipment constant namelist - request
 
@@ -1501,6 +1605,457 @@ class SecsS02F42(SecsStreamFunction):
     _isMultiBlock = False
 
 
+class SecsS02F43(SecsStreamFunction):
+    """reset spooling streams and functions
+
+    **Data Items**
+
+    - :class:`STRID <secsgem.secs.dataitems.STRID>`
+    - :class:`FCNID <secsgem.secs.dataitems.FCNID>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F43
+        [
+            {
+                STRID: U1
+                FCNID: [
+                    DATA: U1
+                    ...
+                ]
+            }
+            ...
+        ]
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F43([{"STRID": 5, "FCNID": [1]}, {"STRID": 6, "FCNID": []}])
+        S2F43 W
+          <L [2]
+            <L [2]
+              <U1 5 >
+              <L [1]
+                <U1 1 >
+              >
+            >
+            <L [2]
+              <U1 6 >
+              <L>
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: list
+    """
+
+    _stream = 2
+    _function = 43
+
+    _dataFormat = [
+        [
+            STRID,
+            [FCNID]
+        ]
+    ]
+
+    _toHost = False
+    _toEquipment = True
+
+    _hasReply = True
+    _isReplyRequired = True
+
+    _isMultiBlock = False
+
+
+class SecsS02F44(SecsStreamFunction):
+    """reset spooling - acknowledge
+
+    **Data Items**
+
+    - :class:`RSPACK <secsgem.secs.dataitems.RSPACK>`
+    - :class:`STRID <secsgem.secs.dataitems.STRID>`
+    - :class:`STRACK <secsgem.secs.dataitems.STRACK>`
+    - :class:`FCNID <secsgem.secs.dataitems.FCNID>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F44
+        {
+            RSPACK: B[1]
+            DATA: [
+                {
+                    STRID: U1
+                    STRACK: B[1]
+                    FCNID: [
+                        DATA: U1
+                        ...
+                    ]
+                }
+                ...
+            ]
+        }
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F44({"RSPACK": secsgem.RSPACK.REJECTED, \
+            "DATA": [{"STRID": 1, "STRACK": secsgem.STRACK.SPOOLING_NOT_ALLOWED, "FCNID": []}]})
+        S2F44
+          <L [2]
+            <B 0x1>
+            <L [1]
+              <L [3]
+                <U1 1 >
+                <B 0x1>
+                <L>
+              >
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: dict
+    """
+
+    _stream = 2
+    _function = 44
+
+    _dataFormat = [
+        RSPACK,
+        [
+            [
+                STRID,
+                STRACK,
+                [FCNID]
+            ]
+        ]
+    ]
+
+    _toHost = True
+    _toEquipment = False
+
+    _hasReply = False
+    _isReplyRequired = False
+
+    _isMultiBlock = True
+
+
+class SecsS02F45(SecsStreamFunction):
+    """define variable limit attributes
+
+    **Data Items**
+
+    - :class:`DATAID <secsgem.secs.dataitems.DATAID>`
+    - :class:`VID <secsgem.secs.dataitems.VID>`
+    - :class:`LIMITID <secsgem.secs.dataitems.LIMITID>`
+    - :class:`UPPERDB <secsgem.secs.dataitems.UPPERDB>`
+    - :class:`LOWERDB <secsgem.secs.dataitems.LOWERDB>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F45
+        {
+            DATAID: U1/U2/U4/U8/I1/I2/I4/I8/A
+            DATA: [
+                {
+                    VID: U1/U2/U4/U8/I1/I2/I4/I8/A
+                    LIMIT: [
+                        {
+                            LIMITID: B[1]
+                            UPPERDB: U1/U2/U4/U8/I1/I2/I4/I8/F4/F8
+                            LOWERDB: U1/U2/U4/U8/I1/I2/I4/I8/F4/F8
+                        }
+                        ...
+                    ]
+                }
+                ...
+            ]
+        }
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F45({"DATAID": 1, "DATA": [{"VID": 10, "LIMIT": [{"LIMITID": 1, "UPPERDB": 80, "LOWERDB": 70}]}]})
+        S2F45 W
+          <L [2]
+            <U1 1 >
+            <L [1]
+              <L [2]
+                <U1 10 >
+                <L [1]
+                  <L [3]
+                    <B 0x1>
+                    <U1 80 >
+                    <U1 70 >
+                  >
+                >
+              >
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: dict
+    """
+
+    _stream = 2
+    _function = 45
+
+    _dataFormat = [
+        DATAID,
+        [
+            [
+                VID,
+                [
+                    [
+                        "LIMIT",   # name of the list
+                        LIMITID,
+                        UPPERDB,
+                        LOWERDB
+                    ]
+                ]
+            ]
+        ]
+    ]
+
+    _toHost = False
+    _toEquipment = True
+
+    _hasReply = True
+    _isReplyRequired = True
+
+    _isMultiBlock = True
+
+
+class SecsS02F46(SecsStreamFunction):
+    """define variable limit attributes - acknowledge
+
+    .. caution::
+
+        The limit status is an empty list if the limit was accepted,
+        otherwise a list of two items with the LIMITID and the LIMITACK.
+        Be sure to fill the array accordingly.
+
+    **Data Items**
+
+    - :class:`VLAACK <secsgem.secs.dataitems.VLAACK>`
+    - :class:`VID <secsgem.secs.dataitems.VID>`
+    - :class:`LVACK <secsgem.secs.dataitems.LVACK>`
+    - :class:`LIMITID <secsgem.secs.dataitems.LIMITID>`
+    - :class:`LIMITACK <secsgem.secs.dataitems.LIMITACK>`
+
+    **Structure**::
+
+        {
+            VLAACK: B[1]
+            DATA: [
+                {
+                    VID: U1/U2/U4/U8/I1/I2/I4/I8/A
+                    LVACK: B[1]
+                    LIMITACK: [
+                        LIMITID: B[1]
+                        LIMITACK: B[1]
+                    ]
+                }
+                ...
+            ]
+        }
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F46({"VLAACK": secsgem.VLAACK.LIMIT_DEFINITION_ERROR, \
+            "DATA": [{"VID": 10, "LVACK": secsgem.LVACK.LIMIT_VALUE_ERROR, "LIMITACK": [1, secsgem.LIMITACK.UPPERDB_BELOW_LOWERDB]}]})
+        S2F46
+          <L [2]
+            <B 0x1>
+            <L [1]
+              <L [3]
+                <U1 10 >
+                <B 0x4>
+                <L [2]
+                  <B 0x1>
+                  <B 0x5>
+                >
+              >
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: dict
+    """
+
+    _stream = 2
+    _function = 46
+
+    _dataFormat = [
+        VLAACK,
+        [
+            [
+                VID,
+                LVACK,
+                [LIMITACK]
+            ]
+        ]
+    ]
+
+    _toHost = True
+    _toEquipment = False
+
+    _hasReply = False
+    _isReplyRequired = False
+
+    _isMultiBlock = True
+
+
+class SecsS02F47(SecsStreamFunction):
+    """variable limit attribute request
+
+    **Data Items**
+
+    - :class:`VID <secsgem.secs.dataitems.VID>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F47
+        [
+            VID: U1/U2/U4/U8/I1/I2/I4/I8/A
+            ...
+        ]
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F47([10, "SV2"])
+        S2F47 W
+          <L [2]
+            <U1 10 >
+            <A "SV2">
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: list
+    """
+
+    _stream = 2
+    _function = 47
+
+    _dataFormat = [VID]
+
+    _toHost = False
+    _toEquipment = True
+
+    _hasReply = True
+    _isReplyRequired = True
+
+    _isMultiBlock = False
+
+
+class SecsS02F48(SecsStreamFunction):
+    """variable limit attribute - send
+
+    .. caution::
+
+        The attributes of a variable without limits capability are sent with empty items,
+        instead of an empty list as defined by the standard.
+
+    **Data Items**
+
+    - :class:`VID <secsgem.secs.dataitems.VID>`
+    - :class:`UNITS <secsgem.secs.dataitems.UNITS>`
+    - :class:`LIMITMIN <secsgem.secs.dataitems.LIMITMIN>`
+    - :class:`LIMITMAX <secsgem.secs.dataitems.LIMITMAX>`
+    - :class:`LIMITID <secsgem.secs.dataitems.LIMITID>`
+    - :class:`UPPERDB <secsgem.secs.dataitems.UPPERDB>`
+    - :class:`LOWERDB <secsgem.secs.dataitems.LOWERDB>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F48
+        [
+            {
+                VID: U1/U2/U4/U8/I1/I2/I4/I8/A
+                ATTRIBUTES: {
+                    UNITS: A
+                    LIMITMIN: U1/U2/U4/U8/I1/I2/I4/I8/F4/F8
+                    LIMITMAX: U1/U2/U4/U8/I1/I2/I4/I8/F4/F8
+                    LIMIT: [
+                        {
+                            LIMITID: B[1]
+                            UPPERDB: U1/U2/U4/U8/I1/I2/I4/I8/F4/F8
+                            LOWERDB: U1/U2/U4/U8/I1/I2/I4/I8/F4/F8
+                        }
+                        ...
+                    ]
+                }
+            }
+            ...
+        ]
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS02F48([{"VID": 10, "ATTRIBUTES": {"UNITS": "degC", "LIMITMIN": 0, "LIMITMAX": 100, \
+            "LIMIT": [{"LIMITID": 1, "UPPERDB": 80, "LOWERDB": 70}]}}])
+        S2F48
+          <L [1]
+            <L [2]
+              <U1 10 >
+              <L [4]
+                <A "degC">
+                <U1 0 >
+                <U1 100 >
+                <L [1]
+                  <L [3]
+                    <B 0x1>
+                    <U1 80 >
+                    <U1 70 >
+                  >
+                >
+              >
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: list
+    """
+
+    _stream = 2
+    _function = 48
+
+    _dataFormat = [
+        [
+            VID,
+            [
+                "ATTRIBUTES",   # name of the list
+                UNITS,
+                LIMITMIN,
+                LIMITMAX,
+                [
+                    [
+                        "LIMIT",   # name of the list
+                        LIMITID,
+                        UPPERDB,
+                        LOWERDB
+                    ]
+                ]
+            ]
+        ]
+    ]
+
+    _toHost = True
+    _toEquipment = False
+
+    _hasReply = False
+    _isReplyRequired = False
+
+    _isMultiBlock = True
+
+
 class SecsS05F00(SecsStreamFunction):
     """abort transaction stream 5
 
@@ -2451,6 +3006,106 @@ class SecsS06F00(SecsStreamFunction):
     _isMultiBlock = False
 
 
+class SecsS06F01(SecsStreamFunction):
+    """Trace data - send
+
+    **Data Items**
+
+    - :class:`TRID <secsgem.secs.dataitems.TRID>`
+    - :class:`SMPLN <secsgem.secs.dataitems.SMPLN>`
+    - :class:`STIME <secsgem.secs.dataitems.STIME>`
+    - :class:`SV <secsgem.secs.dataitems.SV>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F01
+        {
+            TRID: U1/U2/U4/U8/I1/I2/I4/I8/A
+            SMPLN: U1/U2/U4/U8/I1/I2/I4/I8
+            STIME: A
+            SV: [
+                DATA: L/BOOLEAN/U1/U2/U4/U8/I1/I2/I4/I8/F4/F8/A/B
+                ...
+            ]
+        }
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F01({"TRID": 1, "SMPLN": 3, "STIME": "20161231235959", "SV": [secsgem.SecsVarF4(1.5), secsgem.SecsVarF4(2.5)]})
+        S6F1 W
+          <L [4]
+            <U1 1 >
+            <U1 3 >
+            <A "20161231235959">
+            <L [2]
+              <F4 1.5 >
+              <F4 2.5 >
+            >
+          > .
+
+    :param value: parameters for this function (see example)
+    :type value: dict
+    """
+
+    _stream = 6
+    _function = 1
+
+    _dataFormat = [
+        TRID,
+        SMPLN,
+        STIME,
+        [SV]
+    ]
+
+    _toHost = True
+    _toEquipment = False
+
+    _hasReply = True
+    _isReplyRequired = True
+
+    _isMultiBlock = True
+
+
+class SecsS06F02(SecsStreamFunction):
+    """Trace data - acknowledge
+
+    **Data Items**
+
+    - :class:`ACKC6 <secsgem.secs.dataitems.ACKC6>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F02
+        ACKC6: B[1]
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F02(secsgem.ACKC6.ACCEPTED)
+        S6F2
+          <B 0x0> .
+
+    :param value: parameters for this function (see example)
+    :type value: byte
+    """
+
+    _stream = 6
+    _function = 2
+
+    _dataFormat = ACKC6
+
+    _toHost = False
+    _toEquipment = True
+
+    _hasReply = False
+    _isReplyRequired = False
+
+    _isMultiBlock = False
+
+
 class SecsS06F05(SecsStreamFunction):
     """multi block data inquiry
 
@@ -3080,6 +3735,82 @@ class SecsS06F22(SecsStreamFunction):
     _isMultiBlock = True
 
 
+class SecsS06F23(SecsStreamFunction):
+    """Request spooled data
+
+    **Data Items**
+
+    - :class:`RSDC <secsgem.secs.dataitems.RSDC>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F23
+        RSDC: U1
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F23(secsgem.RSDC.PURGE)
+        S6F23 W
+          <U1 1 > .
+
+    :param value: parameters for this function (see example)
+    :type value: byte
+    """
+
+    _stream = 6
+    _function = 23
+
+    _dataFormat = RSDC
+
+    _toHost = False
+    _toEquipment = True
+
+    _hasReply = True
+    _isReplyRequired = True
+
+    _isMultiBlock = False
+
+
+class SecsS06F24(SecsStreamFunction):
+    """Request spooled data acknowledge send
+
+    **Data Items**
+
+    - :class:`RSDA <secsgem.secs.dataitems.RSDA>`
+
+    **Structure**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F24
+        RSDA: B[1]
+
+    **Example**::
+
+        >>> import secsgem
+        >>> secsgem.SecsS06F24(secsgem.RSDA.DENIED_BUSY)
+        S6F24
+          <B 0x1> .
+
+    :param value: parameters for this function (see example)
+    :type value: byte
+    """
+
+    _stream = 6
+    _function = 24
+
+    _dataFormat = RSDA
+
+    _toHost = True
+    _toEquipment = False
+
+    _hasReply = False
+    _isReplyRequired = False
+
+    _isMultiBlock = False
+
+
 class SecsS07F00(SecsStreamFunction):
     """abort transaction stream 7
 
@@ -5778,6 +6509,8 @@ secsStreamsFunctions = {
         16: SecsS02F16,
         17: SecsS02F17,
         18: SecsS02F18,
+        23: SecsS02F23,
+        24: SecsS02F24,
         29: SecsS02F29,
         30: SecsS02F30,
         33: SecsS02F33,
@@ -5788,6 +6521,12 @@ secsStreamsFunctions = {
         38: SecsS02F38,
         41: SecsS02F41,
         42: SecsS02F42,
+        43: SecsS02F43,
+        44: SecsS02F44,
+        45: SecsS02F45,
+        46: SecsS02F46,
+        47: SecsS02F47,
+        48: SecsS02F48,
     },
     5: {
         0: SecsS05F00,
@@ -5812,6 +6551,8 @@ secsStreamsFunctions = {
     },
     6: {
         0: SecsS06F00,
+        1: SecsS06F01,
+        2: SecsS06F02,
         5: SecsS06F05,
         6: SecsS06F06,
         7: SecsS06F07,
@@ -5824,6 +6565,8 @@ secsStreamsFunctions = {
         20: SecsS06F20,
         21: SecsS06F21,
         22: SecsS06F22,
+        23: SecsS06F23,
+        24: SecsS06F24,
     },
     7: {
         1: SecsS07F01,
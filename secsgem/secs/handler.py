@@ -54,6 +54,15 @@ class SecsHandler(HsmsHandler):
 
         self.secsStreamsFunctions = copy.deepcopy(functions.secsStreamsFunctions)
 
+        # resolved callbacks by (stream, function), cleared when the registered callbacks change
+        self._sf_callbacks = {}
+        self._sf_callbacks_version = None
+
+        # executor for the stream/function callbacks, a thread is started for every message if None
+        self.callback_executor = None
+        # order callbacks per stream instead of per connection, if the executor supports lanes
+        self.callback_lane_per_stream = False
+
     def _generate_sf_callback_name(self, stream, function):
         return "s{stream:02d}f{function:02d}".format(stream=stream, function=function)
 
@@ -195,19 +204,44 @@ class SecsHandler(HsmsHandler):
         """
         return self._remoteCommands
 
+    def _get_sf_callback(self, stream, function):
+        """Get the callback function for a stream and function
+
+        The resolved callbacks are kept in a table, that is rebuilt after callbacks were registered or unregistered.
+
+        :param stream: stream of the callback
+        :type stream: integer
+        :param function: function of the callback
+        :type function: integer
+        :returns: callback or None if no callback is available
+        :rtype: callable
+        """
+        version = self._callback_handler._version  # noqa
+        if self._sf_callbacks_version != version:
+            self._sf_callbacks = {}
+            self._sf_callbacks_version = version
+
+        callbacks = self._sf_callbacks
+        try:
+            return callbacks[(stream, function)]
+        except KeyError:
+            callback = self._callback_handler._resolve(self._generate_sf_callback_name(stream, function))  # noqa
+            callbacks[(stream, function)] = callback
+            return callback
+
     def _handle_stream_function(self, packet):
-        sf_callback_index = self._generate_sf_callback_name(packet.header.stream, packet.header.function)
+        callback = self._get_sf_callback(packet.header.stream, packet.header.function)
 
         # return S09F05 if no callback present
-        if sf_callback_index not in self._callback_handler:
-            self.logger.warning("unexpected function received %s\n%s", sf_callback_index, packet.header)
+        if callback is None:
+            self.logger.warning("unexpected function received %s\n%s", \
+                self._generate_sf_callback_name(packet.header.stream, packet.header.function), packet.header)
             if packet.header.requireResponse:
                 self.send_response(self.stream_function(9, 5)(packet.header.encode()), packet.header.system)
             
             return
 
         try:
-            callback = getattr(self._callback_handler, sf_callback_index)
             result = callback(self, packet)
             if result is not None:
                 self.send_response(result, packet.header.system)
@@ -215,15 +249,64 @@ class SecsHandler(HsmsHandler):
             self.logger.exception('Callback aborted because of exception, abort sent')
             self.send_response(self.stream_function(packet.header.stream, 0)(), packet.header.system)
 
+    def _get_callback_lane(self, packet):
+        """Get the lane the callback for a packet is ordered in
+
+        :param packet: received data packet
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        :returns: lane key for the executor
+        :rtype: various
+        """
+        if self.callback_lane_per_stream:
+            return self, packet.header.stream
+
+        return self
+
+    def _dispatch_stream_function(self, packet, thread_name):
+        """Run the callback for a packet using the callback executor
+
+        This is called on the thread receiving the messages, so the worker pools are never waited for.
+        If their queue is full the message is answered with an abort, independent of the policy of the pool.
+        Otherwise a callback waiting for a reply would stall until T3, because the reply can't be received.
+
+        :param packet: received data packet
+        :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
+        :param thread_name: name for the callback thread, if no executor is configured
+        :type thread_name: string
+        """
+        if self.callback_executor is None:
+            threading.Thread(target=self._handle_stream_function, args=(packet, ), name=thread_name).start()
+            return
+
+        try:
+            if hasattr(self.callback_executor, "offer_prioritized_ordered"):
+                priority = self.callback_executor.get_priority(packet.header.stream, packet.header.function)
+                accepted = self.callback_executor.offer_prioritized_ordered(priority, self._get_callback_lane(packet), \
+                    self._handle_stream_function, packet)
+            elif hasattr(self.callback_executor, "offer_prioritized"):
+                priority = self.callback_executor.get_priority(packet.header.stream, packet.header.function)
+                accepted = self.callback_executor.offer_prioritized(priority, self._handle_stream_function, packet)
+            elif hasattr(self.callback_executor, "offer_ordered"):
+                accepted = self.callback_executor.offer_ordered(self._get_callback_lane(packet), self._handle_stream_function, packet)
+            else:
+                self.callback_executor.submit(self._handle_stream_function, packet)
+                accepted = True
+        except Exception:
+            self.logger.exception("callback executor failed to accept message")
+            accepted = False
+
+        if not accepted:
+            self.logger.warning("callback executor rejected S%02dF%02d, abort sent", packet.header.stream, packet.header.function)
+            if packet.header.requireResponse:
+                self.send_response(self.stream_function(packet.header.stream, 0)(), packet.header.system)
+
     def _on_hsms_packet_received(self, packet):
         """Packet received from hsms layer
 
         :param packet: received data packet
         :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
         """
-        # check if callbacks available for this stream and function
-        threading.Thread(target=self._handle_stream_function, args=(packet, ), \
-            name="secsgem_secsHandler_callback_S{}F{}".format(packet.header.stream, packet.header.function)).start()
+        self._dispatch_stream_function(packet, "secsgem_secsHandler_callback_S{}F{}".format(packet.header.stream, packet.header.function))
 
     def disable_ceids(self):
         """Disable all Collection Events."""
@@ -411,6 +494,8 @@ class SecsHandler(HsmsHandler):
     def secs_decode(self, packet):
         """Get object of decoded stream and function class, or None if no class is available.
 
+        The decoded object is cached on the packet, so the communication log and the callback share a single decode.
+
         :param packet: packet to get object for
         :type packet: :class:`secsgem.hsms.packets.HsmsPacket`
         :return: matching stream and function object
@@ -419,6 +504,9 @@ class SecsHandler(HsmsHandler):
         if packet is None:
             return None
 
+        if packet.decoded is not None:
+            return packet.decoded
+
         if packet.header.stream not in self.secsStreamsFunctions:
             self.logger.warning("unknown function S%02dF%02d", packet.header.stream, packet.header.function)
             return None
@@ -430,4 +518,6 @@ class SecsHandler(HsmsHandler):
         function = self.secsStreamsFunctions[packet.header.stream][packet.header.function]()
         function.decode(packet.data)
 
+        packet.decoded = function
+
         return function
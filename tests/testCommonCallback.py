@@ -124,3 +124,30 @@ class TestCallbackHandler(unittest.TestCase):
 
         for callback in callbackHandler:
             print(callback)
+
+    def testResolve(self):
+        f = Mock()
+        c = Mock()
+
+        callbackHandler = secsgem.CallbackHandler()
+        callbackHandler.target = c
+        callbackHandler.test = f
+
+        self.assertIs(callbackHandler._resolve("test"), f)
+        self.assertIs(callbackHandler._resolve("other"), c._on_other)
+
+    def testResolveNone(self):
+        callbackHandler = secsgem.CallbackHandler()
+
+        self.assertIsNone(callbackHandler._resolve("test"))
+
+    def testVersionChangesOnRegistration(self):
+        callbackHandler = secsgem.CallbackHandler()
+        version = callbackHandler._version
+
+        callbackHandler.test = Mock()
+        self.assertNotEqual(callbackHandler._version, version)
+        version = callbackHandler._version
+
+        callbackHandler.test = None
+        self.assertNotEqual(callbackHandler._version, version)
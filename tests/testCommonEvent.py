@@ -14,6 +14,7 @@
 # GNU Lesser General Public License for more details.
 #####################################################################
 
+import threading
 import unittest
 
 from mock import Mock
@@ -138,4 +139,71 @@ class TestEventProducer(unittest.TestCase):
         with self.assertRaises(AttributeError):
             producer.targets = test
 
+    def testFireResolvesNewTarget(self):
+        c1 = Mock()
+        c2 = Mock()
+
+        producer = secsgem.EventProducer()
+
+        producer.targets += c1
+        producer.fire("test", "dummydata")
+
+        producer.targets += c2
+        producer.fire("test", "dummydata")
+
+        producer.targets -= c1
+        producer.fire("test", "dummydata")
+
+        self.assertEqual(c1._on_event_test.call_count, 2)
+        self.assertEqual(c2._on_event_test.call_count, 2)
+
+    def testFireAsync(self):
+        f = Mock()
+        c = Mock()
+
+        producer = secsgem.EventProducer()
+
+        producer.targets += c
+        producer.test += f
+
+        producer.start_async_delivery()
+        producer.fire("test", "dummydata")
+        producer.stop_async_delivery()
+
+        f.assert_called_once_with("dummydata")
+        c._on_event_test.assert_called_once_with("dummydata")
+
+    def testFireAsyncWhileStopping(self):
+        delivered = []
+
+        producer = secsgem.EventProducer()
+        producer.test += delivered.append
+
+        def fire_events():
+            for _ in range(1000):
+                producer.fire("test", "dummydata")
+
+        producer.start_async_delivery()
+
+        thread = threading.Thread(target=fire_events)
+        thread.start()
+        producer.stop_async_delivery()
+        thread.join()
+
+        # events fired after the stop are delivered directly, none is lost
+        self.assertEqual(len(delivered), 1000)
+
+    def testFireAsyncDropsWhenFull(self):
+        release = threading.Event()
+        producer = secsgem.EventProducer()
+
+        producer.test += lambda data: release.wait()
+
+        producer.start_async_delivery(1, False)
+        for _ in range(5):
+            producer.fire("test", "dummydata")
+
+        self.assertGreater(producer.dropped_events, 0)
 
+        release.set()
+        producer.stop_async_delivery()
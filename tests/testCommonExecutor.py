@@ -0,0 +1,234 @@
+#####################################################################
+# testCommonExecutor.py
+#
+# (c) Copyright 2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import threading
+import time
+import unittest
+
+import secsgem
+
+class TestOrderedWorkerPool(unittest.TestCase):
+    def testInvalidPolicy(self):
+        self.assertRaises(ValueError, secsgem.OrderedWorkerPool, 1, 1, "invalid")
+
+    def testLaneOrder(self):
+        pool = secsgem.OrderedWorkerPool(4, None)
+        results = {"a": [], "b": []}
+
+        def task(lane, value):
+            time.sleep(0.001)
+            results[lane].append(value)
+
+        for i in range(50):
+            pool.submit_ordered("a", task, "a", i)
+            pool.submit_ordered("b", task, "b", i)
+
+        pool.shutdown()
+
+        self.assertEqual(results["a"], list(range(50)))
+        self.assertEqual(results["b"], list(range(50)))
+        self.assertEqual(pool.queue_depth, 0)
+
+    def testReject(self):
+        pool = secsgem.OrderedWorkerPool(1, 1, secsgem.EXECUTOR_POLICY_REJECT)
+        release = threading.Event()
+
+        self.assertTrue(pool.submit(release.wait))
+        self.assertFalse(pool.submit(release.wait))
+        self.assertEqual(pool.rejected, 1)
+
+        release.set()
+        pool.shutdown()
+
+    def testCallerRuns(self):
+        pool = secsgem.OrderedWorkerPool(1, 1, secsgem.EXECUTOR_POLICY_CALLER_RUNS)
+        release = threading.Event()
+        threads = []
+
+        pool.submit(release.wait)
+        pool.submit(lambda: threads.append(threading.current_thread()))
+
+        self.assertEqual(threads, [threading.current_thread()])
+
+        release.set()
+        pool.shutdown()
+
+    def testOfferDoesntBlock(self):
+        pool = secsgem.OrderedWorkerPool(1, 1, secsgem.EXECUTOR_POLICY_BLOCK)
+        release = threading.Event()
+
+        self.assertTrue(pool.offer_ordered(1, release.wait))
+        self.assertFalse(pool.offer_ordered(1, release.wait))
+        self.assertEqual(pool.rejected, 1)
+
+        release.set()
+        pool.shutdown()
+
+    def testSubmitAfterShutdown(self):
+        pool = secsgem.OrderedWorkerPool(1)
+        pool.shutdown()
+
+        self.assertFalse(pool.submit(lambda: None))
+
+    def testExceptionInTask(self):
+        pool = secsgem.OrderedWorkerPool(1)
+        results = []
+
+        def failing():
+            raise Exception("test")
+
+        pool.submit_ordered(1, failing)
+        pool.submit_ordered(1, results.append, 1)
+        pool.shutdown()
+
+        self.assertEqual(results, [1])
+
+
+class TestPriorityWorkerPool(unittest.TestCase):
+    def testInvalidPolicy(self):
+        self.assertRaises(ValueError, secsgem.PriorityWorkerPool, 1, None, 1, 1, "invalid")
+
+    def testGetPriority(self):
+        pool = secsgem.PriorityWorkerPool(1)
+
+        self.assertEqual(pool.get_priority(5, 1), secsgem.PRIORITY_HIGH)
+        self.assertEqual(pool.get_priority(6, 11), secsgem.PRIORITY_LOW)
+        self.assertEqual(pool.get_priority(12, 3), secsgem.PRIORITY_LOW)
+        self.assertEqual(pool.get_priority(1, 3), secsgem.PRIORITY_NORMAL)
+
+    def blockedPool(self, **kwargs):
+        pool = secsgem.PriorityWorkerPool(1, **kwargs)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        pool.submit_prioritized(0, block)
+        started.wait()
+
+        return pool, release
+
+    def testPriorityOrder(self):
+        pool, release = self.blockedPool()
+        results = []
+
+        pool.submit_prioritized(secsgem.PRIORITY_LOW, results.append, "low")
+        pool.submit_prioritized(secsgem.PRIORITY_NORMAL, results.append, "normal")
+        pool.submit_prioritized(secsgem.PRIORITY_HIGH, results.append, "high")
+
+        self.assertEqual(pool.queue_depths, {0: 1, 1: 1, 2: 1})
+
+        release.set()
+        pool.shutdown()
+
+        self.assertEqual(results, ["high", "normal", "low"])
+        self.assertEqual(pool.peak_queue_depths, {0: 1, 1: 1, 2: 1})
+
+    def testStarvationProtection(self):
+        pool, release = self.blockedPool(starvation_limit=2)
+        results = []
+
+        pool.submit_prioritized(secsgem.PRIORITY_LOW, results.append, "low")
+        for i in range(4):
+            pool.submit_prioritized(secsgem.PRIORITY_HIGH, results.append, i)
+
+        release.set()
+        pool.shutdown()
+
+        self.assertEqual(results, [0, 1, "low", 2, 3])
+
+    def testLaneOrder(self):
+        pool = secsgem.PriorityWorkerPool(4, max_queue_depth=None)
+        results = {"a": [], "b": []}
+
+        def task(lane, value):
+            time.sleep(0.001)
+            results[lane].append(value)
+
+        for i in range(50):
+            pool.offer_prioritized_ordered(secsgem.PRIORITY_NORMAL, "a", task, "a", i)
+            pool.offer_prioritized_ordered(secsgem.PRIORITY_NORMAL, "b", task, "b", i)
+
+        pool.shutdown()
+
+        self.assertEqual(results["a"], list(range(50)))
+        self.assertEqual(results["b"], list(range(50)))
+
+    def testLaneOrderPerPriority(self):
+        pool, release = self.blockedPool()
+        results = []
+
+        pool.offer_prioritized_ordered(secsgem.PRIORITY_LOW, "a", results.append, "low")
+        pool.offer_prioritized_ordered(secsgem.PRIORITY_HIGH, "a", results.append, "high")
+
+        release.set()
+        pool.shutdown()
+
+        # the lane doesn't order tasks of different priorities
+        self.assertEqual(results, ["high", "low"])
+
+    def testReject(self):
+        pool, release = self.blockedPool(max_queue_depth=1, policy=secsgem.EXECUTOR_POLICY_REJECT)
+
+        self.assertTrue(pool.submit_prioritized(secsgem.PRIORITY_LOW, lambda: None))
+        self.assertFalse(pool.submit_prioritized(secsgem.PRIORITY_LOW, lambda: None))
+        self.assertTrue(pool.submit_prioritized(secsgem.PRIORITY_HIGH, lambda: None))
+        self.assertEqual(pool.rejected[secsgem.PRIORITY_LOW], 1)
+
+        release.set()
+        pool.shutdown()
+
+    def testOfferDoesntBlock(self):
+        pool, release = self.blockedPool(max_queue_depth=1, policy=secsgem.EXECUTOR_POLICY_CALLER_RUNS)
+        results = []
+
+        self.assertTrue(pool.offer_prioritized(secsgem.PRIORITY_LOW, results.append, 1))
+        self.assertFalse(pool.offer_prioritized(secsgem.PRIORITY_LOW, results.append, 2))
+        self.assertEqual(pool.rejected[secsgem.PRIORITY_LOW], 1)
+
+        release.set()
+        pool.shutdown()
+
+        self.assertEqual(results, [1])
+
+    def testCallPrioritizedFromWorker(self):
+        # the only worker waiting for a task of the same pool would deadlock
+        pool = secsgem.PriorityWorkerPool(1)
+        results = []
+        done = threading.Event()
+
+        def task():
+            results.append(pool.call_prioritized(secsgem.PRIORITY_HIGH, lambda: threading.current_thread()))
+            done.set()
+
+        pool.submit(task)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].name.startswith("secsgem_priorityWorkerPool"))
+
+        pool.shutdown()
+
+    def testCallPrioritized(self):
+        pool = secsgem.PriorityWorkerPool(1)
+
+        self.assertEqual(pool.call_prioritized(secsgem.PRIORITY_HIGH, lambda value: value * 2, 21), 42)
+
+        pool.shutdown()
+
+        self.assertIsNone(pool.call_prioritized(secsgem.PRIORITY_HIGH, lambda: 1))
@@ -15,7 +15,10 @@
 #####################################################################
 
 import datetime
+import shutil
+import tempfile
 import threading
+import time
 import unittest
 
 from dateutil.tz import tzlocal
@@ -537,6 +540,26 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertEqual(SV[1].get(), u"")
         self.assertEqual(SV[2].get(), "")
 
+    def testStatusVariableNameListCached(self):
+        self.setupTestStatusVariables()
+        self.establishCommunication()
+
+        function = self.sendSVNamelistRequest()
+        response = self.client._namelist_responses[(1, 12)][2]
+
+        self.assertEqual(len(function), len(self.client.status_variables))
+
+        # unchanged status variables use the cached response
+        self.sendSVNamelistRequest()
+        self.assertIs(self.client._namelist_responses[(1, 12)][2], response)
+
+        self.client.status_variables[11] = secsgem.StatusVariable(11, "added", "mm", secsgem.SecsVarU4, False)
+
+        function = self.sendSVNamelistRequest()
+
+        self.assertIsNot(self.client._namelist_responses[(1, 12)][2], response)
+        self.assertIsNotNone(next((x for x in function if x[0].get() == 11), None))
+
     def sendSVRequest(self, svs=[]):
         system_id = self.server.get_next_system_counter()
         self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS01F03(svs)))
@@ -563,6 +586,22 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         SV2 = next((x for x in function if x.get() == u"sample sv"), None)
         self.assertIsNotNone(SV2)
 
+    def testStatusVariableAllEncoded(self):
+        self.setupTestStatusVariables(True)
+        self.establishCommunication()
+
+        self.client.on_sv_values_request = Mock(side_effect=lambda svids, svs: [sv.value_type(sv.value) for sv in svs])
+
+        svs = list(self.client.status_variables.values())
+        values = self.client._get_sv_values(svs)
+
+        self.assertEqual(self.client._encode_sv_values(values).encode(), self.client.stream_function(1, 4)(values).encode())
+
+        function = self.sendSVRequest()
+
+        self.assertEqual(len(function), len(svs))
+        self.assertEqual(self.client.on_sv_values_request.call_count, 2)
+
     def testStatusVariableLimited(self):
         self.setupTestStatusVariables()        
         self.establishCommunication()
@@ -595,6 +634,21 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertIsNotNone(SV10)
         self.assertEqual(SV10.get(), 123)
 
+    def testStatusVariableWithBatchCallback(self):
+        self.setupTestStatusVariables(True)
+        self.establishCommunication()
+
+        self.client.on_sv_values_request = Mock(return_value=[secsgem.SecsVarString("batch"), secsgem.SecsVarU4(456)])
+
+        function = self.sendSVRequest(["SV2", "asdfg", secsgem.SVID_CONTROL_STATE, 10])
+
+        self.assertEqual(self.client.on_sv_values_request.call_count, 1)
+        self.assertEqual(len(self.client.on_sv_values_request.call_args[0][1]), 2)
+
+        self.assertEqual(function[0].get(), u"batch")
+        self.assertEqual(function[1].get(), [])
+        self.assertEqual(function[3].get(), 456)
+
     def testStatusVariableInvalid(self):
         self.setupTestStatusVariables()        
         self.establishCommunication()
@@ -715,6 +769,83 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         function = self.sendSVRequest([secsgem.SVID_ALARMS_SET])
         self.assertEqual(function[0].get(), [])
 
+    def testStatusVariablePredefinedEventsEnabledUnlinked(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        first = self.client._get_sv_value(self.client.status_variables[secsgem.SVID_EVENTS_ENABLED])
+        second = self.client._get_sv_value(self.client.status_variables[secsgem.SVID_EVENTS_ENABLED])
+
+        # unchanged list is encoded once, every caller gets its own list object
+        self.assertIsNot(first, second)
+        self.assertIs(first.data[0], second.data[0])
+
+        first.data.append(first.data[0])
+        self.assertEqual(second.get(), [50])
+
+        # removing the link removes the collection event
+        self.sendCELinkReport(rptid=[])
+
+        function = self.sendSVRequest([secsgem.SVID_EVENTS_ENABLED])
+        self.assertEqual(function[0].get(), [])
+
+    def testStatusVariablePredefinedAlarmsAdded(self):
+        self.setupTestAlarms()
+        self.establishCommunication()
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_ENABLED, secsgem.SVID_ALARMS_SET])
+        self.assertEqual(function.get(), [[], []])
+
+        self.client.alarms.update({
+            35: secsgem.Alarm(35, "test alarm 3", "test text 3", secsgem.ALCD.PERSONAL_SAFETY, 100025, 200025, enabled=True, set=True),
+        })
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_ENABLED, secsgem.SVID_ALARMS_SET])
+        self.assertEqual(function.get(), [[35], [35]])
+
+        self.sendAlarmEnable(False, 35)
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_ENABLED, secsgem.SVID_ALARMS_SET])
+        self.assertEqual(function.get(), [[], [35]])
+
+    def testStatusVariablePredefinedAlarmsChangedDirectly(self):
+        self.setupTestAlarms()
+        self.establishCommunication()
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_ENABLED, secsgem.SVID_ALARMS_SET])
+        self.assertEqual(function.get(), [[], []])
+
+        # attributes written without the handler methods
+        self.client.alarms[25].enabled = True
+        self.client.alarms[30].set = True
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_ENABLED, secsgem.SVID_ALARMS_SET])
+        self.assertEqual(function.get(), [[25], [30]])
+
+        # replaced alarm with the same number of alarms
+        replaced = self.client.alarms[25]
+        self.client.alarms[25] = secsgem.Alarm(25, "test alarm", "test text", secsgem.ALCD.PERSONAL_SAFETY, 100025, 200025, set=True)
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_ENABLED, secsgem.SVID_ALARMS_SET])
+        self.assertEqual(sorted(function[0].get()), [])
+        self.assertEqual(sorted(function[1].get()), [25, 30])
+
+        # the replaced alarm doesn't change the states anymore
+        replaced.set = False
+        self.client.alarms[30].enabled = True
+
+        packet = self.server.generate_stream_function_packet(self.server.get_next_system_counter(), secsgem.SecsS05F07())
+        self.server.simulate_packet(packet)
+        function = self.client.secs_decode(self.server.expect_packet(function=8))
+
+        self.assertEqual([alarm["ALID"] for alarm in function.get()], [30])
+        self.assertEqual(function[0]["ALCD"].get() & secsgem.ALCD.ALARM_SET, secsgem.ALCD.ALARM_SET)
+
     def setupTestDataValues(self, use_callbacks=False):
         self.client.data_values.update({
             30: secsgem.DataValue(30, "sample1, numeric DV, SecsVarU4", secsgem.SecsVarU4, use_callbacks),
@@ -1223,6 +1354,175 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertEqual(function.RPT[0].V[0].get(), 31337)
         self.assertEqual(function.RPT[0].V[1].get(), 123)
 
+    def testCollectionEventPlan(self):
+        self.setupTestDataValues(True)
+        self.setupTestCollectionEvents()
+        self.setupTestStatusVariables()
+        self.establishCommunication()
+
+        self.client.on_dv_value_request = Mock(return_value=secsgem.SecsVarU4(31337))
+
+        self.sendCEDefineReport(rptid=1000, vid=[30, 10])
+        self.sendCEDefineReport(rptid=1001, vid=[30])
+        self.sendCELinkReport(rptid=[1000, 1001])
+        self.sendCEEnableReport()
+
+        plan = self.client._event_reports.plans[50]
+        self.assertEqual(len(plan.data_values), 1)
+        self.assertEqual(len(plan.status_variables), 1)
+
+        function = self.sendCERequestReport()
+
+        self.assertEqual(self.client.on_dv_value_request.call_count, 1)
+        self.assertEqual(function.RPT[0].V.get(), [31337, 123])
+        self.assertEqual(function.RPT[1].V.get(), [31337])
+
+        self.sendCEDefineReport(rptid=1001, vid=[])
+
+        function = self.sendCERequestReport()
+
+        self.assertEqual(len(function.RPT), 1)
+        self.assertEqual(function.RPT[0].RPTID.get(), 1000)
+
+    def sendIndividualReportRequest(self, rptid=1000):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS06F19(rptid)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 6)
+        self.assertEqual(packet.header.function, 20)
+
+        return self.client.secs_decode(packet)
+
+    def testIndividualReportRequest(self):
+        self.setupTestDataValues(True)
+        self.setupTestStatusVariables(True)
+        self.establishCommunication()
+
+        self.client.on_dv_values_request = Mock(return_value=[secsgem.SecsVarU4(31337)])
+
+        self.sendCEDefineReport(rptid=1000, vid=[10, 30])
+
+        function = self.sendIndividualReportRequest()
+
+        self.assertEqual(self.client.on_dv_values_request.call_count, 1)
+        self.assertEqual(function.get(), [123, 31337])
+
+        function = self.sendIndividualReportRequest(1001)
+
+        self.assertEqual(function.get(), [])
+
+    def testCollectionEventReportIndexes(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport(rptid=1000)
+        self.sendCEDefineReport(rptid=1001)
+        self.sendCELinkReport(rptid=[1000, 1001])
+
+        self.assertEqual(self.client._get_variable_collection_events(30), {50})
+
+        # link already defined
+        function = self.sendCELinkReport(rptid=[1001])
+        self.assertEqual(function.get(), 3)
+
+        # deleting a report removes it from the linked collection event
+        function = self.sendCEDefineReport(rptid=1000, vid=[])
+        self.assertEqual(function.get(), 0)
+
+        self.assertEqual(self.client.registered_collection_events[50].reports, [1001])
+        self.assertEqual([rptid for rptid, _ in self.client._event_reports.plans[50].reports], [1001])
+
+        # deleting the last report removes the link
+        self.sendCEDefineReport(rptid=1001, vid=[])
+
+        self.assertEqual(self.client.registered_collection_events, {})
+        self.assertEqual(self.client._get_variable_collection_events(30), set())
+        self.assertNotIn(50, self.client._event_reports.plans)
+
+    def testCollectionEventRemoveReportRepeatedVID(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        function = self.sendCEDefineReport(rptid=1000, vid=[30, 30])
+        self.assertEqual(function.get(), 0)
+
+        self.sendCEDefineReport(rptid=1001, vid=[30])
+
+        function = self.sendCEDefineReport(rptid=1000, vid=[])
+        self.assertEqual(function.get(), 0)
+
+        self.assertEqual(list(self.client.registered_reports), [1001])
+        self.assertEqual(self.client._event_reports.variable_reports[30], frozenset([1001]))
+
+    def testCollectionEventReportSnapshot(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport(rptid=1000)
+        self.sendCELinkReport(rptid=[1000])
+        self.sendCEEnableReport()
+
+        model = self.client._event_reports
+
+        self.sendCEDefineReport(rptid=1001)
+        self.sendCELinkReport(rptid=[1001])
+        self.sendCEEnableReport(enable=False)
+
+        # changes by the host are published as a new version, a model taken before stays unchanged
+        self.assertGreater(self.client._event_reports.version, model.version)
+        self.assertEqual(list(model.reports), [1000])
+        self.assertEqual(model.links[50].reports, [1000])
+        self.assertTrue(model.links[50].enabled)
+        self.assertEqual(model.events_enabled.ids(), [50])
+        self.assertEqual([rptid for rptid, _ in model.plans[50].reports], [1000])
+
+        self.assertEqual(self.client.registered_collection_events[50].reports, [1000, 1001])
+        self.assertFalse(self.client.registered_collection_events[50].enabled)
+        self.assertEqual(self.client._get_events_enabled(), [])
+
+        self.assertEqual([report["RPTID"] for report in self.client._build_collection_event(50, model)], [1000])
+
+        # removing all reports keeps the old model intact
+        self.sendCEDefineReport(empty_data=True)
+
+        self.assertEqual(self.client.registered_reports, {})
+        self.assertEqual(model.links[50].reports, [1000])
+
+    def testCollectionEventReportCopyShared(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        for rptid in range(1000, 1100):
+            self.sendCEDefineReport(rptid=rptid)
+
+        model = self.client._event_reports
+        copied = model.copy()
+
+        # the copy shares the entries, a change only replaces the entries it touches
+        self.assertIs(copied.reports[1050], model.reports[1050])
+
+        del copied.reports[1050]
+        copied.reports[2000] = model.reports[1000]
+
+        self.assertEqual(len(model.reports), 100)
+        self.assertIn(1050, model.reports)
+        self.assertNotIn(2000, model.reports)
+        self.assertEqual(len(copied.reports), 100)
+        self.assertNotIn(1050, copied.reports)
+        self.assertIs(copied.reports[1051], model.reports[1051])
+        self.assertEqual(set(copied.reports), set(range(1000, 1100)) - set([1050]) | set([2000]))
+
+        copied.events_enabled.update(50, True)
+        self.assertNotIn(50, model.events_enabled)
+        self.assertEqual(copied.events_enabled.ids(), [50])
+
     def testCollectionEventTrigger(self):
         self.setupTestDataValues()
         self.setupTestCollectionEvents()
@@ -1256,6 +1556,64 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertEqual(function.RPT[0].RPTID.get(), 1000)
         self.assertEqual(function.RPT[0].V[0].get(), 31337)
 
+    def testCollectionEventTriggerAsync(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        self.client.collectionEventWindow = 2
+
+        acknowledged = []
+        emissions = self.client.trigger_collection_events_async([50, 50, 50], acknowledged.append)
+
+        self.assertEqual(len(emissions), 3)
+
+        first = self.server.expect_packet(function=11)
+        second = self.server.expect_packet(function=11)
+
+        # window is full, third event waits for acknowledge
+        time.sleep(0.1)
+        self.assertEqual(len([packet for packet in self.server.connection.packets if packet.header.function == 11]), 0)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(second.header.system, secsgem.SecsS06F12(0)))
+
+        third = self.server.expect_packet(function=11)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(first.header.system, secsgem.SecsS06F12(0)))
+        self.server.simulate_packet(self.server.generate_stream_function_packet(third.header.system, secsgem.SecsS06F12(1)))
+
+        for emission in emissions:
+            self.assertTrue(emission.wait(1))
+
+        self.assertEqual(acknowledged, [emissions[1], emissions[0], emissions[2]])
+        self.assertTrue(emissions[0].acknowledged)
+        self.assertFalse(emissions[2].acknowledged)
+        self.assertEqual(emissions[2].ack, 1)
+
+        function = self.client.secs_decode(first)
+        self.assertEqual(function.CEID.get(), 50)
+        self.assertEqual(function.RPT[0].V[0].get(), 31337)
+
+    def testCollectionEventTriggerAsyncSendFails(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        self.server.fail_next_send()
+        emission = self.client.trigger_collection_events_async(50)[0]
+
+        self.assertTrue(emission.wait(1))
+        self.assertIsNone(emission.ack)
+        self.assertEqual(emission.error, "sending failed")
+
     def setupTestEquipmentConstants(self, use_callback = False):
         self.client.equipment_constants.update({
             20: secsgem.EquipmentConstant(20, "sample1, numeric ECID, SecsVarI4", 0, 500, 50, "degrees", secsgem.SecsVarI4, use_callback),
@@ -1373,6 +1731,23 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertEqual(EC2[4].get(), "")
         self.assertEqual(EC2[5].get(), "")
 
+    def testEquipmentConstantNameListCached(self):
+        self.setupTestEquipmentConstants()
+        self.establishCommunication()
+
+        self.sendECNamelistRequest()
+        response = self.client._namelist_responses[(2, 30)][2]
+
+        self.sendECNamelistRequest()
+        self.assertIs(self.client._namelist_responses[(2, 30)][2], response)
+
+        del self.client.equipment_constants["EC2"]
+
+        function = self.sendECNamelistRequest()
+
+        self.assertEqual(len(function), len(self.client.equipment_constants))
+        self.assertIsNone(next((x for x in function if x[0].get() == "EC2"), None))
+
     def testEquipmentConstantGetAll(self):
         self.setupTestEquipmentConstants()
         self.establishCommunication()
@@ -2212,3 +2587,695 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertIsNotNone(function.get())
         self.assertEqual(function.CEID.get(), secsgem.CEID_CMD_STOP_DONE)
 
+    def setupTestSpool(self):
+        self.spoolPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spoolPath)
+
+        self.client.spool = secsgem.Spool(self.spoolPath)
+        self.client.spoolStreams = {5: [1], 6: [11]}
+
+    def sendSpoolRequest(self, rsdc):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS06F23(rsdc)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 6)
+        self.assertEqual(packet.header.function, 24)
+
+        return self.client.secs_decode(packet)
+
+    def testSpoolSetup(self):
+        self.setupTestSpool()
+        self.establishCommunication()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, \
+            secsgem.SecsS02F43([{"STRID": 5, "FCNID": [1]}, {"STRID": 6, "FCNID": []}])))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertEqual(packet.header.stream, 2)
+        self.assertEqual(packet.header.function, 44)
+
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function.RSPACK.get(), secsgem.RSPACK.ACK)
+        self.assertEqual(self.client.spoolStreams, {5: [1], 6: []})
+
+    def testSpoolSetupRejected(self):
+        self.setupTestSpool()
+        self.establishCommunication()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, \
+            secsgem.SecsS02F43([{"STRID": 1, "FCNID": []}, {"STRID": 6, "FCNID": [11, 12]}, {"STRID": 5, "FCNID": [1]}])))
+
+        packet = self.server.expect_packet(system_id=system_id)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function.RSPACK.get(), secsgem.RSPACK.REJECTED)
+        self.assertEqual(len(function.DATA), 2)
+        self.assertEqual(function.DATA[0].STRACK.get(), secsgem.STRACK.SPOOLING_NOT_ALLOWED)
+        self.assertEqual(function.DATA[1].STRID.get(), 6)
+        self.assertEqual(function.DATA[1].STRACK.get(), secsgem.STRACK.SECONDARY_FUNCTION)
+        self.assertEqual(function.DATA[1].FCNID.get(), [12])
+
+        # configuration unchanged
+        self.assertEqual(self.client.spoolStreams, {5: [1], 6: [11]})
+
+    def testSpoolAlarmTransmit(self):
+        self.setupTestAlarms()
+        self.setupTestSpool()
+
+        self.client.alarms[25].enabled = True
+        self.client.alarms[30].enabled = True
+
+        # host not available, alarms are spooled
+        self.client.set_alarm(25)
+        self.client.set_alarm(30)
+
+        self.assertEqual(len(self.client.spool), 2)
+        stored = [message.data for message in self.client.spool.read(None, 2)]
+
+        self.establishCommunication()
+
+        function = self.sendSVRequest([secsgem.SVID_SPOOL_COUNT_ACTUAL, secsgem.SVID_SPOOL_COUNT_TOTAL, secsgem.SVID_SPOOL_FULL_TIME])
+        self.assertEqual(function[0].get(), 2)
+        self.assertEqual(function[1].get(), 2)
+        self.assertEqual(function[2].get(), "")
+
+        self.client.spoolTransmitWindow = 2
+
+        function = self.sendSpoolRequest(secsgem.RSDC.TRANSMIT)
+        self.assertEqual(function.get(), secsgem.RSDA.ACK)
+
+        first = self.server.expect_packet(function=1)
+        second = self.server.expect_packet(function=1)
+
+        self.assertEqual(self.client.secs_decode(first).ALID.get(), 25)
+        self.assertEqual(self.client.secs_decode(second).ALID.get(), 30)
+
+        # the stored data is sent unchanged
+        self.assertEqual([first.data, second.data], stored)
+
+        # transmission in progress
+        function = self.sendSpoolRequest(secsgem.RSDC.PURGE)
+        self.assertEqual(function.get(), secsgem.RSDA.DENIED_BUSY)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(second.header.system, secsgem.SecsS05F02(secsgem.ACKC5.ACCEPTED)))
+
+        # second message stays spooled until the first is answered
+        time.sleep(0.1)
+        self.assertEqual(len(self.client.spool), 2)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(first.header.system, secsgem.SecsS05F02(secsgem.ACKC5.ACCEPTED)))
+
+        self.client._spool_transmit_thread.join(1)
+        self.assertEqual(len(self.client.spool), 0)
+
+    def testSpoolTransmitAborted(self):
+        self.setupTestAlarms()
+        self.setupTestSpool()
+
+        self.client.alarms[25].enabled = True
+        self.client.alarms[30].enabled = True
+
+        self.client.set_alarm(25)
+        self.client.set_alarm(30)
+
+        self.establishCommunication()
+
+        self.client.spoolTransmitWindow = 1
+
+        function = self.sendSpoolRequest(secsgem.RSDC.TRANSMIT)
+        self.assertEqual(function.get(), secsgem.RSDA.ACK)
+
+        packet = self.server.expect_packet(function=1)
+
+        # an abort with the system id of the message doesn't release it
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS05F00()))
+
+        self.client._spool_transmit_thread.join(1)
+        self.assertFalse(self.client._spool_transmit_thread.is_alive())
+        self.assertEqual(len(self.client.spool), 2)
+
+    def testSpoolPurge(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.setupTestSpool()
+
+        self.client.registered_reports[1000] = CollectionEventReport(1000, [30])
+        self.client.registered_collection_events[50] = CollectionEventLink(self.client.collection_events[50], [1000])
+        self.client.registered_collection_events[50].enabled = True
+
+        self.client.trigger_collection_events([50])
+        emission = self.client.trigger_collection_events_async([50])[0]
+
+        self.assertEqual(emission.error, "spooled")
+        self.assertEqual(len(self.client.spool), 2)
+
+        self.establishCommunication()
+
+        function = self.sendSpoolRequest(secsgem.RSDC.PURGE)
+        self.assertEqual(function.get(), secsgem.RSDA.ACK)
+        self.assertEqual(len(self.client.spool), 0)
+
+        function = self.sendSpoolRequest(secsgem.RSDC.TRANSMIT)
+        self.assertEqual(function.get(), secsgem.RSDA.DENIED_NO_DATA)
+
+    def sendTraceInitialize(self, data):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS02F23(data)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 2)
+        self.assertEqual(packet.header.function, 24)
+
+        return self.client.secs_decode(packet)
+
+    def testTraceInitialize(self):
+        self.setupTestStatusVariables()
+        self.establishCommunication()
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "00000001", "TOTSMP": 4, "REPGSZ": 2, "SVID": [10, "SV2"]})
+        self.assertEqual(function.get(), secsgem.TIAACK.ACK)
+
+        for sample_number in (2, 4):
+            packet = self.server.expect_packet(function=1)
+
+            self.assertEqual(packet.header.stream, 6)
+
+            function = self.client.secs_decode(packet)
+
+            self.assertEqual(function.TRID.get(), 5)
+            self.assertEqual(function.SMPLN.get(), sample_number)
+            self.assertEqual(function.SV.get(), [123, "sample sv", 123, "sample sv"])
+
+            self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS06F02(secsgem.ACKC6.ACCEPTED)))
+
+        self.assertEqual(self.client.traces, {})
+
+    def testTraceCancel(self):
+        self.setupTestStatusVariables()
+        self.establishCommunication()
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "010000", "TOTSMP": 10, "REPGSZ": 1, "SVID": [10]})
+        self.assertEqual(function.get(), secsgem.TIAACK.ACK)
+        self.assertEqual(list(self.client.traces.keys()), [5])
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "010000", "TOTSMP": 0, "REPGSZ": 1, "SVID": []})
+        self.assertEqual(function.get(), secsgem.TIAACK.ACK)
+        self.assertEqual(self.client.traces, {})
+
+    def testTraceInitializeRejected(self):
+        self.setupTestStatusVariables()
+        self.establishCommunication()
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "0000xx", "TOTSMP": 10, "REPGSZ": 1, "SVID": [10]})
+        self.assertEqual(function.get(), secsgem.TIAACK.INVALID_PERIOD)
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "000001", "TOTSMP": 10, "REPGSZ": 1, "SVID": [10, 11]})
+        self.assertEqual(function.get(), secsgem.TIAACK.SVID_UNKNOWN)
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "000001", "TOTSMP": 10, "REPGSZ": 20, "SVID": [10]})
+        self.assertEqual(function.get(), secsgem.TIAACK.INVALID_REPGSZ)
+
+        self.client.maxTraces = 0
+
+        function = self.sendTraceInitialize({"TRID": 5, "DSPER": "000001", "TOTSMP": 10, "REPGSZ": 1, "SVID": [10]})
+        self.assertEqual(function.get(), secsgem.TIAACK.NO_MORE_TRACES)
+
+    def setupTestLimits(self):
+        self.setupTestStatusVariables()
+
+        self.client.status_variables[10].limit_min = 0
+        self.client.status_variables[10].limit_max = 1000
+
+    def sendLimitDefinition(self, data):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS02F45({"DATAID": 1, "DATA": data})))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 2)
+        self.assertEqual(packet.header.function, 46)
+
+        return self.client.secs_decode(packet)
+
+    def sendLimitRequest(self, vids=[]):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS02F47(vids)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 2)
+        self.assertEqual(packet.header.function, 48)
+
+        return self.client.secs_decode(packet)
+
+    def testLimitDefinition(self):
+        self.setupTestLimits()
+        self.establishCommunication()
+
+        function = self.sendLimitDefinition([{"VID": 10, "LIMIT": [{"LIMITID": 1, "UPPERDB": 800, "LOWERDB": 700}, \
+            {"LIMITID": 2, "UPPERDB": 200, "LOWERDB": 100}]}])
+
+        self.assertEqual(function.VLAACK.get(), secsgem.VLAACK.ACK)
+        self.assertEqual(function.DATA.get(), [])
+        self.assertEqual(sorted(self.client.limit_monitors[10].limits.keys()), [1, 2])
+
+        function = self.sendLimitRequest([10])
+
+        self.assertEqual(function[0].VID.get(), 10)
+        self.assertEqual(function[0].ATTRIBUTES.UNITS.get(), "meters")
+        self.assertEqual(function[0].ATTRIBUTES.LIMITMIN.get(), 0)
+        self.assertEqual(function[0].ATTRIBUTES.LIMITMAX.get(), 1000)
+        self.assertEqual(function[0].ATTRIBUTES.LIMIT.get(), [{"LIMITID": 1, "UPPERDB": 800, "LOWERDB": 700}, \
+            {"LIMITID": 2, "UPPERDB": 200, "LOWERDB": 100}])
+
+        # delete one limit
+        function = self.sendLimitDefinition([{"VID": 10, "LIMIT": [{"LIMITID": 1, "UPPERDB": [], "LOWERDB": []}]}])
+
+        self.assertEqual(function.VLAACK.get(), secsgem.VLAACK.ACK)
+        self.assertEqual(list(self.client.limit_monitors[10].limits.keys()), [2])
+
+        # delete all limits of the variable
+        function = self.sendLimitDefinition([{"VID": 10, "LIMIT": []}])
+
+        self.assertEqual(function.VLAACK.get(), secsgem.VLAACK.ACK)
+        self.assertEqual(self.client.limit_monitors, {})
+
+    def testLimitDefinitionRejected(self):
+        self.setupTestLimits()
+        self.establishCommunication()
+
+        function = self.sendLimitDefinition([{"VID": 10, "LIMIT": [{"LIMITID": 1, "UPPERDB": 800, "LOWERDB": 900}]}, \
+            {"VID": "SV2", "LIMIT": []}, {"VID": 11, "LIMIT": []}])
+
+        self.assertEqual(function.VLAACK.get(), secsgem.VLAACK.LIMIT_DEFINITION_ERROR)
+        self.assertEqual(function.DATA.get(), [
+            {"VID": 10, "LVACK": secsgem.LVACK.LIMIT_VALUE_ERROR, "LIMITACK": [1, secsgem.LIMITACK.UPPERDB_BELOW_LOWERDB]},
+            {"VID": "SV2", "LVACK": secsgem.LVACK.NO_LIMITS_CAPABILITY, "LIMITACK": []},
+            {"VID": 11, "LVACK": secsgem.LVACK.VARIABLE_UNKNOWN, "LIMITACK": []},
+        ])
+        self.assertEqual(self.client.limit_monitors, {})
+
+        function = self.sendLimitDefinition([{"VID": 10, "LIMIT": [{"LIMITID": 1, "UPPERDB": 1200, "LOWERDB": 900}]}])
+        self.assertEqual(function.DATA[0].LIMITACK.get(), [1, secsgem.LIMITACK.UPPERDB_ABOVE_LIMITMAX])
+
+        function = self.sendLimitDefinition([{"VID": 10, "LIMIT": [{"LIMITID": 3, "UPPERDB": [], "LOWERDB": []}]}])
+        self.assertEqual(function.DATA[0].LIMITACK.get(), [3, secsgem.LIMITACK.LIMITID_UNKNOWN])
+
+    def testLimitRequestAll(self):
+        self.setupTestLimits()
+        self.establishCommunication()
+
+        function = self.sendLimitRequest()
+
+        self.assertEqual(function.get(), [{"VID": 10, "ATTRIBUTES": {"UNITS": "meters", "LIMITMIN": 0, "LIMITMAX": 1000, "LIMIT": []}}])
+
+    def testLimitZoneTransition(self):
+        self.setupTestLimits()
+        self.establishCommunication()
+
+        self.sendLimitDefinition([{"VID": 10, "LIMIT": [{"LIMITID": 1, "UPPERDB": 800, "LOWERDB": 700}]}])
+
+        self.sendCEDefineReport(vid=[secsgem.DVID_LIMIT_VARIABLE, secsgem.DVID_EVENT_LIMIT, secsgem.DVID_TRANSITION_TYPE])
+        self.sendCELinkReport(ceid=secsgem.CEID_LIMIT_ZONE_TRANSITION)
+        self.sendCEEnableReport(ceid=[secsgem.CEID_LIMIT_ZONE_TRANSITION])
+
+        # transitions are sent asynchronously, without asyncCollectionEvents
+        self.assertEqual(self.client.check_limits({10: 100}), [])
+        self.assertEqual(self.client.check_limits({10: 750}), [])
+        self.assertEqual(self.client.check_limits({10: secsgem.SecsVarU4(900)}), [(10, 1, secsgem.TRANSITION_LOWER_TO_UPPER)])
+
+        packet = self.server.expect_packet(function=11)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function.CEID.get(), secsgem.CEID_LIMIT_ZONE_TRANSITION)
+        self.assertEqual(function.RPT[0].V.get(), [10, 1, secsgem.TRANSITION_LOWER_TO_UPPER])
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS06F12(0)))
+
+        # inside the deadband
+        self.assertEqual(self.client.check_limits({10: 750}), [])
+        self.assertEqual(self.client.check_limits({10: 600}), [(10, 1, secsgem.TRANSITION_UPPER_TO_LOWER)])
+
+        packet = self.server.expect_packet(function=11)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function.RPT[0].V.get(), [10, 1, secsgem.TRANSITION_UPPER_TO_LOWER])
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS06F12(0)))
+
+        # the transition is only reported by the reports built for it
+        reports = self.client._build_collection_event(secsgem.CEID_LIMIT_ZONE_TRANSITION)
+        self.assertEqual([len(value.get()) for value in reports[0]["V"]], [0, 0, 0])
+
+    def testUpdateValues(self):
+        self.setupTestStatusVariables(True)
+        self.setupTestDataValues(True)
+        self.establishCommunication()
+
+        self.client.on_sv_value_request = Mock()
+        self.client.on_dv_value_request = Mock()
+
+        changes = []
+        self.client.events.values_changed += changes.append
+
+        self.assertEqual(sorted(self.client.update_values({10: 200, 30: 300}), key=str), [10, 30])
+        self.assertEqual(self.client.value_version, 1)
+        self.assertEqual(self.client.status_variables[10].version, 1)
+        self.assertEqual(changes[0]["changes"], {10: 200, 30: 300})
+
+        # unchanged values don't create a new version
+        self.assertFalse(self.client.update_value(10, 200))
+        self.assertTrue(self.client.update_value(30, 301))
+
+        self.assertEqual(self.client.value_version, 2)
+        self.assertEqual(self.client.status_variables[10].version, 1)
+        self.assertEqual(self.client.data_values[30].version, 2)
+        self.assertEqual(len(changes), 2)
+
+        function = self.sendSVRequest([10])
+        self.assertEqual(function.get(), [200])
+
+        self.assertEqual(self.client._get_dv_values([self.client.data_values[30]])[0].get(), 301)
+
+        # pushed values are reported without the callbacks
+        self.client.on_sv_value_request.assert_not_called()
+        self.client.on_dv_value_request.assert_not_called()
+
+        self.assertRaises(ValueError, self.client.update_values, {11: 1})
+
+    def testUpdateValuesTriggerEvent(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.client.data_values[30].change_events = [50]
+        self.client.asyncCollectionEvents = True
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        self.client.update_value(30, 42)
+
+        packet = self.server.expect_packet(function=11)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function.CEID.get(), 50)
+        self.assertEqual(function.RPT[0].V.get(), [42])
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS06F12(0)))
+
+    def testUpdateAlarms(self):
+        self.setupTestAlarms()
+        self.establishCommunication()
+
+        self.sendAlarmEnable()
+
+        self.assertEqual(self.client.update_alarms({25: True, 30: True}), [25, 30])
+
+        # state is changed before the host acknowledged
+        self.assertTrue(self.client.alarms[25].set)
+        self.assertTrue(self.client.alarms[30].set)
+
+        # only the enabled alarm is sent
+        packet = self.server.expect_packet(stream=5)
+
+        self.assertEqual(packet.header.function, 1)
+
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function.ALID.get(), 25)
+        self.assertEqual(function.ALCD.get(), secsgem.ALCD.ALARM_SET | secsgem.ALCD.PERSONAL_SAFETY | secsgem.ALCD.EQUIPMENT_SAFETY)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS05F02(secsgem.ACKC5.ACCEPTED)))
+
+        # unchanged alarms are ignored
+        self.assertEqual(self.client.set_alarms([25]), [])
+
+        function = self.sendSVRequest([secsgem.SVID_ALARMS_SET])
+        self.assertEqual(function[0].get(), [25, 30])
+
+        for _ in range(100):
+            if self.client.alarm_statistics["acknowledged"] == 1:
+                break
+            time.sleep(0.01)
+
+        statistics = self.client.alarm_statistics
+
+        self.assertEqual(statistics["changes"], 2)
+        self.assertEqual(statistics["reported"], 2)
+        self.assertEqual(statistics["acknowledged"], 1)
+
+        self.assertRaises(ValueError, self.client.update_alarms, {26: True})
+
+    def testUpdateAlarmsDebounce(self):
+        self.setupTestAlarms()
+        self.establishCommunication()
+
+        self.sendAlarmEnable()
+
+        self.client.alarmDebounce = 0.2
+
+        self.client.set_alarms([25])
+        self.client.clear_alarms([25])
+
+        time.sleep(0.3)
+
+        self.assertEqual([packet for packet in self.server.connection.packets if packet.header.stream == 5], [])
+        self.assertFalse(self.client.alarms[25].set)
+        self.assertEqual(self.client.alarm_statistics["suppressed"], 2)
+
+    def testUpdateAlarmsMinInterval(self):
+        self.setupTestAlarms()
+        self.establishCommunication()
+
+        self.sendAlarmEnable()
+
+        self.client.alarms[25].min_interval = 0.2
+
+        self.client.set_alarms([25])
+
+        packet = self.server.expect_packet(stream=5)
+        self.assertEqual(self.client.secs_decode(packet).ALCD.get() & secsgem.ALCD.ALARM_SET, secsgem.ALCD.ALARM_SET)
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS05F02(secsgem.ACKC5.ACCEPTED)))
+
+        # flapping alarm, only the latest state is reported after the interval
+        self.client.clear_alarms([25])
+        self.client.set_alarms([25])
+        self.client.clear_alarms([25])
+
+        packet = self.server.expect_packet(stream=5)
+        self.assertEqual(self.client.secs_decode(packet).ALCD.get() & secsgem.ALCD.ALARM_SET, 0)
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS05F02(secsgem.ACKC5.ACCEPTED)))
+
+        time.sleep(0.1)
+
+        self.assertEqual([packet for packet in self.server.connection.packets if packet.header.stream == 5], [])
+        self.assertEqual(self.client.alarm_statistics["reported"], 2)
+        self.assertEqual(self.client.alarm_statistics["suppressed"], 2)
+
+    def setupTestProcessPrograms(self):
+        self.processProgramPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.processProgramPath)
+
+        self.client.processPrograms = secsgem.ProcessProgramStore(self.processProgramPath)
+
+    def sendProcessProgramFunction(self, function):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, function))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 7)
+        self.assertEqual(packet.header.function, function.function + 1)
+
+        return self.client.secs_decode(packet)
+
+    def testProcessProgramSend(self):
+        self.setupTestProcessPrograms()
+        self.establishCommunication()
+
+        body = secsgem.SecsVarBinary(b"\x00\x01" * 100000)
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F03({"PPID": "program", "PPBODY": body}))
+
+        self.assertEqual(function.get(), secsgem.ACKC7.ACCEPTED)
+        self.assertEqual(self.client.processPrograms.read("program").get(), body.get())
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F05("program"))
+
+        self.assertEqual(function.PPID.get(), "program")
+        self.assertEqual(function.PPBODY.get(), body.get())
+
+    def testProcessProgramRequestUnknown(self):
+        self.setupTestProcessPrograms()
+        self.establishCommunication()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS07F05("unknown")))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertEqual(packet.header.function, 6)
+        self.assertEqual(packet.data, b"\x01\x00")
+
+    def testProcessProgramWithoutStore(self):
+        self.establishCommunication()
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F03({"PPID": "program", "PPBODY": "text"}))
+
+        self.assertEqual(function.get(), secsgem.ACKC7.MODE_UNSUPPORTED)
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F19())
+
+        self.assertEqual(function.get(), [])
+
+    def testProcessProgramListDelete(self):
+        self.setupTestProcessPrograms()
+        self.establishCommunication()
+
+        self.client.processPrograms.write("program1", "first")
+        self.client.processPrograms.write("program2", "second")
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F19())
+        self.assertEqual(sorted(function.get()), ["program1", "program2"])
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F17(["program1", "unknown"]))
+        self.assertEqual(function.get(), secsgem.ACKC7.PPID_NOT_FOUND)
+        self.assertEqual(len(self.client.processPrograms), 2)
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F17(["program1"]))
+        self.assertEqual(function.get(), secsgem.ACKC7.ACCEPTED)
+        self.assertEqual(self.client.processPrograms.ppids, ["program2"])
+
+        function = self.sendProcessProgramFunction(secsgem.SecsS07F17([]))
+        self.assertEqual(function.get(), secsgem.ACKC7.ACCEPTED)
+        self.assertEqual(self.client.processPrograms.ppids, [])
+
+    def testProcessProgramFetch(self):
+        self.setupTestProcessPrograms()
+        self.establishCommunication()
+
+        result = []
+        clientCommandThread = threading.Thread(target=lambda: result.append(self.client.fetch_process_program("program")), \
+            name="TestGemEquipmentHandlerPassiveControlState_testProcessProgramFetch")
+        clientCommandThread.daemon = True  # make thread killable on program termination
+        clientCommandThread.start()
+
+        packet = self.server.expect_packet(stream=7, function=5)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, \
+            secsgem.SecsS07F06({"PPID": "program", "PPBODY": secsgem.SecsVarBinary(b"data")})))
+
+        clientCommandThread.join(1)
+
+        self.assertEqual(result, [True])
+        self.assertEqual(self.client.processPrograms.read("program").get(), b"data")
+
+    def testProcessProgramFetchOtherPPID(self):
+        self.setupTestProcessPrograms()
+        self.establishCommunication()
+
+        result = []
+        clientCommandThread = threading.Thread(target=lambda: result.append(self.client.fetch_process_program("program")), \
+            name="TestGemEquipmentHandlerPassiveControlState_testProcessProgramFetchOtherPPID")
+        clientCommandThread.daemon = True  # make thread killable on program termination
+        clientCommandThread.start()
+
+        packet = self.server.expect_packet(stream=7, function=5)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, \
+            secsgem.SecsS07F06({"PPID": "other", "PPBODY": secsgem.SecsVarBinary(b"data")})))
+
+        clientCommandThread.join(1)
+
+        self.assertEqual(result, [False])
+        self.assertEqual(self.client.processPrograms.ppids, [])
+
+    def testProcessProgramTransferWithoutStore(self):
+        self.assertRaises(ValueError, self.client.fetch_process_program, "program")
+        self.assertRaises(ValueError, self.client.send_stored_process_program, "program")
+
+    def setupTestObjectServices(self):
+        class Substrate(object):
+            def __init__(self, lot, slot):
+                self.lot = lot
+                self.slot = slot
+                self.state = "OK"
+
+        object_type = secsgem.ObjectType("Substrate", {"LotID": "lot", "Slot": "slot", "State": "state"}, \
+            setters={"State": "state"}, indexed=["LotID"])
+
+        for index in range(4):
+            object_type.add("S{}".format(index), Substrate("LOT{}".format(index % 2), index))
+
+        self.client.object_types.update({"Substrate": object_type})
+
+    def sendObjectServicesFunction(self, function):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, function))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 14)
+        self.assertEqual(packet.header.function, function.function + 1)
+
+        return self.client.secs_decode(packet)
+
+    def testObjectServicesGetAttr(self):
+        self.setupTestObjectServices()
+        self.establishCommunication()
+
+        function = self.sendObjectServicesFunction(secsgem.SecsS14F01({"OBJSPEC": "", "OBJTYPE": "Substrate", \
+            "OBJID": [], "FILTER": [{"ATTRID": "LotID", "ATTRRELN": secsgem.ATTRRELN.EQUAL, "ATTRDATA": "LOT1"}], \
+            "ATTRID": ["Slot", "State"]}))
+
+        self.assertEqual(function.get(), {
+            "DATA": [
+                {"OBJID": "S1", "ATTRIBS": [{"ATTRID": "Slot", "ATTRDATA": 1}, {"ATTRID": "State", "ATTRDATA": "OK"}]},
+                {"OBJID": "S3", "ATTRIBS": [{"ATTRID": "Slot", "ATTRDATA": 3}, {"ATTRID": "State", "ATTRDATA": "OK"}]}],
+            "ERRORS": {"OBJACK": secsgem.OBJACK.SUCCESSFUL, "ERROR": []}})
+
+    def testObjectServicesGetAttrErrors(self):
+        self.setupTestObjectServices()
+        self.establishCommunication()
+
+        function = self.sendObjectServicesFunction(secsgem.SecsS14F01({"OBJSPEC": "", "OBJTYPE": "Substrate", \
+            "OBJID": ["S2", "S9"], "FILTER": [], "ATTRID": ["Slot", "Unknown"]}))
+
+        self.assertEqual(function.DATA.get(), [{"OBJID": "S2", "ATTRIBS": [{"ATTRID": "Slot", "ATTRDATA": 2}]}])
+        self.assertEqual(function.ERRORS.OBJACK.get(), secsgem.OBJACK.ERROR)
+        self.assertEqual([error.ERRCODE.get() for error in function.ERRORS.ERROR], \
+            [secsgem.ERRCODE.UNKNOWN_OBJECT_INSTANCE, secsgem.ERRCODE.UNKNOWN_ATTRIBUTE])
+
+        function = self.sendObjectServicesFunction(secsgem.SecsS14F01({"OBJSPEC": "", "OBJTYPE": "Carrier", \
+            "OBJID": [], "FILTER": [], "ATTRID": []}))
+
+        self.assertEqual(function.DATA.get(), [])
+        self.assertEqual(function.ERRORS.ERROR[0].ERRCODE.get(), secsgem.ERRCODE.UNKNOWN_OBJECT_TYPE)
+
+    def testObjectServicesSetAttr(self):
+        self.setupTestObjectServices()
+        self.establishCommunication()
+
+        function = self.sendObjectServicesFunction(secsgem.SecsS14F03({"OBJSPEC": "", "OBJTYPE": "Substrate", \
+            "OBJID": ["S0"], "ATTRIBS": [{"ATTRID": "State", "ATTRDATA": "NG"}, {"ATTRID": "Slot", "ATTRDATA": 5}]}))
+
+        self.assertEqual(function.DATA.get(), [{"OBJID": "S0", "ATTRIBS": [{"ATTRID": "State", "ATTRDATA": "NG"}]}])
+        self.assertEqual(function.ERRORS.OBJACK.get(), secsgem.OBJACK.ERROR)
+        self.assertEqual(function.ERRORS.ERROR[0].ERRCODE.get(), secsgem.ERRCODE.READ_ONLY_ATTRIBUTE)
+
+        self.assertEqual(self.client.object_types["Substrate"].get("S0").state, "NG")
+        self.assertEqual(self.client.object_types["Substrate"].get("S0").slot, 0)
@@ -0,0 +1,86 @@
+#####################################################################
+# testGemEventBatches.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import queue
+import unittest
+
+import secsgem
+
+
+class TestCollectionEventBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batches = queue.Queue()
+
+    def createBatcher(self, **kwargs):
+        batcher = secsgem.CollectionEventBatcher(self.batches.put, **kwargs)
+        self.addCleanup(batcher.stop)
+
+        return batcher
+
+    def testSize(self):
+        batcher = self.createBatcher(max_size=3, max_age=60)
+
+        for value in range(4):
+            batcher.add(10, 30, [20, 21], [value, value * 2], value)
+        batcher.add(11, 30, [20, 21], [5, 6], 5)
+
+        batch = self.batches.get(timeout=1)
+
+        self.assertEqual((batch.ceid, batch.rptid, batch.dvids), (10, 30, [20, 21]))
+        self.assertEqual(batch.timestamps, [0, 1, 2])
+        self.assertEqual(batch.columns, [[0, 1, 2], [0, 2, 4]])
+        self.assertEqual(batch.column(21), [0, 2, 4])
+
+        batcher.stop()
+
+        batches = sorted([self.batches.get(timeout=1), self.batches.get(timeout=1)], key=lambda item: item.ceid)
+
+        self.assertEqual([(batch.ceid, batch.timestamps) for batch in batches], [(10, [3]), (11, [5])])
+
+    def testAge(self):
+        batcher = self.createBatcher(max_size=100, max_age=0.05)
+
+        batcher.add(10, 30, [20], [1])
+        batcher.add(10, 30, [20], [2])
+
+        batch = self.batches.get(timeout=1)
+        self.assertEqual(batch.column(20), [1, 2])
+
+    def testRedefinedReport(self):
+        batcher = self.createBatcher(max_size=100, max_age=60)
+
+        batcher.add(10, 30, [20], [1])
+        batcher.add(10, 30, [20, 21], [2, 3])
+
+        batch = self.batches.get(timeout=1)
+        self.assertEqual((batch.dvids, batch.columns), ([20], [[1]]))
+
+        self.assertRaises(ValueError, batcher.add, 10, 30, [20, 21], [4])
+
+    def testSinkException(self):
+        batches = []
+
+        def sink(batch):
+            batches.append(batch)
+            raise RuntimeError("sink failed")
+
+        batcher = secsgem.CollectionEventBatcher(sink, max_size=1)
+
+        batcher.add(10, 30, [20], [1])
+        batcher.add(10, 30, [20], [2])
+        batcher.stop()
+
+        self.assertEqual([batch.column(20) for batch in batches], [[1], [2]])
@@ -226,6 +226,257 @@ class TestGemHostHandlerPassive(unittest.TestCase, GemHandlerPassiveGroup):
         clientCommandThread.join(1)
         self.assertFalse(clientCommandThread.isAlive())
 
+    def subscribeCollectionEvents(self, subscriptions, result):
+        result.append(self.client.subscribe_collection_events(subscriptions))
+
+    def testSubscribeCollectionEvents(self):
+        self.establishCommunication()
+
+        result = []
+        clientCommandThread = threading.Thread(target=self.subscribeCollectionEvents, args=([(10, [20], 30), (11, [21, 22], 31)], result), name="TestGemHostHandlerPassive_testSubscribeCollectionEvents")
+        clientCommandThread.daemon = True  # make thread killable on program termination
+        clientCommandThread.start()
+
+        packet = self.server.expect_packet(function=33)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function["DATA"][0]["RPTID"], 30)
+        self.assertEqual(function["DATA"][1]["RPTID"], 31)
+        self.assertEqual(function["DATA"][1]["VID"].get(), [21, 22])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=35)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function["DATA"][0]["CEID"], 10)
+        self.assertEqual(function["DATA"][1]["CEID"], 11)
+        self.assertEqual(function["DATA"][1]["RPTID"].get(), [31])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F36(secsgem.LRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=37)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function["CEED"], True)
+        self.assertEqual(function["CEID"].get(), [10, 11])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.ACCEPTED))
+        self.server.simulate_packet(packet)
+
+        clientCommandThread.join(1)
+        self.assertEqual(result, [{}])
+        self.assertEqual(self.client.reportSubscriptions, {30: [20], 31: [21, 22]})
+
+    def testSubscribeCollectionEventsReportRejected(self):
+        self.establishCommunication()
+
+        result = []
+        clientCommandThread = threading.Thread(target=self.subscribeCollectionEvents, args=([(10, [20], 30), (11, [21], 31)], result), name="TestGemHostHandlerPassive_testSubscribeCollectionEventsReportRejected")
+        clientCommandThread.daemon = True  # make thread killable on program termination
+        clientCommandThread.start()
+
+        # bulk definition is rejected
+        packet = self.server.expect_packet(function=33)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.VID_UNKNOWN))
+        self.server.simulate_packet(packet)
+
+        # single definitions
+        packet = self.server.expect_packet(function=33)
+        self.assertEqual(self.client.secs_decode(packet)["DATA"][0]["RPTID"], 30)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=33)
+        self.assertEqual(self.client.secs_decode(packet)["DATA"][0]["RPTID"], 31)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.VID_UNKNOWN))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=35)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(len(function["DATA"]), 1)
+        self.assertEqual(function["DATA"][0]["CEID"], 10)
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F36(secsgem.LRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=37)
+        self.assertEqual(self.client.secs_decode(packet)["CEID"].get(), [10])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.ACCEPTED))
+        self.server.simulate_packet(packet)
+
+        clientCommandThread.join(1)
+        self.assertEqual(result, [{11: ("S2F33", secsgem.DRACK.VID_UNKNOWN)}])
+        self.assertEqual(self.client.reportSubscriptions, {30: [20]})
+
+    def testSubscribeCollectionEventsEnableRejected(self):
+        self.establishCommunication()
+
+        result = []
+        clientCommandThread = threading.Thread(target=self.subscribeCollectionEvents, args=([(10, [20], 30), (11, [21], 31)], result), name="TestGemHostHandlerPassive_testSubscribeCollectionEventsEnableRejected")
+        clientCommandThread.daemon = True  # make thread killable on program termination
+        clientCommandThread.start()
+
+        packet = self.server.expect_packet(function=33)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=35)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F36(secsgem.LRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        # enabling collection event 11 fails
+        packet = self.server.expect_packet(function=37)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.CEID_UNKNOWN))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=37)
+        self.assertEqual(self.client.secs_decode(packet)["CEID"].get(), [10])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.ACCEPTED))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=37)
+        self.assertEqual(self.client.secs_decode(packet)["CEID"].get(), [11])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.CEID_UNKNOWN))
+        self.server.simulate_packet(packet)
+
+        # report of collection event 11 is deleted again
+        packet = self.server.expect_packet(function=33)
+        function = self.client.secs_decode(packet)
+        self.assertEqual(len(function["DATA"]), 1)
+        self.assertEqual(function["DATA"][0]["RPTID"], 31)
+        self.assertEqual(function["DATA"][0]["VID"].get(), [])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        clientCommandThread.join(1)
+        self.assertEqual(result, [{11: ("S2F37", secsgem.ERACK.CEID_UNKNOWN)}])
+        self.assertEqual(self.client.reportSubscriptions, {30: [20]})
+        self.assertEqual(self.client.enabledCollectionEvents, [10])
+
+    def testSubscriptionStepNotAnswered(self):
+        messages = []
+
+        def send(function, data):
+            messages.append(data)
+            return None
+
+        self.client._send_subscription_message = send
+
+        failed = self.client._send_subscription_step(37, [(10, None), (11, None)], secsgem.ERACK.ACCEPTED, lambda items: items)
+
+        # items are not sent separately after a timeout
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(failed, {10: None, 11: None})
+
+    def reconnect(self):
+        self.server.simulate_disconnect()
+        self.establishCommunication()
+
+    def testRestoreStateAfterReconnect(self):
+        self.establishCommunication()
+
+        self.client.reportSubscriptions[30] = [20, 21]
+        self.client.collectionEventLinks[10] = [30]
+        self.client.enabledCollectionEvents.append(10)
+
+        self.reconnect()
+
+        # equipment lost configuration, everything is sent in one message per step
+        packet = self.server.expect_packet(function=33)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function["DATA"][0]["RPTID"], 30)
+        self.assertEqual(function["DATA"][0]["VID"].get(), [20, 21])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=35)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function["DATA"][0]["CEID"], 10)
+        self.assertEqual(function["DATA"][0]["RPTID"].get(), [30])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F36(secsgem.LRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=37)
+        function = self.client.secs_decode(packet)
+
+        self.assertEqual(function["CEED"], True)
+        self.assertEqual(function["CEID"].get(), [10])
+
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.ACCEPTED))
+        self.server.simulate_packet(packet)
+
+    def testRestoreStateKeptByEquipment(self):
+        self.establishCommunication()
+
+        self.client.reportSubscriptions[30] = [20, 21]
+        self.client.reportSubscriptions[31] = [22]
+        self.client.collectionEventLinks[10] = [30]
+        self.client.collectionEventLinks[11] = [31]
+        self.client.enabledCollectionEvents.extend([10, 11])
+        self.client.alarmEnableStates[40] = True
+        self.client.alarmEnableStates[41] = True
+
+        result = []
+        clientCommandThread = threading.Thread(target=lambda: result.append(self.client.restore_state()), name="TestGemHostHandlerPassive_testRestoreStateKeptByEquipment")
+        clientCommandThread.daemon = True  # make thread killable on program termination
+        clientCommandThread.start()
+
+        packet = self.server.expect_packet(function=33)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.RPTID_REDEFINED))
+        self.server.simulate_packet(packet)
+
+        # all known reports are deleted in one message, report 30 might have other VIDs with the same count
+        packet = self.server.expect_packet(function=33)
+        function = self.client.secs_decode(packet)
+        self.assertEqual([report["RPTID"].get() for report in function["DATA"]], [30, 31])
+        self.assertEqual([report["VID"].get() for report in function["DATA"]], [[], []])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        # and defined again in one message
+        packet = self.server.expect_packet(function=33)
+        function = self.client.secs_decode(packet)
+        self.assertEqual([report["RPTID"].get() for report in function["DATA"]], [30, 31])
+        self.assertEqual([report["VID"].get() for report in function["DATA"]], [[20, 21], [22]])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F34(secsgem.DRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        # deleting the reports removed their links, so all are linked again
+        packet = self.server.expect_packet(function=35)
+        function = self.client.secs_decode(packet)
+        self.assertEqual([link["CEID"].get() for link in function["DATA"]], [10, 11])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F36(secsgem.LRACK.ACK))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=37)
+        self.assertEqual(self.client.secs_decode(packet)["CEID"].get(), [10, 11])
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS02F38(secsgem.ERACK.ACCEPTED))
+        self.server.simulate_packet(packet)
+
+        # alarm 40 is already enabled
+        packet = self.server.expect_packet(function=7)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS05F08([{"ALCD": 0, "ALID": 40, "ALTX": "text"}]))
+        self.server.simulate_packet(packet)
+
+        packet = self.server.expect_packet(function=3)
+        function = self.client.secs_decode(packet)
+        self.assertEqual(function["ALID"], 41)
+        self.assertEqual(function["ALED"].get(), secsgem.ALED.ENABLE)
+        packet = self.server.generate_stream_function_packet(packet.header.system, secsgem.SecsS05F04(secsgem.ACKC5.ACCEPTED))
+        self.server.simulate_packet(packet)
+
+        clientCommandThread.join(1)
+        self.assertEqual(result, [{"collection_events": {}, "alarms": {}}])
+
     def sendRemoteCommand(self, params):
         self.establishCommunication()
 
@@ -533,3 +784,30 @@ class TestGemHostHandlerPassive(unittest.TestCase, GemHandlerPassiveGroup):
 
         self.assertEqual(function.get(), 0)
 
+
+    def testCollectionEventBatching(self):
+        self.establishCommunication()
+
+        self.subscribeCollectionEvent(10, [20, 21], 30)
+
+        batches = []
+        self.client.collectionEventBatcher = secsgem.CollectionEventBatcher(batches.append, max_size=2, max_age=60)
+        self.addCleanup(self.client.collectionEventBatcher.stop)
+
+        for value in range(3):
+            system_id = self.server.get_next_system_counter()
+            self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, \
+                secsgem.SecsS06F11({"DATAID": 0, "CEID": 10, "RPT": [{"RPTID": 30, "V": ["1", value]}]})))
+
+            packet = self.server.expect_packet(system_id=system_id)
+
+            self.assertIsNot(packet, None)
+            self.assertEqual(packet.header.stream, 6)
+            self.assertEqual(packet.header.function, 12)
+
+        self.client.collectionEventBatcher.stop()
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual((batches[0].ceid, batches[0].rptid, batches[0].dvids), (10, 30, [20, 21]))
+        self.assertEqual(batches[0].column(21), [0, 1])
+        self.assertEqual(batches[1].columns, [["1"], [2]])
@@ -0,0 +1,70 @@
+#####################################################################
+# testGemLimits.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import unittest
+
+import secsgem
+
+
+class TestLimitMonitor(unittest.TestCase):
+    def setUp(self):
+        self.monitor = secsgem.LimitMonitor([
+            secsgem.VariableLimit(1, 20, 10),
+            secsgem.VariableLimit(2, 60, 50),
+            secsgem.VariableLimit(3, 90, 80),
+        ])
+
+    def testInitialValue(self):
+        self.assertIsNone(self.monitor.zone(1))
+
+        self.assertEqual(self.monitor.update(55), [])
+
+        self.assertEqual(self.monitor.zone(1), secsgem.ZONE_UPPER)
+        self.assertEqual(self.monitor.zone(2), secsgem.ZONE_LOWER)
+        self.assertEqual(self.monitor.zone(3), secsgem.ZONE_LOWER)
+
+    def testRising(self):
+        self.monitor.update(0)
+
+        self.assertEqual(self.monitor.update(100), [(1, secsgem.TRANSITION_LOWER_TO_UPPER), (2, secsgem.TRANSITION_LOWER_TO_UPPER), \
+            (3, secsgem.TRANSITION_LOWER_TO_UPPER)])
+        self.assertEqual(self.monitor.update(100), [])
+
+    def testFalling(self):
+        self.monitor.update(100)
+
+        self.assertEqual(self.monitor.update(0), [(3, secsgem.TRANSITION_UPPER_TO_LOWER), (2, secsgem.TRANSITION_UPPER_TO_LOWER), \
+            (1, secsgem.TRANSITION_UPPER_TO_LOWER)])
+
+    def testDeadband(self):
+        self.monitor.update(0)
+
+        self.assertEqual(self.monitor.update(21), [(1, secsgem.TRANSITION_LOWER_TO_UPPER)])
+
+        # moving inside the deadband doesn't change the zone
+        self.assertEqual(self.monitor.update(10), [])
+        self.assertEqual(self.monitor.update(20), [])
+        self.assertEqual(self.monitor.update(25), [])
+
+        self.assertEqual(self.monitor.update(9), [(1, secsgem.TRANSITION_UPPER_TO_LOWER)])
+        self.assertEqual(self.monitor.update(20), [])
+        self.assertEqual(self.monitor.update(20.5), [(1, secsgem.TRANSITION_LOWER_TO_UPPER)])
+
+    def testKeepValue(self):
+        monitor = secsgem.LimitMonitor([secsgem.VariableLimit(1, 20, 10)], 30)
+
+        self.assertEqual(monitor.zone(1), secsgem.ZONE_UPPER)
+        self.assertEqual(monitor.update(5), [(1, secsgem.TRANSITION_UPPER_TO_LOWER)])
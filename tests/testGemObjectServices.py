@@ -0,0 +1,89 @@
+#####################################################################
+# testGemObjectServices.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import unittest
+
+import secsgem
+
+
+class Substrate(object):
+    def __init__(self, lot, slot, state=None):
+        self.lot = lot
+        self.slot = slot
+        self.state = state
+
+
+class TestObjectType(unittest.TestCase):
+    def setUp(self):
+        self.type = secsgem.ObjectType("Substrate", {
+            "LotID": "lot",
+            "Slot": lambda substrate: substrate.slot,
+            "State": "state",
+        }, setters={"State": "state"}, indexed=["LotID", "Slot"])
+
+        for index in range(10):
+            self.type.add("S{}".format(index), Substrate("LOT{}".format(index % 2), index, "OK" if index < 3 else None))
+
+    def testAddRemove(self):
+        self.assertEqual(len(self.type), 10)
+        self.assertIn("S5", self.type)
+        self.assertEqual(self.type.get("S5").slot, 5)
+        self.assertEqual(self.type.objids[0:3], ["S0", "S1", "S2"])
+
+        self.assertTrue(self.type.remove("S5"))
+        self.assertFalse(self.type.remove("S5"))
+
+        self.assertNotIn("S5", self.type)
+        self.assertIsNone(self.type.get("S5"))
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT1")]), ["S1", "S3", "S7", "S9"])
+
+    def testQueryIndexed(self):
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT0")]), ["S0", "S2", "S4", "S6", "S8"])
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT0"), \
+            ("Slot", secsgem.ATTRRELN.MORE, 4)]), ["S6", "S8"])
+        self.assertEqual(self.type.query([("Slot", secsgem.ATTRRELN.LESS_EQUAL, 1)]), ["S0", "S1"])
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT2")]), [])
+
+    def testQueryNotIndexed(self):
+        self.assertEqual(self.type.query([("State", secsgem.ATTRRELN.PRESENT, None)]), ["S0", "S1", "S2"])
+        self.assertEqual(self.type.query([("State", secsgem.ATTRRELN.ABSENT, None), \
+            ("LotID", secsgem.ATTRRELN.NOT_EQUAL, "LOT0")]), ["S3", "S5", "S7", "S9"])
+
+    def testQueryObjectIds(self):
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT1")], ["S9", "S2", "S1", "S11"]), \
+            ["S9", "S1"])
+        self.assertEqual(self.type.query(None, ["S3", "S11"]), ["S3"])
+
+    def testQueryInvalid(self):
+        self.assertRaises(KeyError, self.type.query, [("Unknown", secsgem.ATTRRELN.EQUAL, 1)])
+        self.assertRaises(ValueError, self.type.query, [("Slot", 9, 1)])
+
+    def testUpdate(self):
+        self.type.get("S0").lot = "LOT1"
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT1")])[0], "S1")
+
+        self.type.update("S0")
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT1")])[0], "S0")
+
+        self.type.add("S0", Substrate("LOT0", 0))
+        self.assertEqual(self.type.objids[0], "S0")
+        self.assertEqual(self.type.query([("LotID", secsgem.ATTRRELN.EQUAL, "LOT1")])[0], "S1")
+
+    def testAttributes(self):
+        self.type.set_attribute("S4", "State", "NG")
+
+        self.assertEqual(self.type.get_attributes(["S4", "S11", "S1"], ["Slot", "State"]), \
+            [("S4", [4, "NG"]), ("S1", [1, "OK"])])
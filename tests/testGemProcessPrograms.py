@@ -0,0 +1,118 @@
+#####################################################################
+# testGemProcessPrograms.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import secsgem
+
+
+class TestProcessProgramStore(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.directory = os.path.join(self.path, "programs")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testWriteRead(self):
+        store = secsgem.ProcessProgramStore(self.directory)
+
+        store.write("program", secsgem.SecsVarBinary(b"data"))
+        store.write(b"\x01\x02", "text body")
+
+        self.assertEqual(len(store), 2)
+        self.assertIn("program", store)
+        self.assertEqual(store.ppids, ["program", b"\x01\x02"])
+
+        self.assertEqual(store.read("program").get(), b"data")
+        self.assertEqual(store.read(b"\x01\x02").get(), "text body")
+        self.assertEqual(store.size("program"), len(secsgem.SecsVarBinary(b"data").encode()))
+        self.assertIsNone(store.read("unknown"))
+
+    def testReopen(self):
+        store = secsgem.ProcessProgramStore(self.directory)
+
+        store.write("program", secsgem.SecsVarBinary(b"data"))
+        store.write(b"\x01\x02", "text body")
+
+        store = secsgem.ProcessProgramStore(self.directory)
+
+        self.assertEqual(sorted(store.ppids, key=repr), sorted(["program", b"\x01\x02"], key=repr))
+        self.assertEqual(store.read(b"\x01\x02").get(), "text body")
+
+    def testReplaceDelete(self):
+        store = secsgem.ProcessProgramStore(self.directory)
+
+        store.write("program", "first")
+        self.assertEqual(store.read("program").get(), "first")
+
+        store.write("program", "second")
+        self.assertEqual(store.read("program").get(), "second")
+
+        self.assertTrue(store.delete("program"))
+        self.assertFalse(store.delete("program"))
+        self.assertEqual(store.ppids, [])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def testCache(self):
+        store = secsgem.ProcessProgramStore(self.directory, cache_size=64)
+
+        store.write("small1", b"x" * 10)
+        store.write("small2", b"y" * 10)
+        store.write("large", b"z" * 100)
+
+        store.read("small1")
+        store.read("small2")
+        store.read("large")
+
+        # larger than a quarter of the cache
+        self.assertEqual(list(store._cache), ["small1", "small2"])
+
+        store.read("small1")
+        self.assertEqual(list(store._cache), ["small2", "small1"])
+
+        store.write("small1", secsgem.SecsVarBinary(b"w" * 10))
+        self.assertEqual(list(store._cache), ["small2"])
+        self.assertEqual(store.read("small1").get(), b"w" * 10)
+
+    def testMessage(self):
+        store = secsgem.ProcessProgramStore(self.directory)
+        store.write("program", secsgem.SecsVarBinary(b"data"))
+
+        data = secsgem.encode_process_program_message(store, "program")
+
+        self.assertEqual(data, secsgem.SecsS07F03({"PPID": "program", "PPBODY": secsgem.SecsVarBinary(b"data")}).encode())
+        self.assertIsNone(secsgem.encode_process_program_message(store, "unknown"))
+
+        ppid, body = secsgem.split_process_program_message(data)
+
+        self.assertEqual(ppid, "program")
+        self.assertEqual(bytes(body), secsgem.SecsVarBinary(b"data").encode())
+
+        self.assertEqual(secsgem.split_process_program_message(b"\x01\x00"), (None, None))
+
+    def testInvalidBody(self):
+        store = secsgem.ProcessProgramStore(self.directory)
+
+        # list instead of a body
+        self.assertRaises(ValueError, store.write_encoded, "program", b"\x01\x00")
+        # length doesn't match
+        self.assertRaises(ValueError, store.write_encoded, "program", b"\x21\x05\x00")
+
+        self.assertEqual(store.ppids, [])
@@ -0,0 +1,122 @@
+#####################################################################
+# testGemSharedVariables.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+import secsgem
+
+from testconnection import HsmsTestServer
+
+
+class TestSharedVariableTable(unittest.TestCase):
+    layout = [(10, secsgem.SecsVarU4), ("SV2", secsgem.SecsVarString, 16), (30, secsgem.SecsVarF8), (31, secsgem.SecsVarBoolean),
+              (32, secsgem.SecsVarBinary, 4)]
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.filename = os.path.join(self.path, "table")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testWriteRead(self):
+        writer = secsgem.SharedVariableTable(self.filename, self.layout, create=True)
+        reader = secsgem.SharedVariableTable(self.filename, self.layout)
+
+        writer.write(10, 123)
+        writer.write("SV2", u"sample sv")
+        writer.write(30, 1.5)
+        writer.write(31, True)
+        writer.write(32, b"\x01\x02")
+
+        self.assertEqual(reader.read(10), 123)
+        self.assertEqual(reader.read("SV2"), u"sample sv")
+        self.assertEqual(reader.read(30), 1.5)
+        self.assertEqual(reader.read(31), True)
+        self.assertEqual(reader.read(32), b"\x01\x02")
+        self.assertEqual(reader.get(10).get(), 123)
+
+        writer.write("SV2", u"short")
+        self.assertEqual(reader.read("SV2"), u"short")
+
+        writer.close()
+        reader.close()
+
+    def testTooLong(self):
+        table = secsgem.SharedVariableTable(self.filename, self.layout, create=True)
+
+        with self.assertRaises(ValueError):
+            table.write("SV2", u"this is longer than 16 bytes")
+
+        table.close()
+
+    def testDifferentLayout(self):
+        secsgem.SharedVariableTable(self.filename, self.layout, create=True).close()
+
+        with self.assertRaises(ValueError):
+            secsgem.SharedVariableTable(self.filename, [(10, secsgem.SecsVarI4), ("SV2", secsgem.SecsVarString, 16), (30, secsgem.SecsVarF8),
+                                                        (31, secsgem.SecsVarBoolean), (32, secsgem.SecsVarBinary, 4)])
+
+    def testSwappedLayout(self):
+        secsgem.SharedVariableTable(self.filename, [(10, secsgem.SecsVarU4), (11, secsgem.SecsVarU4)], create=True).close()
+
+        with self.assertRaises(ValueError):
+            secsgem.SharedVariableTable(self.filename, [(11, secsgem.SecsVarU4), (10, secsgem.SecsVarU4)])
+
+        with self.assertRaises(ValueError):
+            secsgem.SharedVariableTable(self.filename, [(10, secsgem.SecsVarU4), (12, secsgem.SecsVarU4)])
+
+    def testLayoutChecksum(self):
+        # the checksum doesn't depend on the python version
+        table = secsgem.SharedVariableTable(self.filename, [(10, secsgem.SecsVarU4), (u"SV2", secsgem.SecsVarString, 16)], create=True)
+        self.assertEqual(table.checksum, zlib.crc32(b"i10:U4:4,sSV2:A:16") & 0xffffffff)
+        table.close()
+
+        with self.assertRaises(ValueError):
+            secsgem.SharedVariableTable(self.filename, [(u"10", secsgem.SecsVarU4), (u"SV2", secsgem.SecsVarString, 16)])
+
+    def testUnsupportedType(self):
+        with self.assertRaises(TypeError):
+            secsgem.SharedVariableTable(self.filename, [(10, secsgem.SecsVarArray)], create=True)
+
+    def testEquipmentHandler(self):
+        server = HsmsTestServer()
+        client = secsgem.GemEquipmentHandler("127.0.0.1", 5000, False, 0, "test", server)
+
+        client.status_variables.update({
+            10: secsgem.StatusVariable(10, "sample1, numeric SVID, SecsVarU4", "meters", secsgem.SecsVarU4, False),
+        })
+        client.data_values.update({
+            30: secsgem.DataValue(30, "sample1, numeric DV, SecsVarF8", secsgem.SecsVarF8, True),
+        })
+
+        layout = secsgem.shared_variable_layout([client.status_variables[10], client.data_values[30]])
+        table = secsgem.SharedVariableTable(self.filename, layout, create=True)
+
+        client.status_variables[10].shared_table = table
+        client.data_values[30].shared_table = table
+
+        table.write(10, 42)
+        table.write(30, 2.5)
+
+        self.assertEqual(client._get_sv_value(client.status_variables[10]).get(), 42)
+        self.assertEqual(client._get_dv_values([client.data_values[30]])[0].get(), 2.5)
+
+        table.close()
@@ -0,0 +1,146 @@
+#####################################################################
+# testGemSpool.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import secsgem
+
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.directory = os.path.join(self.path, "spool")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testAppendRead(self):
+        spool = secsgem.Spool(self.directory)
+
+        self.assertTrue(spool.append(6, 11, b"first"))
+        self.assertTrue(spool.append(5, 1, b"second"))
+
+        self.assertEqual(len(spool), 2)
+        self.assertEqual(spool.count_total, 2)
+        self.assertIsNotNone(spool.start_time)
+
+        messages = spool.read()
+
+        self.assertEqual([(message.stream, message.function, message.data) for message in messages], [(6, 11, b"first"), (5, 1, b"second")])
+        self.assertEqual(spool.read(messages[0].position)[0].data, b"second")
+        self.assertEqual(spool.read(messages[1].position), [])
+
+        # reading doesn't remove messages
+        self.assertEqual(len(spool), 2)
+
+        spool.close()
+
+    def testRelease(self):
+        spool = secsgem.Spool(self.directory)
+
+        for index in range(3):
+            spool.append(6, 11, str(index).encode("ascii"))
+
+        messages = spool.read()
+        spool.release(messages[1].position)
+
+        self.assertEqual(len(spool), 1)
+        self.assertEqual([message.data for message in spool.read()], [b"2"])
+
+        spool.release(messages[2].position)
+
+        self.assertEqual(len(spool), 0)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def testSegments(self):
+        spool = secsgem.Spool(self.directory, max_size=4096, segment_size=64)
+
+        for index in range(10):
+            spool.append(6, 11, b"message " + str(index).encode("ascii"))
+
+        self.assertGreater(len(os.listdir(self.directory)), 1)
+        self.assertEqual(spool.size, len(os.listdir(self.directory)) * 64)
+
+        data = []
+        position = None
+        while True:
+            messages = spool.read(position, 3)
+            if not messages:
+                break
+
+            data.extend(message.data for message in messages)
+            position = messages[-1].position
+
+        self.assertEqual(data, [b"message " + str(index).encode("ascii") for index in range(10)])
+
+    def testReopen(self):
+        spool = secsgem.Spool(self.directory, segment_size=64)
+
+        for index in range(5):
+            spool.append(6, 11, b"message " + str(index).encode("ascii"))
+
+        spool.release(spool.read(None, 2)[1].position)
+        spool.close()
+
+        spool = secsgem.Spool(self.directory, segment_size=64)
+
+        self.assertEqual(len(spool), 3)
+        self.assertEqual([message.data for message in spool.read()], [b"message 2", b"message 3", b"message 4"])
+
+        spool.append(5, 1, b"after reopen")
+        self.assertEqual(spool.read()[-1].data, b"after reopen")
+
+    def testFullDiscardNew(self):
+        spool = secsgem.Spool(self.directory, max_size=128, segment_size=64)
+
+        results = [spool.append(6, 11, b"message " + str(index).encode("ascii")) for index in range(10)]
+
+        self.assertIn(False, results)
+        self.assertTrue(spool.full)
+        self.assertIsNotNone(spool.full_time)
+        self.assertEqual(spool.read()[0].data, b"message 0")
+        self.assertEqual(len(spool), results.count(True))
+        self.assertEqual(spool.size, 128)
+
+    def testFullOverwrite(self):
+        spool = secsgem.Spool(self.directory, max_size=128, segment_size=64, overwrite=True)
+
+        results = [spool.append(6, 11, b"message " + str(index).encode("ascii")) for index in range(10)]
+
+        self.assertNotIn(False, results)
+        self.assertTrue(spool.full)
+        self.assertEqual(spool.count_total, 10)
+        self.assertLess(len(spool), 10)
+        self.assertEqual(spool.read()[-1].data, b"message 9")
+        self.assertEqual(spool.size, 128)
+
+    def testPurge(self):
+        spool = secsgem.Spool(self.directory)
+
+        spool.append(6, 11, b"message")
+        spool.purge()
+
+        self.assertEqual(len(spool), 0)
+        self.assertEqual(spool.read(), [])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def testMessageTooLong(self):
+        spool = secsgem.Spool(self.directory, segment_size=64)
+
+        self.assertRaises(ValueError, spool.append, 6, 11, b"x" * 64)
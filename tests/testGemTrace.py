@@ -0,0 +1,36 @@
+#####################################################################
+# testGemTrace.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import unittest
+
+import secsgem
+
+
+class TestParseSamplePeriod(unittest.TestCase):
+    def testSeconds(self):
+        self.assertEqual(secsgem.parse_sample_period("000130"), 90)
+
+    def testHundredths(self):
+        self.assertEqual(secsgem.parse_sample_period("00000105"), 1.05)
+
+    def testHours(self):
+        self.assertEqual(secsgem.parse_sample_period("020000"), 7200)
+
+    def testInvalid(self):
+        self.assertIsNone(secsgem.parse_sample_period("0001"))
+        self.assertIsNone(secsgem.parse_sample_period("00aa00"))
+        self.assertIsNone(secsgem.parse_sample_period("006000"))
+        self.assertIsNone(secsgem.parse_sample_period("000000"))
@@ -0,0 +1,110 @@
+#####################################################################
+# testGemWaferMap.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import unittest
+
+import secsgem
+
+
+class TestWaferMap(unittest.TestCase):
+    def setUp(self):
+        self.map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1))
+        self.map[-1, -1] = 1
+        self.map[0, 0] = 5
+        self.map[1, 0] = 6
+        self.map[2, 1] = 7
+
+    def testIndex(self):
+        self.assertEqual(len(self.map), 12)
+        self.assertEqual(self.map[0, 0], 5)
+        self.assertEqual(list(self.map.row(0)), [0, 5, 6, 0])
+
+        self.map.set_row(1, [1, 2, 3, 4])
+        self.assertEqual(self.map[2, 1], 4)
+
+        self.assertRaises(IndexError, self.map.__getitem__, (3, 0))
+        self.assertRaises(IndexError, self.map.__getitem__, (0, -2))
+        self.assertRaises(ValueError, self.map.set_row, 1, [1, 2])
+
+    def testEncodeRows(self):
+        data = self.map.encode_rows()
+
+        self.assertEqual(data, secsgem.SecsS12F07({"MID": "wafer", "IDTYP": secsgem.IDTYP.WAFER, "DATA": [
+            {"RSINF": [-1, -1, 1], "BINLT": [1, 0, 0, 0]},
+            {"RSINF": [-1, 0, 1], "BINLT": [0, 5, 6, 0]},
+            {"RSINF": [-1, 1, 1], "BINLT": [0, 0, 0, 7]}]}).encode())
+
+        wafer_map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1))
+        self.assertEqual(wafer_map.decode(data), "wafer")
+        self.assertEqual(wafer_map.bins, self.map.bins)
+
+    def testEncodeRowsPartial(self):
+        data = self.map.encode_rows([0])
+
+        wafer_map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1))
+        wafer_map.decode(data)
+
+        self.assertEqual(list(wafer_map.bins), [0, 0, 0, 0, 0, 5, 6, 0, 0, 0, 0, 0])
+
+    def testEncodeArray(self):
+        data = self.map.encode_array((1, 0), 3)
+
+        self.assertEqual(data, secsgem.SecsS12F09({"MID": "wafer", "IDTYP": secsgem.IDTYP.WAFER, "STRP": [1, 0], \
+            "BINLT": [6, 0, 0]}).encode())
+
+        wafer_map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1))
+        wafer_map.decode(self.map.encode_array())
+        self.assertEqual(wafer_map.bins, self.map.bins)
+
+        self.assertRaises(IndexError, self.map.encode_array, (2, 1), 2)
+
+    def testEncodeCoordinates(self):
+        data = self.map.encode_coordinates()
+
+        self.assertEqual(data, secsgem.SecsS12F11({"MID": "wafer", "IDTYP": secsgem.IDTYP.WAFER, "DATA": [
+            {"XYPOS": [-1, -1], "BINLT": [1]},
+            {"XYPOS": [0, 0], "BINLT": [5, 6]},
+            {"XYPOS": [2, 1], "BINLT": [7]}]}).encode())
+
+        wafer_map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1))
+        wafer_map.decode(data)
+        self.assertEqual(wafer_map.bins, self.map.bins)
+
+    def testDecodeFunction(self):
+        wafer_map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1), null_bin=".", text=True)
+
+        wafer_map.decode(secsgem.SecsS12F14({"MID": "wafer", "IDTYP": secsgem.IDTYP.WAFER, "DATA": [
+            {"RSINF": [2, 0, -1], "BINLT": "ab"}]}).encode())
+
+        self.assertEqual(wafer_map[2, 0], ord("a"))
+        self.assertEqual(wafer_map[1, 0], ord("b"))
+        self.assertEqual(wafer_map[0, 0], ord("."))
+
+        self.assertEqual(wafer_map.encode_array((1, 0), 2), secsgem.SecsS12F16({"MID": "wafer", \
+            "IDTYP": secsgem.IDTYP.WAFER, "STRP": [1, 0], "BINLT": "ba"}).encode())
+
+    def testDecodeInvalid(self):
+        wafer_map = secsgem.WaferMap("wafer", 3, 4, origin=(-1, -1))
+
+        # second run is outside of the map, nothing is changed
+        data = secsgem.SecsS12F11({"MID": "wafer", "IDTYP": secsgem.IDTYP.WAFER, "DATA": [
+            {"XYPOS": [0, 0], "BINLT": [1]},
+            {"XYPOS": [2, 0], "BINLT": [2, 3]}]}).encode()
+
+        self.assertRaises(ValueError, wafer_map.decode, data)
+        self.assertEqual(wafer_map[0, 0], 0)
+
+        self.assertRaises(ValueError, wafer_map.decode, secsgem.SecsS12F08(secsgem.MDACK.ACK).encode())
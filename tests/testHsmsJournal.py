@@ -0,0 +1,138 @@
+#####################################################################
+# testHsmsJournal.py
+#
+# (c) Copyright 2013-2016, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import shutil
+import tempfile
+import unittest
+
+import secsgem
+
+from testconnection import HsmsTestServer
+
+
+class TestHsmsJournal(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def generatePacket(self, system, function):
+        return secsgem.HsmsPacket(secsgem.HsmsStreamFunctionHeader(system, function.stream, function.function, True, 0), function.encode())
+
+    def testAppendAndRead(self):
+        journal = secsgem.HsmsJournal(self.path)
+        journal.append(self.generatePacket(1, secsgem.SecsS01F01()), secsgem.JOURNAL_DIRECTION_OUT, "tool1", 10.0)
+        journal.append(self.generatePacket(1, secsgem.SecsS01F02(["MDLN", "SOFTREV"])), secsgem.JOURNAL_DIRECTION_IN, "tool1", 11.0)
+        journal.close()
+
+        records = list(secsgem.HsmsJournalReader(self.path).records())
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].timestamp, 10.0)
+        self.assertEqual(records[0].direction, secsgem.JOURNAL_DIRECTION_OUT)
+        self.assertEqual(records[0].peer, "tool1")
+        self.assertEqual(records[1].packet.header.function, 2)
+        self.assertIn("MDLN", records[1].to_sml())
+
+    def testFilters(self):
+        journal = secsgem.HsmsJournal(self.path)
+        for i in range(10):
+            journal.append(self.generatePacket(i, secsgem.SecsS01F01()), secsgem.JOURNAL_DIRECTION_OUT, "tool1", float(i))
+            journal.append(self.generatePacket(i, secsgem.SecsS06F12(0)), secsgem.JOURNAL_DIRECTION_OUT, "tool2", float(i))
+        journal.close()
+
+        reader = secsgem.HsmsJournalReader(self.path)
+
+        self.assertEqual(len(list(reader.records(start=3.0, end=5.0))), 4)
+        self.assertEqual(len(list(reader.records(peer="tool2"))), 10)
+        self.assertEqual(len(list(reader.records(stream=6, function=12, start=8.0))), 2)
+        self.assertEqual(len(list(reader.records(peer="unknown"))), 0)
+
+    def testRotation(self):
+        journal = secsgem.HsmsJournal(self.path, segment_size=100, max_segments=2)
+        for i in range(10):
+            journal.append(self.generatePacket(i, secsgem.SecsS01F01()), secsgem.JOURNAL_DIRECTION_OUT, "tool1", float(i))
+        journal.close()
+
+        self.assertEqual(len(secsgem.list_journal_segments(self.path, "hsms")), 2)
+
+        records = list(secsgem.HsmsJournalReader(self.path).records())
+        self.assertEqual(records[-1].timestamp, 9.0)
+
+    def testTimestampOrder(self):
+        journal = secsgem.HsmsJournal(self.path)
+        journal.append(self.generatePacket(1, secsgem.SecsS01F01()), secsgem.JOURNAL_DIRECTION_OUT, "tool1", 10.0)
+        journal.append(self.generatePacket(2, secsgem.SecsS01F01()), secsgem.JOURNAL_DIRECTION_OUT, "tool1", 9.0)
+        journal.close()
+
+        records = list(secsgem.HsmsJournalReader(self.path).records())
+
+        # an earlier timestamp is clamped, so the index stays sorted
+        self.assertEqual([record.timestamp for record in records], [10.0, 10.0])
+        self.assertEqual(len(list(secsgem.HsmsJournalReader(self.path).records(start=10.0))), 2)
+
+    def testAppendClosed(self):
+        journal = secsgem.HsmsJournal(self.path)
+        journal.close()
+
+        self.assertRaises(IOError, journal.append, self.generatePacket(1, secsgem.SecsS01F01()), secsgem.JOURNAL_DIRECTION_OUT, "tool1")
+
+    def testHandlerJournalClosed(self):
+        server = HsmsTestServer()
+        client = secsgem.HsmsHandler("127.0.0.1", 5000, False, 0, "test", server)
+        client.journal = secsgem.HsmsJournal(self.path)
+        client.journal.close()
+
+        server.start()
+        client.enable()
+        server.simulate_connect()
+
+        # the select request is still answered
+        system_id = server.get_next_system_counter()
+        server.simulate_packet(secsgem.HsmsPacket(secsgem.HsmsSelectReqHeader(system_id)))
+
+        packet = server.expect_packet(system_id=system_id)
+
+        client.disable()
+        server.stop()
+
+        self.assertIsNot(packet, None)
+        self.assertEqual(packet.header.sType, 0x02)
+
+    def testHandlerJournal(self):
+        server = HsmsTestServer()
+        client = secsgem.HsmsHandler("127.0.0.1", 5000, False, 0, "test", server)
+        client.journal = secsgem.HsmsJournal(self.path)
+
+        server.start()
+        client.enable()
+        server.simulate_connect()
+
+        system_id = server.get_next_system_counter()
+        server.simulate_packet(secsgem.HsmsPacket(secsgem.HsmsSelectReqHeader(system_id)))
+
+        client.disable()
+        server.stop()
+        client.journal.close()
+
+        records = list(secsgem.HsmsJournalReader(self.path).records())
+
+        self.assertEqual(records[0].direction, secsgem.JOURNAL_DIRECTION_IN)
+        self.assertEqual(records[0].packet.header.sType, 0x01)
+        self.assertEqual(records[1].direction, secsgem.JOURNAL_DIRECTION_OUT)
+        self.assertEqual(records[1].packet.header.sType, 0x02)
+        self.assertEqual(records[1].peer, "test")
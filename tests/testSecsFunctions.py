@@ -113,6 +113,13 @@ class testS02E16(unittest.TestCase, testSecsFunctionSingleVariable):
     encoded1 = b"!\x01\xd9"
 
 
+class testS02E24(unittest.TestCase, testSecsFunctionSingleVariable):
+    cls = SecsS02F24
+    value1 = 4
+    value2 = 0
+    encoded1 = b"!\x01\x04"
+
+
 class testS02E34(unittest.TestCase, testSecsFunctionSingleVariable):
     cls = SecsS02F34
     value1 = 217
@@ -149,6 +156,13 @@ class testS06E00(unittest.TestCase, testSecsFunctionNoData):
     cls = SecsS06F00
 
 
+class testS06E02(unittest.TestCase, testSecsFunctionSingleVariable):
+    cls = SecsS06F02
+    value1 = 217
+    value2 = 135
+    encoded1 = b"!\x01\xd9"
+
+
 class testS06E12(unittest.TestCase, testSecsFunctionSingleVariable):
     cls = SecsS06F12
     value1 = 217
@@ -156,6 +170,20 @@ class testS06E12(unittest.TestCase, testSecsFunctionSingleVariable):
     encoded1 = b"!\x01\xd9"
 
 
+class testS06E23(unittest.TestCase, testSecsFunctionSingleVariable):
+    cls = SecsS06F23
+    value1 = 1
+    value2 = 0
+    encoded1 = b"\xa5\x01\x01"
+
+
+class testS06E24(unittest.TestCase, testSecsFunctionSingleVariable):
+    cls = SecsS06F24
+    value1 = 2
+    value2 = 1
+    encoded1 = b"!\x01\x02"
+
+
 class testS07E00(unittest.TestCase, testSecsFunctionNoData):
     cls = SecsS07F00
 
@@ -14,6 +14,7 @@
 # GNU Lesser General Public License for more details.
 #####################################################################
 
+import logging
 import threading
 import unittest
 
@@ -37,6 +38,51 @@ class TestSecsHandler(unittest.TestCase):
         self.assertEqual(function[0], "MDLN")
         self.assertEqual(function[1], "SOFTREV")
 
+    def testSecsDecodeCached(self):
+        server = HsmsTestServer()
+        client = secsgem.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
+
+        packet = server.generate_stream_function_packet(0, secsgem.SecsS01F02(["MDLN", "SOFTREV"]))
+
+        function = client.secs_decode(packet)
+
+        self.assertIs(client.secs_decode(packet), function)
+
+    def testCommunicationLogDecodesLazily(self):
+        server = HsmsTestServer()
+        client = secsgem.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
+        client.enable()
+        server.simulate_connect()
+
+        level = client.communicationLogger.level
+        client.communicationLogger.setLevel(logging.WARNING)
+        try:
+            packet = server.generate_stream_function_packet(0, secsgem.SecsS01F02(["MDLN", "SOFTREV"]))
+            server.simulate_packet(packet)
+        finally:
+            client.communicationLogger.setLevel(level)
+            client.disable()
+
+        self.assertIsNone(packet.decoded)
+
+    def testStreamFunctionCallbackTable(self):
+        server = HsmsTestServer()
+        client = secsgem.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
+
+        f1 = Mock()
+        f2 = Mock()
+
+        self.assertIsNone(client._get_sf_callback(1, 1))
+
+        client.register_stream_function(1, 1, f1)
+        self.assertIs(client._get_sf_callback(1, 1), f1)
+
+        client.register_stream_function(1, 1, f2)
+        self.assertIs(client._get_sf_callback(1, 1), f2)
+
+        client.unregister_stream_function(1, 1)
+        self.assertIsNone(client._get_sf_callback(1, 1))
+
     def testSecsDecodeNone(self):
         server = HsmsTestServer()
         client = secsgem.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
@@ -136,6 +182,102 @@ class TestSecsHandlerPassive(unittest.TestCase):
         self.assertEqual(packet.header.stream, 1)
         self.assertEqual(packet.header.function, 2)
 
+    def testStreamFunctionReceivingWithExecutor(self):
+        self.client.callback_executor = secsgem.OrderedWorkerPool(2)
+        self.server.simulate_connect()
+
+        self.client.register_stream_function(1, 1, self.handleS01F01)
+
+        self.performSelect()
+
+        #send s01e01
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS01F01()))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.client.callback_executor.shutdown()
+
+        self.assertIsNot(packet, None)
+        self.assertEqual(packet.header.stream, 1)
+        self.assertEqual(packet.header.function, 2)
+
+    def testStreamFunctionReceivingWithPriorityExecutor(self):
+        self.client.callback_executor = secsgem.PriorityWorkerPool(2)
+        self.client.send_executor = secsgem.PriorityWorkerPool(1)
+        self.server.simulate_connect()
+
+        self.client.register_stream_function(1, 1, self.handleS01F01)
+
+        self.performSelect()
+
+        #send s01e01
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS01F01()))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.client.callback_executor.shutdown()
+        self.client.send_executor.shutdown()
+
+        self.assertIsNot(packet, None)
+        self.assertEqual(packet.header.stream, 1)
+        self.assertEqual(packet.header.function, 2)
+
+    def testStreamFunctionReceivingRejectedByExecutor(self):
+        self.client.callback_executor = secsgem.OrderedWorkerPool(1)
+        self.client.callback_executor.shutdown()
+        self.server.simulate_connect()
+
+        self.client.register_stream_function(1, 1, self.handleS01F01)
+
+        self.performSelect()
+
+        #send s01e01
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS01F01()))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNot(packet, None)
+        self.assertEqual(packet.header.stream, 1)
+        self.assertEqual(packet.header.function, 0)
+
+    def testStreamFunctionReceivingFullExecutor(self):
+        # the receiving thread must not wait for a full pool, even with the blocking policy
+        self.client.callback_executor = secsgem.OrderedWorkerPool(1, 1, secsgem.EXECUTOR_POLICY_BLOCK)
+        self.server.simulate_connect()
+
+        release = threading.Event()
+
+        def blockingHandler(handler, packet):
+            release.wait()
+            handler.send_response(secsgem.SecsS01F02(), packet.header.system)
+
+        self.client.register_stream_function(1, 1, blockingHandler)
+
+        self.performSelect()
+
+        first_system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(first_system_id, secsgem.SecsS01F01()))
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.SecsS01F01()))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        release.set()
+
+        self.assertIsNot(packet, None)
+        self.assertEqual(packet.header.stream, 1)
+        self.assertEqual(packet.header.function, 0)
+
+        packet = self.server.expect_packet(system_id=first_system_id)
+        self.client.callback_executor.shutdown()
+
+        self.assertIsNot(packet, None)
+        self.assertEqual(packet.header.function, 2)
+
     def testStreamFunctionSending(self):
         self.server.simulate_connect()
 